@@ -5,10 +5,31 @@ import api from './axios';
  * Matches backend routes in backend/routes/chat_routes.py
  */
 
+// Largest page the backend serves (limit is capped at 200 in chat_routes.py)
+const CHAT_PAGE_SIZE = 200;
+
 export const chatAPI = {
-  // Get chat history for a room
-  getChatHistory: async (roomId) => {
-    const response = await api.get(`/chat/${roomId}`);
+  // Get one page of chat history for a room, oldest first within the page
+  // Backend returns { room_id, total_messages, messages, has_more, prev_cursor, next_cursor };
+  // without `before` it is the newest page, pass prev_cursor as `before` for older ones
+  getChatHistory: async (roomId, { before = null, limit = CHAT_PAGE_SIZE } = {}) => {
+    const params = new URLSearchParams();
+    params.append('limit', limit);
+    if (before) params.append('before', before);
+    const response = await api.get(`/chat/${roomId}?${params.toString()}`);
     return response.data;
   },
+
+  // Get a room's whole history, oldest first, following prev_cursor while has_more
+  getAllChatHistory: async (roomId) => {
+    const pages = [];
+    let before = null;
+    let page;
+    do {
+      page = await chatAPI.getChatHistory(roomId, { before });
+      pages.unshift(page.messages || []);
+      before = page.prev_cursor;
+    } while (page.has_more && before);
+    return pages.flat();
+  },
 };
@@ -5,11 +5,30 @@ import api from './axios';
  * Matches backend routes in backend/routes/job_routes.py
  */
 
+// Largest page the backend serves (limit is capped at 100 in job_routes.py)
+const JOBS_PAGE_SIZE = 100;
+
 export const jobsAPI = {
-  // Get all jobs
+  // Get one page of jobs, newest first
+  // Backend returns { results, next_cursor }; pass next_cursor back for the next page
+  getJobsPage: async (cursor = null, limit = JOBS_PAGE_SIZE) => {
+    const params = new URLSearchParams();
+    params.append('limit', limit);
+    if (cursor) params.append('cursor', cursor);
+    const response = await api.get(`/jobs/?${params.toString()}`);
+    return { results: response.data.results || [], next_cursor: response.data.next_cursor || null };
+  },
+
+  // Get all jobs, following next_cursor until the last page
   getAllJobs: async () => {
-    const response = await api.get('/jobs/');
-    return response.data;
+    const jobs = [];
+    let cursor = null;
+    do {
+      const page = await jobsAPI.getJobsPage(cursor);
+      jobs.push(...page.results);
+      cursor = page.next_cursor;
+    } while (cursor);
+    return jobs;
   },
 
   // Get job by ID
@@ -43,6 +62,7 @@ export const jobsAPI = {
     if (filters.tag) params.append('tag', filters.tag);
     if (filters.status) params.append('status', filters.status);
     if (filters.limit) params.append('limit', filters.limit);
+    if (filters.cursor) params.append('cursor', filters.cursor);
 
     const response = await api.get(`/jobs/filter/?${params.toString()}`);
     return response.data;
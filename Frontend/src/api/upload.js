@@ -1,5 +1,12 @@
 import api from './axios';
 
+// Skill extraction polling: the server kills an extraction after 30s, so a
+// job still unfinished after two minutes is stuck (or the server is unreachable)
+const EXTRACTION_POLL_INTERVAL_MS = 1000;
+const EXTRACTION_POLL_TIMEOUT_MS = 2 * 60 * 1000;
+const EXTRACTION_POLL_MAX_ATTEMPTS = 120;
+const EXTRACTION_POLL_REQUEST_TIMEOUT_MS = 10 * 1000;
+
 /**
  * Upload API endpoints
  * Matches backend routes in backend/routes/upload_routes.py
@@ -29,6 +36,18 @@ export const uploadAPI = {
         'Content-Type': 'multipart/form-data',
       },
     });
-    return response.data;
+
+    // Extraction runs in the background; poll until the job finishes or we give up
+    const { status_url: statusUrl } = response.data;
+    const deadline = Date.now() + EXTRACTION_POLL_TIMEOUT_MS;
+    for (let attempt = 0; attempt < EXTRACTION_POLL_MAX_ATTEMPTS && Date.now() < deadline; attempt++) {
+      await new Promise((resolve) => setTimeout(resolve, EXTRACTION_POLL_INTERVAL_MS));
+      const { data: job } = await api.get(statusUrl, { timeout: EXTRACTION_POLL_REQUEST_TIMEOUT_MS });
+      if (job.status === 'done') return job;
+      if (job.status === 'failed' || job.status === 'timeout') {
+        throw new Error(job.error || 'Skill extraction failed');
+      }
+    }
+    throw new Error('Skill extraction is taking longer than expected. Your skills will appear on your profile once it finishes.');
   },
 };
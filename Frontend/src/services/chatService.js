@@ -48,9 +48,8 @@ export const chatService = {
         return [];
       }
       
-      const response = await chatAPI.getChatHistory(roomId);
-      // Backend returns { room_id, total_messages, messages }
-      return response.messages || [];
+      // History is paged newest first; walk back to the start of the conversation
+      return await chatAPI.getAllChatHistory(roomId);
     } catch (error) {
       // 404 is normal for new conversations (no messages yet)
       if (error.response?.status === 404) {
@@ -85,7 +84,7 @@ export const chatService = {
             const job = await jobService.getJobById(app.job_id);
             // Get last message for preview
             try {
-              const history = await chatAPI.getChatHistory(app.job_id);
+              const history = await chatAPI.getChatHistory(app.job_id, { limit: 1 });
               const lastMsg = history.messages?.[history.messages.length - 1];
               conversations.push({
                 id: app.job_id,
@@ -127,7 +126,7 @@ export const chatService = {
         for (const job of myJobs) {
           if (job.applicants && job.applicants.length > 0) {
             try {
-              const history = await chatAPI.getChatHistory(job.id || job._id);
+              const history = await chatAPI.getChatHistory(job.id || job._id, { limit: 1 });
               const lastMsg = history.messages?.[history.messages.length - 1];
               
               // Create a conversation for each applicant
@@ -0,0 +1,4 @@
+"""
+Standalone before/after benchmarks for the performance work in this backend.
+Run each from backend/, e.g. python -m benchmarks.job_search; none of them is collected by pytest.
+"""
@@ -0,0 +1,84 @@
+"""
+python -m benchmarks.batch_scoring : 10k users x 50k jobs, the per-pair compute_match_score
+loop and the old dense float32 path vs sparse CSR (utils.batch_scoring).
+"""
+import heapq
+import random
+import time
+import tracemalloc
+import numpy as np
+from utils.batch_scoring import _normalize, batch_top_jobs, build_vocabulary
+from utils.recommendation import compute_match_score
+
+USERS, JOBS = 10_000, 50_000
+# The per-pair loop takes about an hour on the full grid: time a sample of users
+# against every job and scale up linearly
+PAIR_SAMPLE_USERS = 100
+
+
+def dense_top_jobs(users_skills, jobs_tags, k=10, chunk_size=512):
+    """The previous implementation: dense 0/1 matrices and a dense (users, jobs) score block."""
+    vocab = build_vocabulary(jobs_tags)
+
+    def dense(rows):
+        matrix = np.zeros((len(rows), len(vocab)), dtype=np.float32)
+        for i, values in enumerate(rows):
+            cols = [vocab[v] for v in _normalize(values) if v in vocab]
+            if cols:
+                matrix[i, cols] = 1.0
+        return matrix
+
+    job_matrix = dense(jobs_tags).T
+    job_denom = np.maximum(job_matrix.sum(axis=0), 1.0).astype(np.float64)
+    results = []
+    for start in range(0, len(users_skills), chunk_size):
+        ratio = (dense(users_skills[start:start + chunk_size]) @ job_matrix).astype(np.float64) / job_denom
+        scores = (0.7 * ratio + 0.3 * ratio) * 100
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        results.extend(np.take_along_axis(top_scores, order, axis=1).round(2).tolist())
+    return results
+
+
+def per_pair_top_jobs(users_skills, jobs_tags, k=10):
+    """The original path: rank_jobs_for_user's compute_match_score loop over every job."""
+    return [heapq.nlargest(k, (compute_match_score(skills, tags) for tags in jobs_tags))
+            for skills in users_skills]
+
+
+def main():
+    rng = random.Random(42)
+    # Zipf-like tag popularity over a 3,000-tag taxonomy, as in real postings
+    tags = [f"skill{i}" for i in range(3000)]
+    weights = [1 / (i + 1) for i in range(len(tags))]
+    jobs = [list(set(rng.choices(tags, weights, k=6))) for _ in range(JOBS)]
+    users = [list(set(rng.choices(tags, weights, k=10))) for _ in range(USERS)]
+
+    timings = {}
+    for name, fn in (("dense", dense_top_jobs), ("sparse", batch_top_jobs)):
+        tracemalloc.start()
+        started = time.perf_counter()
+        ranked = fn(users, jobs, k=10)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        timings[name] = elapsed
+        top_scores = [[s for s in row] if name == "dense" else [s for _, s in row] for row in ranked]
+        if name == "dense":
+            reference = top_scores
+        else:
+            assert top_scores == reference, "sparse and dense top-k scores differ"
+        print(f"{name:>6}: {elapsed:6.2f} s, peak {peak / 2**20:7.1f} MiB for 10k users x 50k jobs")
+
+    sample = users[:PAIR_SAMPLE_USERS]
+    started = time.perf_counter()
+    sampled = per_pair_top_jobs(sample, jobs, k=10)
+    elapsed = (time.perf_counter() - started) * len(users) / len(sample)
+    assert sampled == reference[:len(sample)], "per-pair and sparse top-k scores differ"
+    print(f"  pair: {elapsed:6.2f} s, extrapolated from {len(sample)} users x 50k jobs")
+    print(f"speedup: sparse {elapsed / timings['sparse']:.0f}x, dense {elapsed / timings['dense']:.0f}x over per-pair")
+
+
+if __name__ == "__main__":
+    main()
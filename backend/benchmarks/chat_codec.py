@@ -0,0 +1,56 @@
+"""
+python -m benchmarks.chat_codec : encode time and frame size, JSON vs msgpack (utils.chat_codec),
+raw and after permessage-deflate (which uvicorn negotiates by default, see core/config.py).
+"""
+import random
+import time
+import zlib
+from datetime import datetime
+from utils.chat_codec import JSON_CODEC, MsgpackCodec
+
+
+def deflated(frames, takeover: bool) -> int:
+    """Bytes on the wire under permessage-deflate (12-bit window, as uvicorn offers), with and without context takeover."""
+    total = 0
+    stream = zlib.compressobj(wbits=-12)
+    for frame in frames:
+        data = frame.encode() if isinstance(frame, str) else frame
+        if not takeover:
+            stream = zlib.compressobj(wbits=-12)
+        # RFC 7692: each message ends with a sync flush whose 4-byte tail is dropped
+        total += len(stream.compress(data) + stream.flush(zlib.Z_SYNC_FLUSH)) - 4
+    return total
+
+
+def main():
+    rng = random.Random(3)
+    words = "hi thanks interview tomorrow resume sent great see you at the office 10am sure".split()
+    messages = [
+        {
+            "id": "%024x" % rng.getrandbits(96),
+            "sender_id": "%024x" % rng.getrandbits(96),
+            "sender_name": rng.choice(["Ada Lovelace", "Alan Turing", "Grace Hopper"]),
+            "message": " ".join(rng.choices(words, k=rng.randint(2, 20))),
+            "timestamp": datetime(2025, 1, 1, 12, 0, rng.randint(0, 59), rng.randint(0, 999) * 1000).isoformat(),
+        }
+        for _ in range(10_000)
+    ]
+
+    for codec in (JSON_CODEC, MsgpackCodec()):
+        started = time.perf_counter()
+        frames = [codec.encode(m) for m in messages]
+        encode_us = (time.perf_counter() - started) / len(messages) * 1e6
+        started = time.perf_counter()
+        for frame in frames:
+            codec.decode(frame)
+        decode_us = (time.perf_counter() - started) / len(messages) * 1e6
+        raw = sum(len(f.encode() if isinstance(f, str) else f) for f in frames) / len(frames)
+        per_message = deflated(frames, takeover=False) / len(frames)
+        takeover = deflated(frames, takeover=True) / len(frames)
+        print(f"{codec.name:>8}: encode {encode_us:5.2f} us, decode {decode_us:5.2f} us, "
+              f"{raw:6.1f} B raw, {per_message:6.1f} B deflated per message, "
+              f"{takeover:6.1f} B deflated with context takeover")
+
+
+if __name__ == "__main__":
+    main()
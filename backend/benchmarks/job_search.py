@@ -0,0 +1,76 @@
+"""
+python -m benchmarks.job_search : 100k jobs, the old case-insensitive $regex filter vs
+utils.job_search's index. The regex side runs the same scan Mongo does for an unanchored
+$regex (no index can serve it) in-process, so it leaves out network and BSON costs: a lower bound.
+"""
+import random
+import re
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from utils.job_search import JobSearchIndex
+
+JOBS = 100_000
+
+
+def main():
+    rng = random.Random(7)
+    words = [f"word{i}" for i in range(5000)] + ["python", "backend", "kubernetes", "react", "senior", "intern"]
+    tags = ["python", "fastapi", "react", "node.js", "kubernetes", "c++", "sql", "docker"] + [f"tag{i}" for i in range(500)]
+    jobs = [
+        SimpleNamespace(
+            id=f"{i:024x}",
+            title=" ".join(rng.choices(words, k=4)),
+            description=" ".join(rng.choices(words, k=60)),
+            tags=rng.sample(tags, 4),
+            status=rng.choice(["open", "open", "filled"]),
+            created_at=datetime(2024, 1, 1),
+        )
+        for i in range(JOBS)
+    ]
+
+    index = JobSearchIndex()
+    started = time.perf_counter()
+    for job in jobs:
+        index.add(job)
+    print(f"build: {time.perf_counter() - started:.2f} s for {len(jobs):,} jobs")
+
+    def regex_filter(title=None, tag=None, limit=None):
+        """The previous route: {"title": {"$regex": title, "$options": "i"}, "tags": {"$regex": tag, ...}}."""
+        title_re = re.compile(title, re.I) if title else None
+        tag_re = re.compile(tag, re.I) if tag else None
+        found = []
+        for job in jobs:
+            if title_re and not title_re.search(job.title):
+                continue
+            if tag_re and not any(tag_re.search(t) for t in job.tags):
+                continue
+            found.append(job.id)
+            if limit and len(found) == limit:
+                break
+        return found
+
+    def timed(fn, runs=20):
+        started = time.perf_counter()
+        for _ in range(runs):
+            result = fn()
+        return (time.perf_counter() - started) / runs * 1000, result
+
+    cases = [
+        ("title=python", dict(title="python"), dict(query="python")),
+        ("title=word4999 (rare)", dict(title="word4999"), dict(query="word4999")),
+        ("title=senior backend", dict(title="senior backend"), dict(query="senior backend")),
+        ("tag=kube", dict(tag="kube"), dict(tag="kube")),
+        ("title=python tag=sql", dict(title="python", tag="sql"), dict(query="python", tag="sql")),
+    ]
+    for name, old_args, new_args in cases:
+        first_ms, _ = timed(lambda: regex_filter(limit=20, **old_args))
+        all_ms, matched = timed(lambda: regex_filter(**old_args))
+        new_ms, (total, _) = timed(lambda: index.search(limit=20, **new_args))
+        # The index also matches descriptions and tags, hence more matches than the title regex
+        print(f"{name:>24}: $regex first 20 {first_ms:7.2f} ms, all {len(matched):>6} {all_ms:7.2f} ms | "
+              f"index ranked top 20 of {total:>6} {new_ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
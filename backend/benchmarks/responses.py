@@ -0,0 +1,53 @@
+"""
+python -m benchmarks.responses : serialization time per 1,000 jobs, the old Beanie document +
+jsonable_encoder path vs ORJSONResponse over raw rows (core.responses). Needs MongoDB up.
+"""
+import asyncio
+import json
+import timeit
+from datetime import datetime
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from core.responses import ORJSONResponse
+from database.connection import init_db
+from models.job_model import Job, JobOut
+
+
+def main():
+    raw = [
+        {
+            "_id": ObjectId(),
+            "title": f"Backend engineer {i}",
+            "description": "Build and run FastAPI services backed by MongoDB. " * 8,
+            "tags": ["python", "fastapi", "mongodb", "docker"],
+            "created_by": str(ObjectId()),
+            "created_at": datetime.utcnow(),
+            "status": "open",
+            "views": i,
+            "applicants": [str(ObjectId()) for _ in range(5)],
+            "applicant_count": 5,
+        }
+        for i in range(1000)
+    ]
+    assert set(raw[0]) - {"_id"} == set(JobOut.Settings.projection)
+
+    # Beanie documents can only be built once the models are initialised
+    asyncio.run(init_db())
+
+    def before():
+        # Beanie document per row, then jsonable_encoder + stdlib json (the old response path)
+        docs = [Job.model_validate(row) for row in raw]
+        return json.dumps(jsonable_encoder({"results": docs})).encode()
+
+    def after():
+        return ORJSONResponse({"results": raw}).body
+
+    assert json.loads(before()) == json.loads(after())
+    for name, fn in (("before", before), ("after", after)):
+        runs = 20
+        seconds = timeit.timeit(fn, number=runs) / runs
+        print(f"{name:>6}: {seconds * 1000:.2f} ms per 1,000 jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+python -m benchmarks.websocket_fanout : one room of 1,000 sockets, one of them slow and one
+broken; the old per-recipient json.dumps + awaited send vs the queued fan-out of
+routes.websocket_routes.ConnectionManager.
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+from routes.websocket_routes import ConnectionManager
+from utils.backplane import InMemoryBackplane
+
+MEMBERS, MESSAGES, SLOW_SEND_SECONDS, GAP_SECONDS = 1000, 300, 0.02, 0.001
+
+
+class FakeSocket:
+    def __init__(self, slow=False, broken=False):
+        self.slow, self.broken, self.received = slow, broken, 0
+        self.scope = {"subprotocols": []}
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, frame):
+        if self.broken:
+            raise RuntimeError("socket is gone")
+        await asyncio.sleep(SLOW_SEND_SECONDS if self.slow else 0)
+        self.received += 1
+
+    async def close(self, code=1000):
+        pass
+
+
+def sockets():
+    return [FakeSocket(slow=i == 0, broken=i == 1) for i in range(MEMBERS)]
+
+
+def message(i):
+    return {"id": str(i), "sender_id": "u1", "sender_name": "Ada", "message": f"hello {i}",
+            "timestamp": datetime.utcnow().isoformat()}
+
+
+async def before():
+    room = sockets()
+    started = time.perf_counter()
+    for i in range(MESSAGES):
+        for ws in list(room):
+            try:
+                await ws.send_text(json.dumps(message(i)))
+            except Exception:
+                room.remove(ws)
+    return time.perf_counter() - started
+
+
+async def after():
+    fanout = ConnectionManager(InMemoryBackplane())
+    room = sockets()
+    for ws in room:
+        await fanout.connect(ws, "bench")
+    healthy = [ws for ws in room if not ws.slow and not ws.broken]
+    sent = 0.0
+    started = time.perf_counter()
+    for i in range(MESSAGES):
+        t = time.perf_counter()
+        await fanout.broadcast("bench", message(i))
+        sent += time.perf_counter() - t
+        # Messages arrive GAP_SECONDS apart; the writers run in between
+        await asyncio.sleep(GAP_SECONDS)
+    while any(ws.received < MESSAGES for ws in healthy) and fanout.connection_count() >= MEMBERS - 2:
+        await asyncio.sleep(0.001)
+    delivered = time.perf_counter() - started
+    assert all(ws.received == MESSAGES for ws in healthy)
+
+    print(f" after: {sent * 1000:8.1f} ms inside broadcast(), "
+          f"{delivered * 1000:.1f} ms until every healthy socket had all {MESSAGES} "
+          f"(messages {GAP_SECONDS * 1000:g} ms apart)")
+    print(f"        {fanout.connection_count()} connections left, slow socket got {room[0].received}, "
+          f"{len(fanout._close_tasks)} closes pending")
+    for conns in list(fanout.active_connections.values()):
+        for conn in conns.values():
+            conn.close()
+
+
+def main():
+    old_seconds = asyncio.run(before())
+    print(f"before: {old_seconds * 1000:8.1f} ms to send {MESSAGES} messages to {MEMBERS} sockets (sender blocked throughout)")
+    asyncio.run(after())
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,115 @@ from dotenv import load_dotenv
 load_dotenv()
 
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/campusconnect")
+
+# Mongo client tuning. Size MONGO_MAX_POOL_SIZE to the concurrency of one worker
+# process (check /health pool wait times), not to the whole deployment
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "10000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+# Wire compression, off by default. Opt in with a comma separated list in preference order,
+# e.g. "zstd,snappy,zlib": the server must allow the same compressors (net.compression),
+# zstd/snappy need extra packages, and it trades CPU on both ends for less traffic, so it
+# pays off for large result sets over a slow or metered link rather than on localhost
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+# Read preference for everything, and for read-heavy routes (job listing/search) that can
+# tolerate slightly stale data, e.g. "secondaryPreferred" on a replica set. On a secondary a
+# just-created job may be missing from listings for up to the replication lag (bounded by
+# the max staleness, >= 90 s when set). Chat history always reads from the primary.
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+MONGO_READ_HEAVY_PREFERENCE = os.getenv("MONGO_READ_HEAVY_PREFERENCE", "primary")
+MONGO_READ_HEAVY_MAX_STALENESS_SECONDS = int(os.getenv("MONGO_READ_HEAVY_MAX_STALENESS_SECONDS", "-1"))
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
+
+# Job view counter: how often buffered views are flushed to Mongo,
+# and the per-viewer window in which repeat views are ignored (0 disables)
+VIEW_FLUSH_INTERVAL_SECONDS = float(os.getenv("VIEW_FLUSH_INTERVAL_SECONDS", "5"))
+VIEW_DEDUPE_WINDOW_SECONDS = float(os.getenv("VIEW_DEDUPE_WINDOW_SECONDS", "0"))
+
+# Authenticated principal caches (per worker). Users are re-read from Mongo
+# after USER_CACHE_TTL_SECONDS at most; mutations invalidate immediately.
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+
+# Password hashing pool: bcrypt runs on worker threads, at most PASSWORD_HASH_WORKERS
+# at a time; requests waiting longer than the queue timeout get a 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", "5"))
+
+# Outbound HTTP (Google OAuth): shared pooled client settings
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "3"))
+HTTP_READ_TIMEOUT_SECONDS = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_RETRY_BACKOFF_SECONDS = float(os.getenv("HTTP_RETRY_BACKOFF_SECONDS", "0.2"))
+
+# Chat WebSocket fan-out: per-connection outbound queue size, and what to do
+# when a slow client's queue is full ("drop" the message or "disconnect" the client)
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+WS_SLOW_CONSUMER_POLICY = os.getenv("WS_SLOW_CONSUMER_POLICY", "disconnect")
+# Compression is uvicorn's, not ours: it negotiates permessage-deflate (with context
+# takeover) with every client that offers it, browsers included, unless started with
+# --ws-per-message-deflate false. It applies to JSON and msgpack frames alike; with it
+# a chat message is ~79 B as JSON vs ~72 B as msgpack (215 vs 145 B uncompressed),
+# see python -m benchmarks.chat_codec. Needs the `websockets` package (a dependency).
+
+# Chat persistence group commit: buffered messages are written with one
+# insert_many when the batch is full or the oldest message has waited this long
+CHAT_BATCH_MAX_SIZE = int(os.getenv("CHAT_BATCH_MAX_SIZE", "200"))
+CHAT_BATCH_MAX_DELAY_MS = float(os.getenv("CHAT_BATCH_MAX_DELAY_MS", "5"))
+# On shutdown the writer retries this many times; messages Mongo still refuses are
+# saved to CHAT_SPILL_PATH (NDJSON) and written on the next startup
+CHAT_SHUTDOWN_FLUSH_ATTEMPTS = int(os.getenv("CHAT_SHUTDOWN_FLUSH_ATTEMPTS", "5"))
+CHAT_SPILL_PATH = os.getenv("CHAT_SPILL_PATH", os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "chat_spill.ndjson"))
+
+# Chat pub/sub backplane: "memory" (single worker) or "mongo" (capped collection,
+# lets several uvicorn workers/hosts share rooms)
+CHAT_BACKPLANE = os.getenv("CHAT_BACKPLANE", "memory")
+CHAT_BACKPLANE_COLLECTION = os.getenv("CHAT_BACKPLANE_COLLECTION", "chat_events")
+CHAT_BACKPLANE_SIZE_BYTES = int(os.getenv("CHAT_BACKPLANE_SIZE_BYTES", str(16 * 1024 * 1024)))
+
+# Hot-room chat history cache: last N messages per room, LRU-evicted across rooms
+# once the estimated resident size exceeds CHAT_CACHE_MAX_BYTES
+CHAT_CACHE_ROOM_MESSAGES = int(os.getenv("CHAT_CACHE_ROOM_MESSAGES", "200"))
+CHAT_CACHE_MAX_BYTES = int(os.getenv("CHAT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Resume uploads are streamed to disk in chunks and rejected past this size
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+# Resume skill extraction runs in separate processes: at most EXTRACTION_WORKERS
+# at once, each killed after EXTRACTION_TIMEOUT_SECONDS. Job status lives in Mongo
+# (any worker can answer a poll) and is expired by a TTL index after EXTRACTION_JOB_TTL_SECONDS;
+# changing the TTL requires dropping the extraction_jobs.created_at_ttl index first.
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "30"))
+EXTRACTION_JOB_TTL_SECONDS = int(os.getenv("EXTRACTION_JOB_TTL_SECONDS", str(24 * 3600)))
+
+# Content-addressed cache of resume text and skill results (keyed by PDF SHA-256)
+RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "resumes"))
+RESUME_CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+RESUME_CACHE_MEMORY_ENTRIES = int(os.getenv("RESUME_CACHE_MEMORY_ENTRIES", "512"))
+
+# SMTP account used for verification and password reset emails
+SMTP_USER = os.getenv("SMTP_USER")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587")) if os.getenv("SMTP_PORT") else 587
+FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
+
+# Outbound email queue: messages are persisted and sent by background workers,
+# each holding one SMTP connection open; sends are capped at EMAIL_RATE_PER_SECOND
+# and failures retried with exponential backoff up to EMAIL_MAX_ATTEMPTS
+EMAIL_SMTP_CONNECTIONS = int(os.getenv("EMAIL_SMTP_CONNECTIONS", "2"))
+EMAIL_RATE_PER_SECOND = float(os.getenv("EMAIL_RATE_PER_SECOND", "5"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "6"))
+EMAIL_RETRY_BACKOFF_SECONDS = float(os.getenv("EMAIL_RETRY_BACKOFF_SECONDS", "30"))
+EMAIL_POLL_INTERVAL_SECONDS = float(os.getenv("EMAIL_POLL_INTERVAL_SECONDS", "5"))
+EMAIL_SMTP_TIMEOUT_SECONDS = float(os.getenv("EMAIL_SMTP_TIMEOUT_SECONDS", "15"))
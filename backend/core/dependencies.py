@@ -1,12 +1,54 @@
+import hashlib
+from beanie import PydanticObjectId
 from fastapi import Depends, HTTPException, status
+from typing import Optional
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from models.user_model import User
-from core.config import SECRET_KEY, ALGORITHM
+from core.cache import TTLCache
+from core.config import (
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES,
+    USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE, TOKEN_CACHE_MAX_SIZE,
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+# Verified token claims keyed by token hash, kept until the token's exp
+token_cache = TTLCache(maxsize=TOKEN_CACHE_MAX_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+# Resolved users keyed by subject (user id); callers always get their own copy
+user_cache = TTLCache(maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id) -> None:
+    """Drop a cached user. Call after any write to a User document."""
+    user_cache.pop(str(user_id))
+
+
+async def update_user(user_id, fields: dict) -> None:
+    """
+    $set only the given fields of a user, then drop the cached copy.
+    Writing whole documents with save() would overwrite concurrent changes
+    (made by another request or worker) with whatever this copy held.
+    The cache is invalidated even if the write fails, as it may have applied.
+    """
+    try:
+        await User.get_pymongo_collection().update_one(
+            {"_id": PydanticObjectId(user_id)}, {"$set": fields}
+        )
+    finally:
+        invalidate_user(user_id)
+
+
+def principal_cache_stats() -> dict:
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
+
+
+def _decode_subject(token: str) -> str:
+    key = hashlib.sha256(token.encode()).hexdigest()
+    user_id = token_cache.get(key)
+    if user_id is not None:
+        return user_id
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -14,8 +56,29 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             raise HTTPException(status_code=401, detail="Invalid token")
     except JWTError:
         raise HTTPException(status_code=401, detail="Could not validate token")
+    token_cache.set(key, user_id, expires_at=payload.get("exp"))
+    return user_id
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    user_id = _decode_subject(token)
 
+    user = user_cache.get(user_id)
+    if user is not None:
+        # A private copy, so a route mutating it cannot leak changes into other requests
+        return user.model_copy(deep=True)
     user = await User.get(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    user_cache.set(user_id, user.model_copy(deep=True))
     return user
+
+
+async def get_optional_user_id(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[str]:
+    """Subject of a valid bearer token, or None for anonymous requests. Never hits Mongo."""
+    if not token:
+        return None
+    try:
+        return _decode_subject(token)
+    except HTTPException:
+        return None
@@ -1,101 +1,70 @@
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
-import os
-from typing import List
+from jinja2 import Environment, StrictUndefined
 from pydantic import EmailStr
-from core.config import SECRET_KEY
 from fastapi_mail.errors import ConnectionErrors
+from core.config import SMTP_USER, SMTP_PASSWORD, FRONTEND_URL
+from utils.email_queue import email_queue
 
+# Email is only sent when credentials are provided
+EMAIL_CONFIGURED = bool(SMTP_USER and SMTP_PASSWORD)
 
-# Get email configuration from environment variables
-SMTP_USER = os.getenv("SMTP_USER")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
-SMTP_PORT = int(os.getenv("SMTP_PORT", "587")) if os.getenv("SMTP_PORT") else 587
-FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
-
-# Only create email config if credentials are provided
-conf = None
-if SMTP_USER and SMTP_PASSWORD:
-    conf = ConnectionConfig(
-        MAIL_USERNAME=SMTP_USER,
-        MAIL_PASSWORD=SMTP_PASSWORD,
-        MAIL_FROM=SMTP_USER,
-        MAIL_PORT=SMTP_PORT,
-        MAIL_SERVER=SMTP_HOST,
-        MAIL_STARTTLS=True,
-        MAIL_SSL_TLS=False,
-        USE_CREDENTIALS=True,
-    )
+# Templates are compiled once at import; sending only renders them
+_env = Environment(autoescape=False, undefined=StrictUndefined, keep_trailing_newline=True)
 
-
-async def send_verification_email(email_to: EmailStr, token: str):
-    """Send verification email. Raises exception if email is configured but fails."""
-    if not conf:
-        verification_url = f"{FRONTEND_URL}/verify-email?token={token}"
-        print(f"⚠️ Email not configured. Verification link: {verification_url}")
-        raise ConnectionErrors("Email service not configured. Please set SMTP_USER and SMTP_PASSWORD in .env")
-    
-    try:
-        verification_url = f"{FRONTEND_URL}/verify-email?token={token}"
-        message = MessageSchema(
-            subject="Please verify your email - CampusConnect",
-            recipients=[email_to],
-            body=f"""Welcome to CampusConnect!
+TEMPLATES = {
+    "verify_email": (
+        _env.from_string("Please verify your email - CampusConnect"),
+        _env.from_string("""Welcome to CampusConnect!
 
 Please verify your email address by clicking the link below:
 
-{verification_url}
+{{ url }}
 
 This link will expire in 24 hours.
 
 If you didn't create this account, please ignore this email.
 
 Best regards,
-CampusConnect Team""",
-            subtype="plain"
-        )
-        fm = FastMail(conf)
-        await fm.send_message(message)
-    except ConnectionErrors as e:
-        verification_url = f"{FRONTEND_URL}/verify-email?token={token}"
-        print(f"❌ Email configuration error: {str(e)}")
-        print(f"💡 Verification link (for testing): {verification_url}")
-        raise ConnectionErrors(
-            f"Email service error: {str(e)}. For development, use: {verification_url}"
-        )
-
-async def send_reset_password_email(email_to: EmailStr, token: str):
-    """Send password reset email. Raises exception if email is configured but fails."""
-    if not conf:
-        reset_url = f"{FRONTEND_URL}/reset-password?token={token}"
-        print(f"⚠️ Email not configured. Reset link: {reset_url}")
-        raise ConnectionErrors("Email service not configured. Please set SMTP_USER and SMTP_PASSWORD in .env")
-    
-    try:
-        reset_url = f"{FRONTEND_URL}/reset-password?token={token}"
-        message = MessageSchema(
-            subject="Reset your password - CampusConnect",
-            recipients=[email_to],
-            body=f"""Password Reset Request
+CampusConnect Team"""),
+    ),
+    "reset_password": (
+        _env.from_string("Reset your password - CampusConnect"),
+        _env.from_string("""Password Reset Request
 
 You requested to reset your password. Click the link below to set a new password:
 
-{reset_url}
+{{ url }}
 
 This link will expire in 1 hour.
 
 If you didn't request this, please ignore this email.
 
 Best regards,
-CampusConnect Team""",
-            subtype="plain"
-        )
-        fm = FastMail(conf)
-        await fm.send_message(message)
-    except ConnectionErrors as e:
-        reset_url = f"{FRONTEND_URL}/reset-password?token={token}"
-        print(f"❌ Email configuration error: {str(e)}")
-        print(f"💡 Reset link (for testing): {reset_url}")
-        raise ConnectionErrors(
-            f"Email service error: {str(e)}. For development, use: {reset_url}"
-        )
+CampusConnect Team"""),
+    ),
+}
+
+
+def render(template: str, **context) -> tuple:
+    """Render a (subject, body) pair from a precompiled template."""
+    subject, body = TEMPLATES[template]
+    return subject.render(**context), body.render(**context)
+
+
+async def send_verification_email(email_to: EmailStr, token: str):
+    """Queue a verification email. Raises ConnectionErrors if email is not configured."""
+    verification_url = f"{FRONTEND_URL}/verify-email?token={token}"
+    if not EMAIL_CONFIGURED:
+        print(f"⚠️ Email not configured. Verification link: {verification_url}")
+        raise ConnectionErrors("Email service not configured. Please set SMTP_USER and SMTP_PASSWORD in .env")
+    subject, body = render("verify_email", url=verification_url)
+    await email_queue.enqueue(email_to, subject, body)
+
+
+async def send_reset_password_email(email_to: EmailStr, token: str):
+    """Queue a password reset email. Raises ConnectionErrors if email is not configured."""
+    reset_url = f"{FRONTEND_URL}/reset-password?token={token}"
+    if not EMAIL_CONFIGURED:
+        print(f"⚠️ Email not configured. Reset link: {reset_url}")
+        raise ConnectionErrors("Email service not configured. Please set SMTP_USER and SMTP_PASSWORD in .env")
+    subject, body = render("reset_password", url=reset_url)
+    await email_queue.enqueue(email_to, subject, body)
@@ -0,0 +1,64 @@
+import asyncio
+from typing import Optional
+import httpx
+from core.config import (
+    HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS,
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_RETRIES, HTTP_RETRY_BACKOFF_SECONDS,
+)
+
+# Shared client: keep-alive connections are reused across requests.
+# Created on startup and closed on shutdown (see main.py).
+_client: Optional[httpx.AsyncClient] = None
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRY_STATUSES = {502, 503, 504}
+
+
+async def start_http_client():
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS),
+        )
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    if _client is None:
+        raise RuntimeError("HTTP client not started")
+    return _client
+
+
+async def request_with_retry(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a request on the shared client, retrying with exponential backoff.
+    Connection failures are always retried (the request never reached the server).
+    So is a server dropping the connection without any response, typically a
+    pooled keep-alive connection it had already closed; should a POST have been
+    processed anyway, re-sending a used OAuth code just fails with invalid_grant.
+    Read timeouts and 502/503/504 are retried only for idempotent methods, so a
+    single-use OAuth code is not re-posted while the server may still be using it.
+    """
+    method = method.upper()
+    idempotent = method in IDEMPOTENT_METHODS
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        last_attempt = attempt == HTTP_MAX_RETRIES
+        try:
+            response = await get_http_client().request(method, url, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.RemoteProtocolError):
+            if last_attempt:
+                raise
+        except httpx.ReadTimeout:
+            if last_attempt or not idempotent:
+                raise
+        else:
+            if not idempotent or response.status_code not in RETRY_STATUSES or last_attempt:
+                return response
+        await asyncio.sleep(HTTP_RETRY_BACKOFF_SECONDS * (2 ** attempt))
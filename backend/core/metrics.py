@@ -0,0 +1,205 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow requests
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Tuple[str, ...], values: Labels, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        # Updates come from the event loop and from driver threads (Mongo listeners)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        super().__init__(name, help, labels)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1.0):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self.values.items())
+        return self.header() + [f"{self.name}{_label_str(self.labels, k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """A gauge set directly, or read from `callback` (returning {labels: value}) at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (),
+                 callback: Optional[Callable[[], Dict[Labels, float]]] = None):
+        super().__init__(name, help, labels)
+        self.values: Dict[Labels, float] = {}
+        self.callback = callback
+
+    def inc(self, labels: Labels = (), amount: float = 1.0):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1.0):
+        self.inc(labels, -amount)
+
+    def render(self) -> List[str]:
+        if self.callback is not None:
+            items = list(self.callback().items())
+        else:
+            with self._lock:
+                items = list(self.values.items())
+        return self.header() + [f"{self.name}{_label_str(self.labels, k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """
+    Fixed-bucket histogram. observe() is one bisect and three additions under a lock;
+    buckets are stored per-bucket and only made cumulative when scraped.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self.series: Dict[Labels, list] = {}
+
+    def observe(self, labels: Labels, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(s[0]), s[1], s[2]) for k, s in self.series.items()]
+        lines = self.header()
+        bounds = self.buckets + (float("inf"),)
+        for labels, counts, total, count in items:
+            cumulative = 0
+            for bound, n in zip(bounds, counts):
+                cumulative += n
+                le = f'le="{_fmt(bound)}"'
+                lines.append(f"{self.name}_bucket{_label_str(self.labels, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_str(self.labels, labels)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_label_str(self.labels, labels)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                # A broken callback must not take down the whole scrape
+                lines.append(f"# {metric.name} unavailable: {_escape(e)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.",
+    ("method", "route", "status"),
+))
+http_latency = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.",
+    ("method", "route"),
+))
+http_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled, by method.", ("method",),
+))
+mongo_command_latency = registry.register(Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command round-trip time by command and collection.",
+    ("command", "collection"),
+))
+mongo_command_failures = registry.register(Counter(
+    "mongodb_command_failures_total", "MongoDB commands that returned an error, by command and collection.",
+    ("command", "collection"),
+))
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task/stream overhead) recording
+    request counts, latency and in-flight requests. Routes are labelled by their
+    template ("/jobs/{job_id}"), so label cardinality stays bounded; requests that
+    match no route share the "unmatched" label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+        http_in_flight.inc((method,))
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.dec((method,))
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+            http_requests.inc((method, template, str(status)))
+            http_latency.observe((method, template), elapsed)
@@ -0,0 +1,38 @@
+from typing import Any
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any):
+    """Types orjson does not know natively; everything else (dict, list, datetime...) is handled in Rust."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        # by_alias keeps "_id" keys, matching what FastAPI's encoder produced
+        return obj.model_dump(by_alias=True)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    Project-wide JSON response rendered with orjson.
+    Routes with a response_model are validated by pydantic and then rendered here.
+    Hot list routes return ORJSONResponse(raw_mongo_dicts) directly, which skips
+    jsonable_encoder and per-row model construction entirely; ObjectId is handled
+    by the default hook. Nothing validates those rows, so such routes document their
+    shape with responses={200: {"model": ...}} instead of response_model, and
+    tests/test_response_models.py keeps each projection in step with its model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class MessageResponse(BaseModel):
+    msg: str
@@ -1,17 +1,84 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
+from fastapi import HTTPException
 from jose import jwt
-from core.config import SECRET_KEY, ALGORITHM
+from core.config import SECRET_KEY, ALGORITHM, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS
 from itsdangerous import URLSafeTimedSerializer
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-def hash_password(password: str):
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop.
+# The semaphore caps in-flight hashes; callers wait for a slot up to the queue timeout.
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_slots = None
+
+hash_metrics = {
+    "queued": 0,        # waiting for a worker slot right now
+    "in_flight": 0,     # currently hashing/verifying
+    "completed": 0,
+    "rejected": 0,      # timed out in the queue (returned 503)
+    "total_seconds": 0.0,
+    "max_seconds": 0.0,
+}
+
+
+def _hash_password_sync(password: str) -> str:
     # bcrypt supports max 72 bytes; truncate if longer
     return pwd_context.hash(password[:72])
 
-def verify_password(plain_password, hashed_password):
+
+def _verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    if not hashed_password:
+        # e.g. accounts created through Google sign-in have no password
+        return False
     return pwd_context.verify(plain_password[:72], hashed_password)
 
+
+async def _run_in_hash_pool(func, *args):
+    global _hash_slots
+    if _hash_slots is None:
+        _hash_slots = asyncio.Semaphore(PASSWORD_HASH_WORKERS)
+
+    hash_metrics["queued"] += 1
+    try:
+        await asyncio.wait_for(_hash_slots.acquire(), timeout=PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        hash_metrics["rejected"] += 1
+        raise HTTPException(status_code=503, detail="Server busy, please retry shortly.")
+    finally:
+        hash_metrics["queued"] -= 1
+
+    hash_metrics["in_flight"] += 1
+    start = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        elapsed = time.perf_counter() - start
+        hash_metrics["in_flight"] -= 1
+        hash_metrics["completed"] += 1
+        hash_metrics["total_seconds"] += elapsed
+        hash_metrics["max_seconds"] = max(hash_metrics["max_seconds"], elapsed)
+        _hash_slots.release()
+
+
+async def hash_password(password: str) -> str:
+    return await _run_in_hash_pool(_hash_password_sync, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(_verify_password_sync, plain_password, hashed_password)
+
+
+def hash_pool_stats() -> dict:
+    completed = hash_metrics["completed"]
+    return {
+        **hash_metrics,
+        "avg_seconds": round(hash_metrics["total_seconds"] / completed, 4) if completed else 0.0,
+        "workers": PASSWORD_HASH_WORKERS,
+    }
+
 def create_access_token(data: dict, expires_delta: int = 60*24):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=expires_delta)
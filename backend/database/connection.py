@@ -1,11 +1,217 @@
+import threading
+import time
+from typing import Dict, Optional
 from beanie import init_beanie
-from motor.motor_asyncio import AsyncIOMotorClient
-from models.user_model import User
-from models.job_model import Job
-from models.application_model import Application
-from models.chat_model import ChatMessage
-from core.config import MONGO_URI
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import monitoring
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+from core.config import (
+    MONGO_URI, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_MAX_IDLE_TIME_MS,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS, MONGO_CONNECT_TIMEOUT_MS, MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS, MONGO_COMPRESSORS, MONGO_READ_PREFERENCE,
+    MONGO_READ_HEAVY_PREFERENCE, MONGO_READ_HEAVY_MAX_STALENESS_SECONDS,
+)
+from core.metrics import Gauge, mongo_command_latency, mongo_command_failures, registry
+from database.indexes import DOCUMENT_MODELS, verify_indexes
+from database.migrations import run_migrations
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def read_preference(name: str, max_staleness: int = -1):
+    if name not in READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference {name!r}; use one of {', '.join(READ_PREFERENCES)}")
+    if name == "primary":
+        return Primary()
+    return READ_PREFERENCES[name](max_staleness=max_staleness)
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    Connection pool counters per server, fed by pymongo's CMAP events.
+    Events arrive on driver threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.servers: Dict[str, Dict] = {}
+
+    def _server(self, address) -> Dict:
+        key = f"{address[0]}:{address[1]}"
+        server = self.servers.get(key)
+        if server is None:
+            server = self.servers[key] = {
+                "open_connections": 0,
+                "checked_out": 0,
+                "checkouts": 0,
+                "checkout_failures": 0,
+                "checkout_wait_total_ms": 0.0,
+                "checkout_wait_max_ms": 0.0,
+                "pool_clears": 0,
+            }
+        return server
+
+    def connection_created(self, event):
+        with self._lock:
+            self._server(event.address)["open_connections"] += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._server(event.address)["open_connections"] -= 1
+
+    def connection_checked_out(self, event):
+        wait_ms = event.duration * 1000
+        with self._lock:
+            server = self._server(event.address)
+            server["checked_out"] += 1
+            server["checkouts"] += 1
+            server["checkout_wait_total_ms"] += wait_ms
+            server["checkout_wait_max_ms"] = max(server["checkout_wait_max_ms"], wait_ms)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._server(event.address)["checked_out"] -= 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self._server(event.address)["checkout_failures"] += 1
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._server(event.address)["pool_clears"] += 1
+
+    # Remaining CMAP events carry nothing we report
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_check_out_started(self, event): pass
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            servers = {}
+            for address, s in self.servers.items():
+                avg = s["checkout_wait_total_ms"] / s["checkouts"] if s["checkouts"] else 0.0
+                servers[address] = {
+                    **s,
+                    "checkout_wait_total_ms": round(s["checkout_wait_total_ms"], 3),
+                    "checkout_wait_max_ms": round(s["checkout_wait_max_ms"], 3),
+                    "checkout_wait_avg_ms": round(avg, 3),
+                }
+            return servers
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """
+    Times every Mongo command by command name and collection.
+    Only the started event names the collection, so it is remembered per
+    request id until the matching succeeded/failed event arrives.
+    """
+
+    def __init__(self):
+        self._collections: Dict[int, str] = {}
+
+    def started(self, event):
+        target = event.command.get("collection") if event.command_name == "getMore" else event.command.get(event.command_name)
+        self._collections[event.request_id] = target if isinstance(target, str) else ""
+
+    def succeeded(self, event):
+        collection = self._collections.pop(event.request_id, "")
+        mongo_command_latency.observe((event.command_name, collection), event.duration_micros / 1e6)
+
+    def failed(self, event):
+        collection = self._collections.pop(event.request_id, "")
+        labels = (event.command_name, collection)
+        mongo_command_latency.observe(labels, event.duration_micros / 1e6)
+        mongo_command_failures.inc(labels)
+
+
+class MongoManager:
+    """
+    The process's single Mongo client, configured from core.config.
+    Created by init_db() on startup and closed by close_db() on shutdown.
+    """
+
+    def __init__(self):
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.pool_stats = PoolStats()
+        self.command_metrics = CommandMetrics()
+        self.read_heavy_preference = read_preference(MONGO_READ_HEAVY_PREFERENCE, MONGO_READ_HEAVY_MAX_STALENESS_SECONDS)
+
+    def connect(self) -> AsyncIOMotorClient:
+        options = dict(
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+            read_preference=read_preference(MONGO_READ_PREFERENCE),
+            event_listeners=[self.pool_stats, self.command_metrics],
+        )
+        if MONGO_COMPRESSORS:
+            options["compressors"] = MONGO_COMPRESSORS
+        self.client = AsyncIOMotorClient(MONGO_URI, **options)
+        return self.client
+
+    def read_heavy(self, collection: AsyncIOMotorCollection) -> AsyncIOMotorCollection:
+        """The collection with the read-heavy read preference (may be served by secondaries)."""
+        return collection.with_options(read_preference=self.read_heavy_preference)
+
+    async def ping_ms(self) -> float:
+        started = time.perf_counter()
+        await self.client.admin.command("ping")
+        return (time.perf_counter() - started) * 1000
+
+    def stats(self) -> Dict:
+        return {
+            "max_pool_size": MONGO_MAX_POOL_SIZE,
+            "read_preference": MONGO_READ_PREFERENCE,
+            "read_heavy_preference": MONGO_READ_HEAVY_PREFERENCE,
+            "servers": self.pool_stats.snapshot(),
+        }
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+
+mongo = MongoManager()
+
+
+def _pool_gauge(field: str, scale: float = 1.0):
+    return lambda: {(address,): s[field] * scale for address, s in mongo.pool_stats.snapshot().items()}
+
+
+registry.register(Gauge(
+    "mongodb_pool_checked_out_connections", "Connections currently checked out of the pool, by server.",
+    ("server",), callback=_pool_gauge("checked_out"),
+))
+registry.register(Gauge(
+    "mongodb_pool_open_connections", "Open pooled connections, by server.",
+    ("server",), callback=_pool_gauge("open_connections"),
+))
+registry.register(Gauge(
+    "mongodb_pool_checkout_wait_seconds_cumulative", "Cumulative time spent waiting to check out a connection, by server.",
+    ("server",), callback=_pool_gauge("checkout_wait_total_ms", 0.001),
+))
+
 
 async def init_db():
-    client = AsyncIOMotorClient(MONGO_URI)
-    await init_beanie(database=client.campusconnect, document_models=[User, Job, Application, ChatMessage])
+    client = mongo.connect()
+    # init_beanie creates any index declared in a model's Settings.indexes
+    await init_beanie(database=client.campusconnect, document_models=DOCUMENT_MODELS)
+    await verify_indexes()
+    await run_migrations()
+
+
+async def close_db():
+    mongo.close()
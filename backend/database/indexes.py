@@ -0,0 +1,86 @@
+# database/indexes.py
+from typing import List
+from pymongo import ASCENDING, DESCENDING
+from models.user_model import EMAIL_COLLATION, User
+from models.job_model import Job
+from models.application_model import Application
+from models.chat_model import ChatMessage
+from models.email_model import OutboundEmail
+from models.extraction_job_model import ExtractionJob
+
+DOCUMENT_MODELS = [User, Job, Application, ChatMessage, OutboundEmail, ExtractionJob]
+
+# Query shapes issued by the routes: (model, filter, sort[, collation]).
+# Values are placeholders; only the shape matters to the planner.
+KNOWN_QUERIES = [
+    (User, {"email": "user@example.com"}, None),
+    (User, {"email": {"$in": ["user@example.com"]}}, None, EMAIL_COLLATION),
+    (Job, {}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    (Job, {"status": "open"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    (Application, {"job_id": "job", "user_id": "user"}, None),
+    (Application, {"user_id": "user"}, None),
+    (Application, {"job_id": "job"}, None),
+    (Application, {"job_id": "job", "status": "Pending"}, None),
+    (ChatMessage, {"room_id": "room"}, [("timestamp", ASCENDING), ("_id", ASCENDING)]),
+    (OutboundEmail, {"status": "pending", "next_attempt_at": {"$lte": 0}}, [("next_attempt_at", ASCENDING)]),
+]
+
+
+async def verify_indexes():
+    """
+    Check that every index declared in a model's Settings exists on its collection.
+    init_beanie creates missing indexes; this catches builds that silently failed
+    (e.g. a unique index over existing duplicates). Raises RuntimeError listing what is missing.
+    """
+    missing = []
+    for model in DOCUMENT_MODELS:
+        declared = getattr(model.Settings, "indexes", None) or []
+        existing = await model.get_pymongo_collection().index_information()
+        for index in declared:
+            name = index.document["name"]
+            if name not in existing:
+                missing.append(f"{model.Settings.name}.{name}")
+    if missing:
+        raise RuntimeError(f"Missing MongoDB indexes: {', '.join(missing)}")
+
+
+def _has_collscan(plan) -> bool:
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(_has_collscan(v) for v in plan.values())
+    if isinstance(plan, list):
+        return any(_has_collscan(v) for v in plan)
+    return False
+
+
+async def find_collscans() -> List[str]:
+    """Run explain() on each known route query and return the ones planned as COLLSCAN."""
+    offenders = []
+    for model, query, sort, *collation in KNOWN_QUERIES:
+        cursor = model.get_pymongo_collection().find(query, collation=collation[0] if collation else None)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.limit(1).explain()
+        if _has_collscan(explain.get("queryPlanner", {}).get("winningPlan", {})):
+            offenders.append(f"{model.Settings.name} {query} sort={sort}")
+    return offenders
+
+
+async def assert_no_collscans():
+    offenders = await find_collscans()
+    if offenders:
+        raise RuntimeError("Queries falling back to COLLSCAN:\n  " + "\n  ".join(offenders))
+
+
+if __name__ == "__main__":
+    # python -m database.indexes : build/verify indexes and check query plans
+    import asyncio
+    from database.connection import init_db
+
+    async def main():
+        await init_db()
+        await assert_no_collscans()
+        print("✅ All declared indexes present; no known query uses COLLSCAN")
+
+    asyncio.run(main())
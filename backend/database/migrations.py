@@ -0,0 +1,25 @@
+# database/migrations.py
+from models.job_model import Job
+
+
+async def backfill_applicant_counts():
+    """
+    Jobs created before applicant_count existed get it from the applicants list,
+    so apply_to_job can maintain it with a plain $inc. Idempotent: only touches
+    jobs still missing the field.
+    """
+    result = await Job.get_pymongo_collection().update_many(
+        {"applicant_count": {"$exists": False}},
+        [{"$set": {"applicant_count": {"$size": {"$ifNull": ["$applicants", []]}}}}],
+    )
+    if result.modified_count:
+        print(f"🔧 Backfilled applicant_count on {result.modified_count} job(s)")
+
+
+# Run in order on every startup; each must be idempotent and cheap once applied
+MIGRATIONS = [backfill_applicant_counts]
+
+
+async def run_migrations():
+    for migration in MIGRATIONS:
+        await migration()
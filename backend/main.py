@@ -1,10 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from database.connection import init_db
+from database.connection import init_db, close_db
+from core.http_client import start_http_client, close_http_client
+from utils.job_index import job_index
+from utils.job_search import job_search
+from utils.view_counter import view_counter
+from utils.chat_writer import chat_writer
+from utils.extraction_jobs import extraction_queue
+from utils.email_queue import email_queue
+from core.email import EMAIL_CONFIGURED
+from core.responses import ORJSONResponse
+from core.metrics import MetricsMiddleware
 from routes import auth_routes, job_routes, application_routes
 from routes import websocket_routes, chat_routes, profile_routes, google_routes, upload_routes
+from routes import health_routes
 
-app = FastAPI(title="CampusConnect Backend")
+app = FastAPI(title="CampusConnect Backend", default_response_class=ORJSONResponse)
 
 # CORS middleware for frontend integration
 app.add_middleware(
@@ -14,10 +25,31 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Request counts, latency histograms and in-flight gauges, served at /metrics
+app.add_middleware(MetricsMiddleware)
 
 @app.on_event("startup")
 async def startup_event():
     await init_db()
+    await chat_writer.recover()
+    await start_http_client()
+    await job_index.build()
+    await job_search.build()
+    view_counter.start()
+    await websocket_routes.manager.start()
+    if EMAIL_CONFIGURED:
+        email_queue.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await view_counter.stop()
+    await chat_writer.stop()
+    await extraction_queue.stop()
+    await email_queue.stop()
+    await websocket_routes.manager.stop()
+    await close_http_client()
+    # Last: everything above may still flush writes to Mongo
+    await close_db()
 
 # Register all routes
 app.include_router(auth_routes.router)
@@ -28,6 +60,7 @@ app.include_router(websocket_routes.router)
 app.include_router(profile_routes.router)
 app.include_router(google_routes.router)
 app.include_router(upload_routes.router)
+app.include_router(health_routes.router)
 
 
 @app.get("/")
@@ -1,6 +1,9 @@
 from beanie import Document
 from datetime import datetime
 from typing import Optional
+from beanie import PydanticObjectId
+from pydantic import BaseModel, ConfigDict, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class Application(Document):
     job_id: str
@@ -8,7 +11,30 @@ class Application(Document):
     status: str = "Pending"
     proposal: Optional[str] = None
     resume_url: Optional[str] = None
-    created_at: datetime = datetime.utcnow()
+    created_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "applications"
+        indexes = [
+            # One application per (job, user); enforced by Mongo, not a read-then-insert check
+            IndexModel([("job_id", ASCENDING), ("user_id", ASCENDING)], unique=True, name="job_user_unique"),
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created_at"),
+            IndexModel([("job_id", ASCENDING), ("status", ASCENDING)], name="job_status"),
+        ]
+
+
+class ApplicationOut(BaseModel):
+    """Public view of an Application, read straight from Mongo by the list routes."""
+    # Built from raw rows ("_id") or from a Document ("id")
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PydanticObjectId = Field(alias="_id")
+    job_id: str
+    user_id: str
+    status: str = "Pending"
+    proposal: Optional[str] = None
+    resume_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Settings:
+        projection = {"job_id": 1, "user_id": 1, "status": 1, "proposal": 1, "resume_url": 1, "created_at": 1}
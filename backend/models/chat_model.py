@@ -1,7 +1,8 @@
 from datetime import datetime
-from beanie import Document
-from pydantic import Field
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
 from typing import Optional
+from pymongo import ASCENDING, IndexModel
 
 class ChatMessage(Document):
     room_id: str                     # Usually application_id or a shared job_id
@@ -12,3 +13,19 @@ class ChatMessage(Document):
 
     class Settings:
         name = "chat_messages"       # MongoDB collection name
+        indexes = [
+            # Room history, ordered by time
+            IndexModel([("room_id", ASCENDING), ("timestamp", ASCENDING), ("_id", ASCENDING)], name="room_timestamp_id"),
+        ]
+
+
+class ChatMessageOut(BaseModel):
+    """Slim projection of a ChatMessage for history pages and exports."""
+    id: PydanticObjectId = Field(alias="_id")
+    sender_id: str
+    sender_name: Optional[str] = None
+    message: str
+    timestamp: datetime
+
+    class Settings:
+        projection = {"sender_id": 1, "sender_name": 1, "message": 1, "timestamp": 1}
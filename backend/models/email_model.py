@@ -0,0 +1,23 @@
+from datetime import datetime
+from beanie import Document
+from pydantic import Field
+from typing import Optional
+from pymongo import ASCENDING, IndexModel
+
+class OutboundEmail(Document):
+    to: str
+    subject: str
+    body: str
+    status: str = "pending"          # pending -> sending -> sent | failed
+    attempts: int = 0
+    last_error: Optional[str] = None
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = None
+
+    class Settings:
+        name = "outbound_emails"
+        indexes = [
+            # The sender claims the oldest due message of a status
+            IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt"),
+        ]
@@ -0,0 +1,21 @@
+from datetime import datetime
+from beanie import Document
+from pydantic import Field
+from typing import List, Optional
+from pymongo import ASCENDING, IndexModel
+from core.config import EXTRACTION_JOB_TTL_SECONDS
+
+class ExtractionJob(Document):
+    user_id: str
+    status: str = "queued"           # queued -> running -> done | failed | timeout
+    skills_found: Optional[List[str]] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    class Settings:
+        name = "extraction_jobs"
+        indexes = [
+            # Status is only polled shortly after upload; Mongo deletes old jobs itself
+            IndexModel([("created_at", ASCENDING)], name="created_at_ttl", expireAfterSeconds=EXTRACTION_JOB_TTL_SECONDS),
+        ]
@@ -1,4 +1,6 @@
-from beanie import Document
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, ConfigDict, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from typing import List, Optional
 from datetime import datetime
 
@@ -7,10 +9,66 @@ class Job(Document):
     description: str
     tags: List[str]
     created_by: str  # user_id
-    created_at: datetime = datetime.utcnow()
+    created_at: datetime = Field(default_factory=datetime.utcnow)
     status: str = "open"  # open, filled, draft
     views: int = 0
     applicants: List[str] = []
+    applicant_count: int = 0  # kept in step with applicants by one atomic update
 
     class Settings:
         name = "jobs"
+        indexes = [
+            # Keyset pagination on (created_at, _id), newest first
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="status_created_at_id"),
+        ]
+
+
+class JobOut(BaseModel):
+    """Public view of a Job. List routes read it straight from Mongo with this projection."""
+    # Built from raw rows ("_id") or from a Document ("id")
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    description: str
+    tags: List[str] = []
+    created_by: str
+    created_at: Optional[datetime] = None
+    status: str = "open"
+    views: int = 0
+    applicants: List[str] = []
+    applicant_count: int = 0
+
+    class Settings:
+        projection = {
+            "title": 1,
+            "description": 1,
+            "tags": 1,
+            "created_by": 1,
+            "created_at": 1,
+            "status": 1,
+            "views": {"$ifNull": ["$views", 0]},
+            "applicants": {"$ifNull": ["$applicants", []]},
+            "applicant_count": {"$ifNull": ["$applicant_count", {"$size": {"$ifNull": ["$applicants", []]}}]},
+        }
+
+
+class JobSummary(BaseModel):
+    """Lightweight projection of a Job for list views."""
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    tags: List[str] = []
+    status: str = "open"
+    created_at: Optional[datetime] = None
+    applicant_count: int = 0
+
+    class Settings:
+        projection = {
+            "title": 1,
+            "tags": 1,
+            "status": 1,
+            "created_at": 1,
+            # Jobs written before applicant_count existed fall back to the list size
+            "applicant_count": {"$ifNull": ["$applicant_count", {"$size": {"$ifNull": ["$applicants", []]}}]},
+        }
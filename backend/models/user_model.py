@@ -1,6 +1,10 @@
-from beanie import Document
-from pydantic import EmailStr, Field
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional, List
+from pymongo import ASCENDING, IndexModel
+
+# Compares emails ignoring case (strength 2: case-insensitive, accent-sensitive)
+EMAIL_COLLATION = {"locale": "en", "strength": 2}
 
 class User(Document):
     # name: str
@@ -23,6 +27,27 @@ class User(Document):
 
     class Settings:
         name = "users"
+        indexes = [
+            # Login, registration and password flows all look users up by email
+            IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+            # Case-insensitive email lookups (bulk ingest) must pass the same collation to use it
+            IndexModel([("email", ASCENDING)], name="email_ci", collation=EMAIL_COLLATION),
+        ]
 
 
     
+
+
+
+class UserOut(BaseModel):
+    """What the API returns for a user: never the password hash or reset token."""
+    # Built from raw rows ("_id") or from a Document ("id")
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PydanticObjectId = Field(alias="_id")
+    name: str
+    email: EmailStr
+    skills: List[str] = []
+    interests: List[str] = []
+    role: str = "seeker"
+    verified: bool = False
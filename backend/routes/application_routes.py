@@ -1,40 +1,88 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Optional, List
-from models.application_model import Application
+from beanie import PydanticObjectId
+from pydantic import BaseModel
+from pymongo.errors import DuplicateKeyError
+from models.application_model import Application, ApplicationOut
 from models.job_model import Job
 from core.dependencies import get_current_user
+from core.responses import ORJSONResponse, MessageResponse
 
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
 
+# ----------------------------
+# 🧱 Schemas
+# ----------------------------
+class ApplicationCreated(BaseModel):
+    msg: str
+    application_id: str
+
+
+class MyApplications(BaseModel):
+    total: int
+    applications: List[ApplicationOut]
+
+
+class JobApplicants(BaseModel):
+    job_title: str
+    total_applicants: int
+    applicants: List[ApplicationOut]
+
+
+class FilteredApplicants(BaseModel):
+    job_title: str
+    status_filter: str
+    results: List[ApplicationOut]
+
+
+async def find_applications(query: dict) -> List[dict]:
+    """Raw projected application rows, serialized without building a model per row."""
+    return await Application.get_pymongo_collection().find(query, ApplicationOut.Settings.projection).to_list(None)
+
+
 # ----------------------------
 # 🟢 Apply to a Job
 # ----------------------------
-@router.post("/")
+@router.post("/", response_model=ApplicationCreated)
 async def apply_to_job(job_id: str, proposal: Optional[str] = None, resume_url: Optional[str] = None, current_user=Depends(get_current_user)):
-    # Check if the job exists
-    job = await Job.get(job_id)
-    if not job:
+    try:
+        job_oid = PydanticObjectId(job_id)
+    except Exception:
         raise HTTPException(status_code=404, detail="Job not found")
+    user_id = str(current_user.id)
+    jobs = Job.get_pymongo_collection()
 
-    # Prevent applying twice
-    existing = await Application.find_one(Application.job_id == job_id, Application.user_id == str(current_user.id))
-    if existing:
-        raise HTTPException(status_code=400, detail="Already applied to this job.")
-
-    # Create application entry
+    # The application is the source of truth: insert it first, so the unique
+    # (job_id, user_id) index decides races and a duplicate never touches the job.
+    # A missing job is caught by the update below, keeping this to two round trips.
     new_app = Application(
         job_id=job_id,
-        user_id=str(current_user.id),
+        user_id=user_id,
         proposal=proposal,
         resume_url=resume_url,
         status="Pending"
     )
-    await new_app.insert()
+    try:
+        await new_app.insert()
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Already applied to this job.")
 
-    # Add applicant to job’s applicant list
-    job.applicants.append(str(current_user.id))
-    await job.save()
+    # Add the applicant and bump the counter in one atomic update; the $ne guard
+    # keeps the two in step if this user is somehow already on the list
+    try:
+        result = await jobs.update_one(
+            {"_id": job_oid, "applicants": {"$ne": user_id}},
+            {"$addToSet": {"applicants": user_id}, "$inc": {"applicant_count": 1}},
+        )
+    except Exception:
+        # Roll back so the user can retry; a stray application would block them for good
+        await new_app.delete()
+        raise
+    if result.matched_count == 0 and not await jobs.find_one({"_id": job_oid}, {"_id": 1}):
+        # No such job, or it was deleted while we were applying
+        await new_app.delete()
+        raise HTTPException(status_code=404, detail="Job not found")
 
     return {"msg": "Application submitted successfully.", "application_id": str(new_app.id)}
 
@@ -42,16 +90,16 @@ async def apply_to_job(job_id: str, proposal: Optional[str] = None, resume_url:
 # ----------------------------
 # 🔵 View My Applications (Talent Seeker)
 # ----------------------------
-@router.get("/my")
+@router.get("/my", responses={200: {"model": MyApplications}})
 async def get_my_applications(current_user=Depends(get_current_user)):
-    apps = await Application.find(Application.user_id == str(current_user.id)).to_list()
-    return {"total": len(apps), "applications": apps}
+    apps = await find_applications({"user_id": str(current_user.id)})
+    return ORJSONResponse({"total": len(apps), "applications": apps})
 
 
 # ----------------------------
 # 🟣 View Applicants for My Job (Talent Finder)
 # ----------------------------
-@router.get("/job/{job_id}")
+@router.get("/job/{job_id}", responses={200: {"model": JobApplicants}})
 async def get_job_applicants(job_id: str, current_user=Depends(get_current_user)):
     job = await Job.get(job_id)
     if not job:
@@ -61,14 +109,14 @@ async def get_job_applicants(job_id: str, current_user=Depends(get_current_user)
     if job.created_by != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not authorized to view applicants for this job.")
 
-    applicants = await Application.find(Application.job_id == job_id).to_list()
-    return {"job_title": job.title, "total_applicants": len(applicants), "applicants": applicants}
+    applicants = await find_applications({"job_id": job_id})
+    return ORJSONResponse({"job_title": job.title, "total_applicants": len(applicants), "applicants": applicants})
 
 
 # ----------------------------
 # 🟠 Update Application Status (shortlist/reject/accept)
 # ----------------------------
-@router.patch("/{application_id}")
+@router.patch("/{application_id}", response_model=MessageResponse)
 async def update_application_status(application_id: str, status: str = Query(..., regex="^(Shortlisted|Rejected|Accepted)$"), current_user=Depends(get_current_user)):
     app = await Application.get(application_id)
     if not app:
@@ -91,7 +139,7 @@ async def update_application_status(application_id: str, status: str = Query(...
 # ----------------------------
 # 🔍 Filter Applicants by Status (Finder view)
 # ----------------------------
-@router.get("/job/{job_id}/filter")
+@router.get("/job/{job_id}/filter", responses={200: {"model": FilteredApplicants}})
 async def filter_applicants(job_id: str, status: Optional[str] = None, current_user=Depends(get_current_user)):
     job = await Job.get(job_id)
     if not job:
@@ -104,5 +152,5 @@ async def filter_applicants(job_id: str, status: Optional[str] = None, current_u
     if status:
         query["status"] = status
 
-    filtered_apps = await Application.find(query).to_list()
-    return {"job_title": job.title, "status_filter": status or "All", "results": filtered_apps}
+    filtered_apps = await find_applications(query)
+    return ORJSONResponse({"job_title": job.title, "status_filter": status or "All", "results": filtered_apps})
@@ -1,9 +1,12 @@
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends
-from models.user_model import User
+from models.user_model import User, UserOut
 from core.security import hash_password, verify_password, create_access_token, generate_token, verify_token
-from core.dependencies import get_current_user
+from core.dependencies import get_current_user, invalidate_user, update_user
 from pydantic import BaseModel, EmailStr
 from core.email import send_verification_email, send_reset_password_email
+from core.responses import MessageResponse
+from pymongo import ReturnDocument
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -24,12 +27,20 @@ class ResetPasswordSchema(BaseModel):
     token: str
     new_password: str
 
-@router.post("/register")
+class RegisterResponse(BaseModel):
+    msg: str
+    verification_url: Optional[str] = None  # development only, when email could not be sent
+
+class TokenResponse(BaseModel):
+    access_token: str
+    token_type: str
+
+@router.post("/register", response_model=RegisterResponse, response_model_exclude_none=True)
 async def register_user(user: RegisterSchema):
     existing = await User.find_one(User.email == user.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered.")
-    hashed = hash_password(user.password)
+    hashed = await hash_password(user.password)
     new_user = User(name=user.name, email=user.email, hashed_password=hashed)
     await new_user.insert()
     
@@ -53,27 +64,37 @@ async def register_user(user: RegisterSchema):
     
     return {"msg": "User registered successfully. Please check your email for verification link."}
 
-@router.post("/login")
+@router.post("/login", response_model=TokenResponse)
 async def login_user(data: LoginSchema):
     user = await User.find_one(User.email == data.email)
-    if not user or not verify_password(data.password, user.hashed_password):
+    if not user or not await verify_password(data.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials.")
     token = create_access_token({"sub": str(user.id)})
     return {"access_token": token, "token_type": "bearer"}
 
-@router.get("/me")
+@router.get("/me", response_model=UserOut)
 async def get_profile(current_user: User = Depends(get_current_user)):
     return current_user
 
-@router.patch("/switch-role")
+@router.patch("/switch-role", response_model=MessageResponse)
 async def switch_role(current_user: User = Depends(get_current_user)):
-    current_user.role = "finder" if current_user.role == "seeker" else "seeker"
-    await current_user.save()
-    return {"msg": f"Role switched to {current_user.role}"}
+    # Flip the stored role in one update, so a stale cached copy cannot decide it
+    try:
+        updated = await User.get_pymongo_collection().find_one_and_update(
+            {"_id": current_user.id},
+            [{"$set": {"role": {"$cond": [{"$eq": ["$role", "seeker"]}, "finder", "seeker"]}}}],
+            projection={"role": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+    finally:
+        invalidate_user(current_user.id)
+    if not updated:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"msg": f"Role switched to {updated['role']}"}
 
 
 
-@router.post("/request-verification")
+@router.post("/request-verification", response_model=MessageResponse)
 async def request_verification(email_schema: ForgotPasswordSchema):
     user = await User.find_one(User.email == email_schema.email)
     if not user:
@@ -94,7 +115,7 @@ async def request_verification(email_schema: ForgotPasswordSchema):
             detail=f"Email service unavailable. For development, use this link: {verification_url}"
         )
 
-@router.get("/verify")
+@router.get("/verify", response_model=MessageResponse)
 async def verify_email(token: str):
     email = verify_token(token, purpose="email-verify", max_age=3600*24)
     if not email:
@@ -102,18 +123,16 @@ async def verify_email(token: str):
     user = await User.find_one(User.email == email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    user.verified = True
-    await user.save()
+    await update_user(user.id, {"verified": True})
     return {"msg": "Email verified successfully"}
 
-@router.post("/forgot-password")
+@router.post("/forgot-password", response_model=MessageResponse)
 async def forgot_password(request: ForgotPasswordSchema):
     user = await User.find_one(User.email == request.email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     token = generate_token(user.email, purpose="password-reset")
-    user.reset_password_token = token
-    await user.save()
+    await update_user(user.id, {"reset_password_token": token})
     try:
         await send_reset_password_email(user.email, token)
         return {"msg": "Password reset email sent"}
@@ -127,7 +146,7 @@ async def forgot_password(request: ForgotPasswordSchema):
             detail=f"Email service unavailable. For development, use this link: {reset_url}"
         )
 
-@router.post("/reset-password")
+@router.post("/reset-password", response_model=MessageResponse)
 async def reset_password(data: ResetPasswordSchema):
     email = verify_token(data.token, purpose="password-reset", max_age=3600*1)
     if not email:
@@ -135,7 +154,8 @@ async def reset_password(data: ResetPasswordSchema):
     user = await User.find_one(User.email == email)
     if not user or user.reset_password_token != data.token:
         raise HTTPException(status_code=400, detail="Invalid token or user")
-    user.hashed_password = hash_password(data.new_password)
-    user.reset_password_token = None
-    await user.save()
+    await update_user(user.id, {
+        "hashed_password": await hash_password(data.new_password),
+        "reset_password_token": None,
+    })
     return {"msg": "Password reset successful"}
@@ -1,13 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException
-from models.chat_model import ChatMessage
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from models.chat_model import ChatMessage, ChatMessageOut
 from core.dependencies import get_current_user
+from core.responses import ORJSONResponse, dumps
+from utils.pagination import encode_cursor, keyset_filter, keyset_sort
+from utils.chat_cache import chat_cache
+from utils.chat_writer import chat_writer
 
 router = APIRouter(prefix="/chat", tags=["Chat History"])
 
-@router.get("/{room_id}")
-async def get_chat_history(room_id: str, current_user=Depends(get_current_user)):
-    """Fetch chat history for a specific room"""
-    messages = await ChatMessage.find(ChatMessage.room_id == room_id).sort("+timestamp").to_list()
+
+class ChatHistoryPage(BaseModel):
+    room_id: str
+    total_messages: int
+    messages: List[ChatMessageOut]
+    has_more: bool
+    prev_cursor: Optional[str] = None
+    next_cursor: Optional[str] = None
+
+
+@router.get("/{room_id}", responses={200: {"model": ChatHistoryPage}})
+async def get_chat_history(
+    room_id: str,
+    limit: int = Query(50, ge=1, le=200, description="Number of messages to return"),
+    before: Optional[str] = Query(None, description="Return messages older than this cursor"),
+    after: Optional[str] = Query(None, description="Return messages newer than this cursor"),
+    current_user=Depends(get_current_user)
+):
+    """
+    Fetch one page of chat history for a room, oldest first within the page.
+    Without a cursor the newest page is returned; page back with prev_cursor as `before`
+    and poll for new messages with next_cursor as `after`.
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either before or after, not both")
+
+    # Hot rooms are served from the in-memory ring buffer when it covers the page
+    cached = chat_cache.page(room_id, limit, before=before, after=after)
+    if cached is None and room_id not in chat_cache.rooms:
+        pending = [chat for chat, _ in chat_writer.pending if chat.room_id == room_id]
+        await chat_cache.fill(room_id, pending)
+        cached = chat_cache.page(room_id, limit, before=before, after=after, record=False)
+
+    if cached is not None:
+        messages, has_more = cached
+    else:
+        # Walk newest-first unless reading forward from an `after` cursor
+        descending = not after
+        query = {"room_id": room_id, **keyset_filter("timestamp", before or after, descending=descending)}
+        # Primary reads only: the cache fill above merges writer-pending messages, and
+        # a lagging secondary could miss ones already flushed, leaving a gap in the page
+        rows = await (
+            ChatMessage.get_pymongo_collection()
+            .find(query, ChatMessageOut.Settings.projection)
+            .sort(keyset_sort("timestamp", descending=descending))
+            .limit(limit + 1)
+            .to_list(limit + 1)
+        )
+        messages = [ChatMessageOut.model_validate(row) for row in rows]
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        if descending:
+            messages.reverse()
+
     # Return an empty message list if no history exists yet.
     # The frontend expects a 200 response and can render an empty conversation.
-    return {"room_id": room_id, "total_messages": len(messages), "messages": messages}
+    first, last = (messages[0], messages[-1]) if messages else (None, None)
+    return ORJSONResponse({
+        "room_id": room_id,
+        "total_messages": len(messages),
+        "messages": messages,
+        "has_more": has_more,
+        "prev_cursor": encode_cursor(first.timestamp, first.id) if first else before,
+        "next_cursor": encode_cursor(last.timestamp, last.id) if last else after,
+    })
+
+
+@router.get("/{room_id}/export")
+async def export_chat_history(room_id: str, current_user=Depends(get_current_user)):
+    """
+    Stream the full room history as NDJSON, one message per line, without buffering the room.
+    Lines are the same raw projected rows as the history pages ("_id", not "id").
+    """
+    async def lines():
+        cursor = (
+            ChatMessage.get_pymongo_collection()
+            .find({"room_id": room_id}, ChatMessageOut.Settings.projection)
+            .sort(keyset_sort("timestamp", descending=False))
+        )
+        async for row in cursor:
+            yield dumps(row) + b"\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="chat_{room_id}.ndjson"'},
+    )
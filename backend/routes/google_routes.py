@@ -1,7 +1,10 @@
-import requests
+import time
+import httpx
 from fastapi import APIRouter, HTTPException, Depends
 from models.user_model import User
 from core.security import create_access_token
+from core.http_client import request_with_retry
+from routes.auth_routes import TokenResponse
 from pydantic import BaseModel
 import os
 
@@ -10,6 +13,38 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI")
+GOOGLE_DISCOVERY_URL = os.getenv("GOOGLE_DISCOVERY_URL", "https://accounts.google.com/.well-known/openid-configuration")
+GOOGLE_DISCOVERY_TTL_SECONDS = 24 * 3600
+# After a failed discovery the fallback is served this long before trying again,
+# so an outage costs one slow lookup per interval rather than one per login
+GOOGLE_DISCOVERY_RETRY_SECONDS = 5 * 60
+
+# Used until discovery succeeds
+DEFAULT_GOOGLE_ENDPOINTS = {
+    "authorization_endpoint": "https://accounts.google.com/o/oauth2/v2/auth",
+    "token_endpoint": "https://oauth2.googleapis.com/token",
+    "userinfo_endpoint": "https://www.googleapis.com/oauth2/v2/userinfo",
+}
+
+_discovery_cache = {"endpoints": None, "expires_at": 0.0}
+
+
+async def get_google_endpoints() -> dict:
+    """Provider endpoints from the OpenID discovery document, cached for a day (5 minutes after a failure)."""
+    if _discovery_cache["endpoints"] and _discovery_cache["expires_at"] > time.time():
+        return _discovery_cache["endpoints"]
+    try:
+        res = await request_with_retry("GET", GOOGLE_DISCOVERY_URL)
+        res.raise_for_status()
+        doc = res.json()
+        endpoints = {key: doc.get(key) or default for key, default in DEFAULT_GOOGLE_ENDPOINTS.items()}
+        _discovery_cache.update(endpoints=endpoints, expires_at=time.time() + GOOGLE_DISCOVERY_TTL_SECONDS)
+        return endpoints
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"⚠️ Google discovery failed, using default endpoints: {e}")
+        endpoints = _discovery_cache["endpoints"] or DEFAULT_GOOGLE_ENDPOINTS
+        _discovery_cache.update(endpoints=endpoints, expires_at=time.time() + GOOGLE_DISCOVERY_RETRY_SECONDS)
+        return endpoints
 
 class GoogleLoginResponse(BaseModel):
     url: str
@@ -25,36 +60,44 @@ async def google_login():
         "prompt": "consent"
     }
     query = "&".join(f"{k}={v}" for k, v in params.items())
-    url = f"https://accounts.google.com/o/oauth2/v2/auth?{query}"
+    endpoints = await get_google_endpoints()
+    url = f"{endpoints['authorization_endpoint']}?{query}"
     return {"url": url}
 
-@router.get("/google/callback")
+@router.get("/google/callback", response_model=TokenResponse)
 async def google_callback(code: str):
     if not code:
         raise HTTPException(status_code=400, detail="Code not provided")
-    # Exchange code for token
-    token_res = requests.post(
-        "https://oauth2.googleapis.com/token",
-        data={
-            "code": code,
-            "client_id": GOOGLE_CLIENT_ID,
-            "client_secret": GOOGLE_CLIENT_SECRET,
-            "redirect_uri": GOOGLE_REDIRECT_URI,
-            "grant_type": "authorization_code"
-        },
-        headers={"Content-Type": "application/x-www-form-urlencoded"}
-    )
-    token_res_json = token_res.json()
-    access_token = token_res_json.get("access_token")
-    if not access_token:
-        raise HTTPException(status_code=400, detail="Failed to get access token")
+    endpoints = await get_google_endpoints()
+    try:
+        # Exchange code for token
+        token_res = await request_with_retry(
+            "POST",
+            endpoints["token_endpoint"],
+            data={
+                "code": code,
+                "client_id": GOOGLE_CLIENT_ID,
+                "client_secret": GOOGLE_CLIENT_SECRET,
+                "redirect_uri": GOOGLE_REDIRECT_URI,
+                "grant_type": "authorization_code"
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        token_res_json = token_res.json()
+        access_token = token_res_json.get("access_token")
+        if not access_token:
+            raise HTTPException(status_code=400, detail="Failed to get access token")
+
+        # Get user info
+        user_info_res = await request_with_retry(
+            "GET",
+            endpoints["userinfo_endpoint"],
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+        user_info = user_info_res.json()
+    except (httpx.HTTPError, ValueError):
+        raise HTTPException(status_code=502, detail="Google sign-in is temporarily unavailable")
 
-    # Get user info
-    user_info_res = requests.get(
-        "https://www.googleapis.com/oauth2/v2/userinfo",
-        headers={"Authorization": f"Bearer {access_token}"}
-    )
-    user_info = user_info_res.json()
     email = user_info.get("email")
     name = user_info.get("name")
 
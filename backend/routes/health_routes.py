@@ -0,0 +1,55 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from core.dependencies import principal_cache_stats
+from core.metrics import CONTENT_TYPE, registry
+from core.responses import ORJSONResponse
+from core.security import hash_pool_stats
+from database.connection import mongo
+from utils.chat_cache import chat_cache
+from utils.email_queue import email_queue
+from utils.resume_cache import resume_cache
+
+router = APIRouter(tags=["Health"])
+
+
+# ----------------------------
+# 🩺 Health + pool stats
+# ----------------------------
+@router.get("/health")
+async def health():
+    """
+    Liveness plus the numbers needed to size pools: Mongo connection checkouts and
+    wait times per server, and the in-process caches and worker pools.
+    Returns 503 when MongoDB does not answer a ping.
+    """
+    mongo_health = mongo.stats()
+    status_code = 200
+    try:
+        mongo_health["ping_ms"] = round(await mongo.ping_ms(), 3)
+        mongo_health["status"] = "ok"
+    except Exception as e:
+        # Unauthenticated endpoint: the driver's message (hosts, topology) goes to the log only
+        print(f"❌ Health check: MongoDB ping failed: {e!r}")
+        mongo_health["status"] = "unavailable"
+        status_code = 503
+    return ORJSONResponse(
+        {
+            "status": "ok" if status_code == 200 else "degraded",
+            "mongo": mongo_health,
+            "password_hashing": hash_pool_stats(),
+            "principal_cache": principal_cache_stats(),
+            "chat_cache": chat_cache.stats(),
+            "resume_cache": resume_cache.stats(),
+            "email_queue": email_queue.stats(),
+        },
+        status_code=status_code,
+    )
+
+
+# ----------------------------
+# 📈 Prometheus metrics
+# ----------------------------
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Request, Mongo command and WebSocket metrics in Prometheus text format."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
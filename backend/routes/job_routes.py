@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from models.job_model import Job
-from core.dependencies import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from models.job_model import Job, JobOut, JobSummary
+from core.dependencies import get_current_user, get_optional_user_id
+from core.responses import ORJSONResponse, MessageResponse
+from database.connection import mongo
 from pydantic import BaseModel
-from typing import List, Optional
-from utils.recommendation import rank_jobs_for_user
+from typing import Dict, List, Optional, Union
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument
+from utils.job_index import job_index
+from utils.job_search import job_search
+from utils.view_counter import view_counter
+from utils.pagination import encode_cursor, keyset_filter, keyset_sort
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
@@ -24,44 +31,156 @@ class JobUpdate(BaseModel):
     status: Optional[str] = None  # e.g. "open", "filled", "draft"
 
 
+class JobCreated(BaseModel):
+    msg: str
+    id: str
+
+
+class JobUpdated(BaseModel):
+    msg: str
+    updated_fields: Dict
+
+
+class JobPage(BaseModel):
+    results: List[Union[JobOut, JobSummary]]
+    next_cursor: Optional[str] = None
+
+
+class JobSearchPage(JobPage):
+    total: Optional[int] = None        # search mode only
+    next_offset: Optional[int] = None  # search mode only
+    filters_used: Dict
+
+
+class RankedJob(BaseModel):
+    job: JobOut
+    match_score: float
+
+
+class RecommendedJobs(BaseModel):
+    total_jobs: int
+    recommendations: List[RankedJob]
+    message: Optional[str] = None
+
+
+def job_projection(view: str) -> dict:
+    return (JobSummary if view == "summary" else JobOut).Settings.projection
+
+
+def job_reads():
+    """
+    Jobs collection for listing/search reads, which may be routed to secondaries.
+    A secondary can lag the primary, so a job created moments ago may not be listed
+    yet; its creator is handed the id by POST /jobs/ and GET /jobs/{id} reads the primary.
+    """
+    return mongo.read_heavy(Job.get_pymongo_collection())
+
+
+# ----------------------------
+# 📄 Keyset pagination helper
+# ----------------------------
+async def paginate_jobs(query: dict, limit: int, cursor: Optional[str], view: str):
+    """
+    Return one page of jobs ordered newest first on (created_at, _id).
+    Seeking past the cursor keeps the Mongo scan bounded by `limit` at any depth.
+    Rows are raw projected dicts; they go to the client without building a model per row.
+    """
+    after = keyset_filter("created_at", cursor)
+    if query and after:
+        query = {"$and": [query, after]}
+    else:
+        query = query or after
+
+    find = (
+        job_reads()
+        .find(query, job_projection(view))
+        .sort(keyset_sort("created_at"))
+        .limit(limit + 1)
+    )
+    jobs = await find.to_list(limit + 1)
+
+    next_cursor = None
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        last = jobs[-1]
+        next_cursor = encode_cursor(last["created_at"], last["_id"])
+    return {"results": jobs, "next_cursor": next_cursor}
+
+
 # ----------------------------
 # 🟢 Create Job (Finder only)
 # ----------------------------
-@router.post("/")
+@router.post("/", response_model=JobCreated)
 async def create_job(job: JobCreate, current_user=Depends(get_current_user)):
     if current_user.role != "finder":
         raise HTTPException(status_code=403, detail="Only finders can post jobs.")
     new_job = Job(**job.dict(), created_by=str(current_user.id))
     await new_job.insert()
+    job_index.add(new_job)
+    job_search.add(new_job)
     return {"msg": "Job created successfully", "id": str(new_job.id)}
 
 
 # ----------------------------
 # 🔵 Get All Jobs (public)
 # ----------------------------
-@router.get("/")
-async def list_jobs():
-    jobs = await Job.find_all().to_list()
-    return jobs
+@router.get("/", responses={200: {"model": JobPage}})
+async def list_jobs(
+    limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    view: str = Query("full", pattern="^(full|summary)$", description="full documents or summary projection")
+):
+    return ORJSONResponse(await paginate_jobs({}, limit, cursor, view))
+
+
+# ----------------------------
+# ⭐ Get Recommended Jobs for User
+# ----------------------------
+# Declared before /{job_id} so "recommended" is not captured as a job id.
+@router.get("/recommended", responses={200: {"model": RecommendedJobs}})
+async def get_recommended_jobs(
+    limit: int = Query(20, ge=1, le=100, description="Number of recommendations to return"),
+    offset: int = Query(0, ge=0, description="Number of recommendations to skip"),
+    current_user=Depends(get_current_user)
+):
+    """Get personalized job recommendations based on user skills"""
+    total, page = job_index.top_k(current_user.skills or [], limit=limit, offset=offset)
+    if not page:
+        return {"message": "No jobs available", "total_jobs": total, "recommendations": []}
+
+    ids = [PydanticObjectId(job_id) for job_id, _ in page]
+    find = job_reads().find({"_id": {"$in": ids}}, JobOut.Settings.projection)
+    jobs = {str(j["_id"]): j for j in await find.to_list(len(ids))}
+    ranked = [
+        {"job": jobs[job_id], "match_score": score}
+        for job_id, score in page
+        if job_id in jobs
+    ]
+    return ORJSONResponse({
+        "total_jobs": total,
+        "recommendations": ranked
+    })
 
 
 # ----------------------------
 # 🟣 Get Job by ID
 # ----------------------------
-@router.get("/{job_id}")
-async def get_job(job_id: str):
+@router.get("/{job_id}", response_model=JobOut)
+async def get_job(job_id: str, request: Request, user_id: Optional[str] = Depends(get_optional_user_id)):
     job = await Job.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    job.views += 1
-    await job.save()
+    # Views are buffered and flushed as batched $inc writes; this handler only reads
+    viewer = user_id or (request.client.host if request.client else None)
+    view_counter.record(job_id, viewer)
+    job.views += view_counter.pending_views(job_id)
     return job
 
 
 # ----------------------------
 # 🟠 Update Job (PUT /jobs/{id})
 # ----------------------------
-@router.put("/{job_id}")
+@router.put("/{job_id}", response_model=JobUpdated)
 async def update_job(job_id: str, data: JobUpdate, current_user=Depends(get_current_user)):
     job = await Job.get(job_id)
     if not job:
@@ -71,11 +190,18 @@ async def update_job(job_id: str, data: JobUpdate, current_user=Depends(get_curr
     if job.created_by != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not authorized to edit this job")
 
-    # Update fields dynamically
+    # $set only the edited fields; save() would write back this copy's views
+    # and applicants over concurrent increments
     update_data = {k: v for k, v in data.dict().items() if v is not None}
-    for key, value in update_data.items():
-        setattr(job, key, value)
-    await job.save()
+    if update_data:
+        updated = await Job.get_pymongo_collection().find_one_and_update(
+            {"_id": job.id}, {"$set": update_data}, return_document=ReturnDocument.AFTER
+        )
+        if not updated:
+            raise HTTPException(status_code=404, detail="Job not found")
+        job = Job.model_validate(updated)
+        job_index.update(job)
+        job_search.update(job)
 
     return {"msg": "Job updated successfully", "updated_fields": update_data}
 
@@ -83,7 +209,7 @@ async def update_job(job_id: str, data: JobUpdate, current_user=Depends(get_curr
 # ----------------------------
 # 🔴 Delete Job
 # ----------------------------
-@router.delete("/{job_id}")
+@router.delete("/{job_id}", response_model=MessageResponse)
 async def delete_job(job_id: str, current_user=Depends(get_current_user)):
     job = await Job.get(job_id)
     if not job:
@@ -93,49 +219,46 @@ async def delete_job(job_id: str, current_user=Depends(get_current_user)):
         raise HTTPException(status_code=403, detail="Not authorized to delete this job")
 
     await job.delete()
+    job_index.remove(job_id)
+    job_search.remove(job_id)
     return {"msg": "Job deleted successfully"}
 
 
 # ----------------------------
 # 🔍 Search / Filter Jobs
 # ----------------------------
-@router.get("/filter/")
+@router.get("/filter/", responses={200: {"model": JobSearchPage}})
 async def filter_jobs(
+    q: Optional[str] = Query(None, description="Full-text search over title, description and tags"),
     title: Optional[str] = Query(None, description="Filter by job title"),
-    tag: Optional[str] = Query(None, description="Filter by a specific tag"),
+    tag: Optional[str] = Query(None, description="Jobs with a tag containing this text (case-insensitive)"),
     status: Optional[str] = Query(None, description="Filter by job status"),
-    limit: int = Query(20, description="Number of results to return")
+    limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
+    offset: int = Query(0, ge=0, description="Number of ranked results to skip (search mode)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    view: str = Query("full", pattern="^(full|summary)$", description="full documents or summary projection")
 ):
-    query = {}
-
-    if title:
-        query["title"] = {"$regex": title, "$options": "i"}  # case-insensitive search
-    if tag:
-        query["tags"] = {"$regex": tag, "$options": "i"}
-    if status:
-        query["status"] = status
-
-    # If query is empty, return all jobs
-    if not query:
-        jobs = await Job.find_all().limit(limit).to_list()
-    else:
-        jobs = await Job.find(query).limit(limit).to_list()
-
-    return {"results": jobs, "filters_used": query}
+    text = q or title
+    filters_used = {k: v for k, v in {"q": text, "tag": tag, "status": status}.items() if v}
 
+    # Plain status listing stays on the indexed keyset path
+    if not text and not tag:
+        query = {"status": status} if status else {}
+        page = await paginate_jobs(query, limit, cursor, view)
+        return ORJSONResponse({**page, "filters_used": filters_used})
 
-# ----------------------------
-# ⭐ Get Recommended Jobs for User
-# ----------------------------
-@router.get("/recommended")
-async def get_recommended_jobs(current_user=Depends(get_current_user)):
-    """Get personalized job recommendations based on user skills"""
-    all_jobs = await Job.find_all().to_list()
-    if not all_jobs:
-        return {"message": "No jobs available", "recommendations": []}
-    
-    ranked = rank_jobs_for_user(current_user, all_jobs)
-    return {
-        "total_jobs": len(all_jobs),
-        "recommendations": ranked
-    }
+    # Search mode: ranked lookups against the in-process index, no $regex scans
+    total, ranked = job_search.search(text, status=status, tag=tag, limit=limit, offset=offset)
+    ids = [PydanticObjectId(job_id) for job_id, _ in ranked]
+    by_id = {}
+    if ids:
+        find = job_reads().find({"_id": {"$in": ids}}, job_projection(view))
+        by_id = {str(j["_id"]): j for j in await find.to_list(len(ids))}
+    results = [by_id[job_id] for job_id, _ in ranked if job_id in by_id]
+    next_offset = offset + limit if offset + limit < total else None
+    return ORJSONResponse({
+        "results": results,
+        "total": total,
+        "next_offset": next_offset,
+        "filters_used": filters_used,
+    })
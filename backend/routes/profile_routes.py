@@ -1,9 +1,9 @@
 
-from fastapi import APIRouter, Depends, HTTPException
-from models.user_model import User
-from core.dependencies import get_current_user
+from fastapi import APIRouter, Depends
+from models.user_model import User, UserOut
+from core.dependencies import get_current_user, update_user
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 router = APIRouter(prefix="/profile", tags=["Profile"])
 
@@ -12,18 +12,17 @@ class ProfileUpdate(BaseModel):
     skills: Optional[List[str]] = None
     interests: Optional[List[str]] = None
 
-@router.put("/edit")
-async def edit_profile(data: ProfileUpdate, current_user: User = Depends(get_current_user)):
-    user = await User.get(current_user.id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+class ProfileUpdated(BaseModel):
+    msg: str
+    updated_fields: Dict
 
+@router.put("/edit", response_model=ProfileUpdated)
+async def edit_profile(data: ProfileUpdate, current_user: User = Depends(get_current_user)):
     update_data = {k: v for k, v in data.dict().items() if v is not None}
-    for key, value in update_data.items():
-        setattr(user, key, value)
-    await user.save()
+    if update_data:
+        await update_user(current_user.id, update_data)
     return {"msg": "Profile updated successfully", "updated_fields": update_data}
 
-@router.get("/me")
+@router.get("/me", response_model=UserOut)
 async def get_my_profile(current_user: User = Depends(get_current_user)):
     return current_user
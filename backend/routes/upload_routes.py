@@ -1,44 +1,136 @@
+import hashlib
+import os
+import tempfile
 from pathlib import Path
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Request
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from core.dependencies import get_current_user
-from utils.skill_extraction import extract_skills_from_resume
+from core.config import MAX_RESUME_BYTES, UPLOAD_CHUNK_BYTES
+from utils.extraction_jobs import extraction_queue
+from utils.upload_stream import check_content_length, file_chunks
 
 # Use absolute path based on backend directory
 UPLOAD_DIR = Path(__file__).parent.parent / "uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+PDF_MAGIC = b"%PDF-"
+
 router = APIRouter(prefix="/upload", tags=["File Upload"])
 
-@router.post("/resume")
-async def upload_resume(file: UploadFile = File(...), current_user=Depends(get_current_user)):
-    if not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+# The body is parsed by hand (see save_resume), so describe it for the OpenAPI docs
+RESUME_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                },
+            },
+            "application/pdf": {"schema": {"type": "string", "format": "binary"}},
+        },
+    },
+}
+
+
+class ResumeUploaded(BaseModel):
+    msg: str
+    path: str
+    size: int
+    sha256: str
+
+
+class ExtractionQueued(BaseModel):
+    msg: str
+    job_id: str
+    status: str
+    status_url: str
+
 
-    filename = f"{current_user.id}_resume.pdf"
-    file_path = UPLOAD_DIR / filename
+class ExtractionStatus(BaseModel):
+    job_id: str
+    user_id: str
+    status: str  # queued, running, done, failed or timeout
+    skills_found: Optional[List[str]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
 
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
 
-    return {"msg": "Resume uploaded successfully", "path": str(file_path)}
+async def save_resume(request: Request, user_id) -> dict:
+    """
+    Stream an uploaded PDF from the request body to UPLOAD_DIR.
+    A declared Content-Length over MAX_RESUME_BYTES is refused before reading; otherwise
+    the type is checked by magic bytes, the size cap is enforced and the SHA-256 computed
+    as the bytes arrive. Nothing is spooled first: the body goes to disk once, into a temp
+    file in the same directory that is atomically renamed, so readers never see a partial resume.
+    """
+    check_content_length(request, MAX_RESUME_BYTES)
+    file_path = UPLOAD_DIR / f"{user_id}_resume.pdf"
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_DIR, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb", buffering=UPLOAD_CHUNK_BYTES) as out:
+            async for chunk in file_chunks(request):
+                # Network chunks can be tiny, so the magic bytes may span several
+                if len(head) < len(PDF_MAGIC):
+                    head += chunk[:len(PDF_MAGIC) - len(head)]
+                    if not PDF_MAGIC.startswith(head):
+                        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+                size += len(chunk)
+                if size > MAX_RESUME_BYTES:
+                    raise HTTPException(status_code=413, detail=f"Resume exceeds the {MAX_RESUME_BYTES} byte limit")
+                digest.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+        if head != PDF_MAGIC:
+            raise HTTPException(status_code=400, detail="Only PDF files are supported")
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return {"path": file_path, "size": size, "sha256": digest.hexdigest()}
 
 
+@router.post("/resume", response_model=ResumeUploaded, openapi_extra=RESUME_BODY)
+async def upload_resume(request: Request, current_user=Depends(get_current_user)):
+    stored = await save_resume(request, current_user.id)
+    return {
+        "msg": "Resume uploaded successfully",
+        "path": str(stored["path"]),
+        "size": stored["size"],
+        "sha256": stored["sha256"],
+    }
 
-@router.post("/resume/skills")
-async def upload_and_extract_skills(file: UploadFile = File(...), current_user=Depends(get_current_user)):
-    if not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
-    filename = f"{current_user.id}_resume.pdf"
-    file_path = UPLOAD_DIR / filename
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+@router.post("/resume/skills", status_code=202, response_model=ExtractionQueued, openapi_extra=RESUME_BODY)
+async def upload_and_extract_skills(request: Request, current_user=Depends(get_current_user)):
+    """Store the resume and queue skill extraction; poll the returned status_url for the result."""
+    stored = await save_resume(request, current_user.id)
+    job_id = await extraction_queue.submit(
+        current_user.id, str(stored["path"]), sha256=stored["sha256"], size=stored["size"]
+    )
+    return {
+        "msg": "Resume uploaded, skill extraction queued",
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/upload/resume/skills/{job_id}",
+    }
 
-    skills = extract_skills_from_resume(str(file_path))
-    if skills:
-        # auto-update user profile
-        user = current_user
-        user.skills = list(set(user.skills + skills))
-        await user.save()
 
-    return {"msg": "Skills extracted successfully", "skills_found": skills}
+@router.get("/resume/skills/{job_id}", response_model=ExtractionStatus)
+async def get_extraction_status(job_id: str, current_user=Depends(get_current_user)):
+    """Status of a skill extraction job: queued, running, done, failed or timeout."""
+    job = await extraction_queue.get(job_id)
+    if not job or job.user_id != str(current_user.id):
+        raise HTTPException(status_code=404, detail="Extraction job not found")
+    return {"job_id": str(job.id), **job.model_dump(exclude={"id"})}
@@ -1,40 +1,181 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from typing import List, Dict
+from typing import Dict, Set
 from models.chat_model import ChatMessage
 from core.dependencies import get_current_user
+from core.config import WS_SEND_QUEUE_SIZE, WS_SLOW_CONSUMER_POLICY
+from core.metrics import Gauge, registry
+from utils.chat_writer import chat_writer
+from utils.backplane import Backplane, create_backplane
+from utils.chat_cache import chat_cache, to_out
+from utils.chat_codec import OutboundMessage, negotiate
+from models.chat_model import ChatMessageOut
 from datetime import datetime
-import json
+import asyncio
 
 router = APIRouter(prefix="/ws", tags=["Chat System"])
 
+# ----------------------------------------------------
+# One outbound queue + writer task per connected socket
+# ----------------------------------------------------
+class ClientConnection:
+    def __init__(self, websocket: WebSocket, room_id: str, manager: "ConnectionManager", codec):
+        self.websocket = websocket
+        self.room_id = room_id
+        self.manager = manager
+        self.codec = codec
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+        self.dropped = 0
+        self.writer = asyncio.create_task(self._drain())
+
+    async def _drain(self):
+        """Send queued frames in order; a failed send prunes this connection."""
+        try:
+            while True:
+                frame = await self.queue.get()
+                if self.codec.binary:
+                    await self.websocket.send_bytes(frame)
+                else:
+                    await self.websocket.send_text(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.manager.disconnect(self.websocket, self.room_id)
+
+    def offer(self, frame) -> bool:
+        """Queue a frame without waiting. Returns False if the client is too far behind."""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    def close(self):
+        self.writer.cancel()
+
+
 # ----------------------------------------------------
 # Connection Manager to handle active WebSocket clients
 # ----------------------------------------------------
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}  # room_id: [sockets]
+    def __init__(self, backplane: Backplane = None):
+        # room_id: {socket: connection}
+        self.active_connections: Dict[str, Dict[WebSocket, ClientConnection]] = {}
+        # Carries room broadcasts to other workers; subscribed per room held here
+        self.backplane = backplane or create_backplane()
+        # Pending closes of slow consumers; the loop keeps only weak references to tasks
+        self._close_tasks: Set[asyncio.Task] = set()
+
+    async def start(self):
+        await self.backplane.start(self.deliver_remote)
+
+    async def stop(self):
+        await self.backplane.stop()
 
     async def connect(self, websocket: WebSocket, room_id: str):
-        await websocket.accept()
+        """Accept the socket, negotiating the binary protocol if the client offers it."""
+        codec = negotiate(websocket.scope.get("subprotocols"))
+        await websocket.accept(subprotocol=codec.subprotocol)
         if room_id not in self.active_connections:
-            self.active_connections[room_id] = []
-        self.active_connections[room_id].append(websocket)
+            self.active_connections[room_id] = {}
+            self.backplane.subscribe(room_id)
+        conn = ClientConnection(websocket, room_id, self, codec)
+        self.active_connections[room_id][websocket] = conn
+        return conn
 
     def disconnect(self, websocket: WebSocket, room_id: str):
-        if room_id in self.active_connections:
-            self.active_connections[room_id].remove(websocket)
-            if not self.active_connections[room_id]:
-                del self.active_connections[room_id]
+        room = self.active_connections.get(room_id)
+        if room is None:
+            return
+        conn = room.pop(websocket, None)
+        if conn is not None:
+            conn.close()
+        if not room:
+            del self.active_connections[room_id]
+            self.backplane.unsubscribe(room_id)
 
     async def broadcast(self, room_id: str, message: dict):
-        """Send message to all users in the same room"""
-        if room_id in self.active_connections:
-            for connection in self.active_connections[room_id]:
-                await connection.send_text(json.dumps(message))
+        """
+        Send message to all users in the same room, on this worker and, through
+        the backplane, on any other worker holding sockets for the room.
+        """
+        outbound = OutboundMessage(message)
+        await self.deliver_local(room_id, outbound)
+        # Workers exchange the JSON encoding; each re-encodes for its own binary clients
+        await self.backplane.publish(room_id, outbound.json)
+
+    async def deliver_remote(self, room_id: str, frame: str):
+        """A message published by another worker: keep the history cache current, then deliver."""
+        outbound = OutboundMessage.from_json(frame)
+        if room_id in chat_cache.rooms or room_id in chat_cache.filling:
+            msg = outbound.message
+            chat_cache.append(room_id, ChatMessageOut.model_validate({
+                "_id": msg["id"],
+                "sender_id": msg["sender_id"],
+                "sender_name": msg.get("sender_name"),
+                "message": msg["message"],
+                "timestamp": msg["timestamp"],
+            }))
+        await self.deliver_local(room_id, outbound)
+
+    async def deliver_local(self, room_id: str, outbound: OutboundMessage):
+        """
+        Hand the encoded frame to each local connection's queue, so a slow
+        or dead client never delays the others. Each codec encodes the message once.
+        """
+        room = self.active_connections.get(room_id)
+        if not room:
+            return
+        for websocket, conn in list(room.items()):
+            if not conn.offer(outbound.frame(conn.codec)) and WS_SLOW_CONSUMER_POLICY == "disconnect":
+                self.disconnect(websocket, room_id)
+                task = asyncio.create_task(self._close_slow(websocket))
+                self._close_tasks.add(task)
+                task.add_done_callback(self._close_tasks.discard)
+
+    def send_to(self, websocket: WebSocket, room_id: str, message: dict):
+        """Queue a message for a single connection, if it is still open."""
+        conn = self.active_connections.get(room_id, {}).get(websocket)
+        if conn is not None:
+            conn.offer(conn.codec.encode(message))
+
+    def send_receipt(self, durable: asyncio.Future, websocket: WebSocket, room_id: str,
+                     client_msg_id, message_id: str):
+        """
+        When the batched write settles, send "ack" if the message is stored in Mongo,
+        or "nack" if it was not (e.g. spilled at shutdown), so the client can resend.
+        """
+        def settle(future: asyncio.Future):
+            stored = not future.cancelled() and future.exception() is None
+            receipt = {"type": "ack" if stored else "nack", "client_msg_id": client_msg_id, "id": message_id}
+            if not stored:
+                receipt["error"] = "Message was not stored"
+            self.send_to(websocket, room_id, receipt)
+
+        durable.add_done_callback(settle)
+
+    def connection_count(self) -> int:
+        return sum(len(room) for room in self.active_connections.values())
+
+    @staticmethod
+    async def _close_slow(websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)  # "try again later"
+        except Exception:
+            pass
 
 
 manager = ConnectionManager()
 
+registry.register(Gauge(
+    "websocket_connections", "Open chat WebSocket connections on this worker.",
+    callback=lambda: {(): manager.connection_count()},
+))
+registry.register(Gauge(
+    "websocket_rooms", "Chat rooms with at least one connection on this worker.",
+    callback=lambda: {(): len(manager.active_connections)},
+))
+
 
 # ----------------------------------------------------
 # WebSocket endpoint for live chat
@@ -45,35 +186,52 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str):
     Establishes a real-time WebSocket chat between Finder & Seeker.
     room_id = job_id or application_id (unique conversation)
     """
-    await manager.connect(websocket, room_id)
+    conn = await manager.connect(websocket, room_id)
+    codec = conn.codec
     try:
         while True:
-            data = await websocket.receive_text()
-            payload = json.loads(data)
+            if codec.binary:
+                data = await websocket.receive_bytes()
+            else:
+                data = await websocket.receive_text()
+            payload = codec.decode(data)
             message_text = payload.get("message")
             sender_id = payload.get("sender_id")
             sender_name = payload.get("sender_name")
 
-            # Save message to MongoDB
+            # Queue message for the next batched insert; broadcasting does not wait for it.
+            # Timestamps are cut to Mongo's millisecond precision so cached and stored
+            # copies sort and paginate identically.
+            now = datetime.utcnow()
             chat = ChatMessage(
                 room_id=room_id,
                 sender_id=sender_id,
                 sender_name=sender_name,
                 message=message_text,
-                timestamp=datetime.utcnow(),
+                timestamp=now.replace(microsecond=now.microsecond // 1000 * 1000),
             )
-            await chat.insert()
+            durable = chat_writer.submit(chat)
+            chat_cache.append(room_id, to_out(chat))
 
             # Broadcast to other participants in the same room
             await manager.broadcast(
                 room_id,
                 {
+                    "id": str(chat.id),
                     "sender_id": sender_id,
                     "sender_name": sender_name,
                     "message": message_text,
                     "timestamp": chat.timestamp.isoformat(),
                 },
             )
+
+            # Optional delivery receipt once the write settles
+            client_msg_id = payload.get("client_msg_id")
+            if client_msg_id is not None:
+                manager.send_receipt(durable, websocket, room_id, client_msg_id, str(chat.id))
     except WebSocketDisconnect:
-        manager.disconnect(websocket, room_id)
         print(f"🔴 Disconnected from room: {room_id}")
+    finally:
+        manager.disconnect(websocket, room_id)
+        # Make sure this room's buffered messages reach Mongo; other rooms keep batching
+        await chat_writer.flush(room_id)
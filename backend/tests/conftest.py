@@ -0,0 +1,46 @@
+import httpx
+import pytest
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+from core.dependencies import user_cache
+from core.security import create_access_token
+from database.indexes import DOCUMENT_MODELS
+from models.user_model import User
+
+
+@pytest.fixture
+async def db():
+    """A fresh in-memory database with every Beanie model initialised."""
+    client = AsyncMongoMockClient()
+    database = client.campusconnect_test
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+    yield database
+    client.close()
+
+
+@pytest.fixture
+async def client(db):
+    """An HTTP client for the app (without its lifespan), on the in-memory database."""
+    import main
+    user_cache.clear()
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as c:
+        yield c
+
+
+@pytest.fixture
+def make_user():
+    """Insert user number n: make_user(n, role="finder", skills=[...])."""
+    async def make(n: int = 0, role: str = "seeker", **fields) -> User:
+        user = User(name=f"User {n}", email=f"user{n}@example.edu", hashed_password="x", role=role, **fields)
+        await user.insert()
+        return user
+    return make
+
+
+@pytest.fixture
+def auth():
+    """Bearer headers for a user."""
+    def headers(user: User) -> dict:
+        return {"Authorization": "Bearer " + create_access_token({"sub": str(user.id)})}
+    return headers
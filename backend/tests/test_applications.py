@@ -0,0 +1,163 @@
+import asyncio
+import os
+import time
+from collections import Counter
+import httpx
+import pytest
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+from core.dependencies import user_cache
+from database.indexes import DOCUMENT_MODELS
+from models.application_model import Application
+from models.job_model import Job
+from models.user_model import User
+
+
+async def make_job(owner: User) -> Job:
+    job = Job(title="Backend intern", description="FastAPI", tags=["python"], created_by=str(owner.id))
+    await job.insert()
+    return job
+
+
+async def test_concurrent_applies_keep_count_and_list_in_step(client, make_user, auth):
+    owner = await make_user(0, role="finder")
+    job = await make_job(owner)
+    seekers = [await make_user(n) for n in range(1, 41)]
+
+    # Every seeker applies three times at once: exactly one of each must win
+    requests = [
+        client.post("/applications/", params={"job_id": str(job.id)}, headers=auth(seeker))
+        for seeker in seekers for _ in range(3)
+    ]
+    responses = await asyncio.gather(*requests)
+    codes = [r.status_code for r in responses]
+    assert codes.count(200) == len(seekers)
+    assert codes.count(400) == 2 * len(seekers)
+
+    stored = await Job.get(job.id)
+    assert stored.applicant_count == len(stored.applicants) == len(seekers)
+    assert sorted(stored.applicants) == sorted(str(s.id) for s in seekers)
+    assert await Application.find(Application.job_id == str(job.id)).count() == len(seekers)
+
+
+async def test_failed_job_update_rolls_back_the_application(client, monkeypatch, make_user, auth):
+    owner = await make_user(0, role="finder")
+    seeker = await make_user(1)
+    job = await make_job(owner)
+    collection = Job.get_pymongo_collection()
+
+    class Failing:
+        def __getattr__(self, name):
+            return getattr(collection, name)
+
+        async def update_one(self, *args, **kwargs):
+            raise ConnectionError("primary stepped down")
+
+    monkeypatch.setattr(Job, "get_pymongo_collection", classmethod(lambda cls: Failing()))
+    with pytest.raises(ConnectionError):
+        await client.post("/applications/", params={"job_id": str(job.id)}, headers=auth(seeker))
+    assert await Application.count() == 0
+
+    monkeypatch.undo()
+    r = await client.post("/applications/", params={"job_id": str(job.id)}, headers=auth(seeker))
+    assert r.status_code == 200
+    assert (await Job.get(job.id)).applicant_count == 1
+
+
+async def test_update_job_sets_only_edited_fields(client, make_user, auth):
+    owner = await make_user(0, role="finder")
+    job = await make_job(owner)
+    # Views and applicants change behind the editor's back
+    await Job.get_pymongo_collection().update_one(
+        {"_id": job.id}, {"$inc": {"views": 7, "applicant_count": 1}, "$addToSet": {"applicants": "u1"}}
+    )
+    r = await client.put(f"/jobs/{job.id}", headers=auth(owner), json={"title": "Backend engineer"})
+    assert r.status_code == 200
+    stored = await Job.get(job.id)
+    assert stored.title == "Backend engineer"
+    assert stored.views == 7 and stored.applicants == ["u1"] and stored.applicant_count == 1
+
+
+async def test_legacy_jobs_get_applicant_count_backfilled(db):
+    from database.migrations import run_migrations
+    await Job.get_pymongo_collection().insert_one(
+        {"title": "Old", "description": "", "tags": [], "created_by": "x", "applicants": ["a", "b"]}
+    )
+    await run_migrations()
+    await run_migrations()
+    legacy = await Job.get_pymongo_collection().find_one({"title": "Old"})
+    assert legacy["applicant_count"] == 2
+
+
+async def test_apply_to_missing_job_leaves_no_application(client, make_user, auth):
+    seeker = await make_user(1)
+    for job_id in ["not-an-id", "0" * 24]:
+        r = await client.post("/applications/", params={"job_id": job_id}, headers=auth(seeker))
+        assert r.status_code == 404
+    assert await Application.count() == 0
+
+
+@pytest.fixture
+async def mongod():
+    """A scratch database on a real mongod named by MONGO_TEST_URI; skipped when there is none."""
+    uri = os.getenv("MONGO_TEST_URI")
+    if not uri:
+        pytest.skip("set MONGO_TEST_URI to run against a real mongod")
+    commands = CommandCounter()
+    client = AsyncIOMotorClient(uri, serverSelectionTimeoutMS=2000, event_listeners=[commands])
+    try:
+        await client.admin.command("ping")
+    except PyMongoError as e:
+        client.close()
+        pytest.skip(f"no mongod at MONGO_TEST_URI: {e}")
+    database = client[f"campusconnect_burst_{os.getpid()}"]
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+    yield commands
+    await client.drop_database(database.name)
+    client.close()
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.counts = Counter()
+
+    def started(self, event):
+        self.counts[(event.command_name, event.command.get(event.command_name))] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def test_apply_burst_on_real_mongod(mongod, make_user, auth):
+    import main
+    user_cache.clear()
+    owner = await make_user(0, role="finder")
+    job = await make_job(owner)
+    seekers = [await make_user(n) for n in range(1, 201)]
+    headers = [auth(seeker) for seeker in seekers]
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # Warm the user cache so only the apply path itself is counted and timed
+        await asyncio.gather(*(client.get("/applications/my", headers=h) for h in headers))
+        mongod.counts.clear()
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post("/applications/", params={"job_id": str(job.id)}, headers=h)
+            for h in headers for _ in range(2)
+        ))
+        elapsed = time.perf_counter() - started
+
+    codes = [r.status_code for r in responses]
+    assert codes.count(200) == len(seekers) and codes.count(400) == len(seekers)
+    stored = await Job.get(job.id)
+    assert stored.applicant_count == len(stored.applicants) == len(seekers)
+    # Winners insert and update; losers stop at the duplicate insert; nobody reads the job first
+    assert mongod.counts[("insert", "applications")] == len(responses)
+    assert mongod.counts[("update", "jobs")] == len(seekers)
+    assert mongod.counts[("find", "jobs")] == 0
+    print(f"\n{len(responses)} applies in {elapsed * 1000:.0f} ms ({len(responses) / elapsed:.0f}/s)")
@@ -0,0 +1,237 @@
+import asyncio
+import multiprocessing
+import os
+import pytest
+from bson import ObjectId
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from utils.backplane import Backplane, InMemoryBackplane, MongoBackplane
+
+
+class CappedStandIn:
+    """In-process stand-in for a capped collection and its tailable cursors (mongomock has neither)."""
+
+    def __init__(self):
+        self.docs = []
+        self.changed = asyncio.Condition()
+        self.tails_opened = 0
+        self.tail_rooms = []
+        self.insert_calls = 0
+        self.fail_inserts = 0
+
+    async def insert_many(self, docs, ordered=True):
+        self.insert_calls += 1
+        if self.fail_inserts:
+            self.fail_inserts -= 1
+            raise ConnectionError("not primary")
+        async with self.changed:
+            for doc in docs:
+                self.docs.append({"_id": ObjectId(), **doc})
+            self.changed.notify_all()
+
+    def find(self, query=None, projection=None, cursor_type=None):
+        if cursor_type is not None:
+            self.tails_opened += 1
+            self.tail_rooms.append(query["room_id"]["$in"])
+            return TailStandIn(self, query)
+        return ListCursor(list(self.docs))
+
+
+class ListCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        self.docs.reverse()
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    async def to_list(self, length):
+        return self.docs
+
+
+class TailStandIn:
+    def __init__(self, collection, query):
+        self.collection = collection
+        self.query = query
+        self.position = 0
+
+    def _matches(self, doc):
+        q = self.query
+        return doc["room_id"] in q["room_id"]["$in"] and doc["origin"] != q["origin"]["$ne"] and doc["_id"] > q["_id"]["$gt"]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        async with self.collection.changed:
+            while True:
+                while self.position < len(self.collection.docs):
+                    doc = self.collection.docs[self.position]
+                    self.position += 1
+                    if self._matches(doc):
+                        return doc
+                await self.collection.changed.wait()
+
+    async def close(self):
+        pass
+
+
+def test_backplane_is_abstract():
+    with pytest.raises(TypeError):
+        Backplane()
+    InMemoryBackplane()
+
+
+async def test_workers_tail_only_their_rooms():
+    collection = CappedStandIn()
+    received = {1: [], 2: [], 3: []}
+    workers = {n: MongoBackplane(collection=collection) for n in received}
+    for n, backplane in workers.items():
+        async def deliver(room_id, frame, n=n):
+            received[n].append((room_id, frame))
+        await backplane.start(deliver)
+
+    # Workers 1 and 2 hold sockets for "a"; worker 3 only for "b"
+    workers[1].subscribe("a")
+    workers[2].subscribe("a")
+    workers[3].subscribe("b")
+    await asyncio.sleep(0.01)
+    for i in range(50):
+        await workers[1].publish("a", f"a{i}")
+    await workers[3].publish("b", "b0")
+    await asyncio.sleep(0.05)
+
+    assert received[1] == []  # the publisher delivers locally, not via the backplane
+    assert received[2] == [("a", f"a{i}") for i in range(50)]
+    assert received[3] == []
+    # A burst is written in a few insert_many calls, not one per message
+    assert collection.insert_calls <= 3
+    # Each worker's tail asks only for its own rooms
+    assert sorted(collection.tail_rooms) == [["a"], ["a"], ["b"]]
+
+    # Joining and leaving rooms reopens the tail over the new set, without redelivering
+    workers[3].subscribe("a")
+    workers[2].unsubscribe("a")
+    await asyncio.sleep(0.1)
+    await workers[1].publish("a", "late")
+    await asyncio.sleep(0.05)
+    assert received[3] == [("a", "late")]
+    assert received[2][-1] == ("a", "a49")
+    assert collection.tail_rooms[3:] == [["a", "b"]]
+    assert workers[2].stats()["tails_opened"] == 1  # no rooms left, so no tail
+
+    for backplane in workers.values():
+        await backplane.stop()
+
+
+async def test_a_burst_of_joins_reopens_the_tail_once():
+    collection = CappedStandIn()
+    backplane = MongoBackplane(collection=collection)
+    await backplane.start(lambda room_id, frame: None)
+    backplane.subscribe("a")
+    await asyncio.sleep(0.01)
+    for room in "bcdef":
+        backplane.subscribe(room)
+    await asyncio.sleep(0.1)
+    assert collection.tail_rooms == [["a"], ["a", "b", "c", "d", "e", "f"]]
+    await backplane.stop()
+
+
+async def test_failed_publishes_are_retried_in_order(monkeypatch):
+    monkeypatch.setattr(MongoBackplane, "PUBLISH_RETRY_SECONDS", 0.01)
+    collection = CappedStandIn()
+    collection.fail_inserts = 2
+    backplane = MongoBackplane(collection=collection)
+    await backplane.start(lambda room_id, frame: None)
+    for i in range(3):
+        await backplane.publish("a", f"m{i}")
+    await asyncio.sleep(0.1)
+    assert [doc["frame"] for doc in collection.docs] == ["m0", "m1", "m2"]
+    stats = backplane.stats()
+    assert stats["publish_failures"] == 2 and stats["queued"] == 0 and stats["dropped"] == 0
+    await backplane.stop()
+
+
+async def test_queue_is_capped_while_publishes_fail(monkeypatch):
+    monkeypatch.setattr(MongoBackplane, "MAX_QUEUED_PUBLISHES", 3)
+    collection = CappedStandIn()
+    collection.fail_inserts = 1
+    backplane = MongoBackplane(collection=collection)
+    await backplane.start(lambda room_id, frame: None)
+    for i in range(5):
+        await backplane.publish("a", f"m{i}")
+    await backplane.stop()
+    # The failed attempt on stop gives up rather than retrying forever
+    assert collection.docs == []
+    assert backplane.stats()["dropped"] == 5
+
+
+async def test_stop_writes_queued_publishes():
+    collection = CappedStandIn()
+    backplane = MongoBackplane(collection=collection)
+    await backplane.start(lambda room_id, frame: None)
+    await backplane.publish("a", "x")
+    await backplane.stop()
+    assert [doc["frame"] for doc in collection.docs] == ["x"]
+
+
+# ----------------------------------------------------
+# Several real worker processes against a local mongod
+# ----------------------------------------------------
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+
+
+def _mongo_available() -> bool:
+    try:
+        MongoClient(MONGO_URI, serverSelectionTimeoutMS=500).admin.command("ping")
+        return True
+    except PyMongoError:
+        return False
+
+
+def _worker(name: str, collection_name: str, results):
+    async def main():
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(MONGO_URI)
+        db = client.campusconnect_backplane_test
+        try:
+            await db.create_collection(collection_name, capped=True, size=1024 * 1024)
+        except PyMongoError:
+            pass
+        received = []
+
+        async def deliver(room_id, frame):
+            received.append(frame)
+
+        backplane = MongoBackplane(collection=db[collection_name])
+        await backplane.start(deliver)
+        backplane.subscribe("room")
+        await asyncio.sleep(1.0)  # every worker is tailing before anyone publishes
+        await backplane.publish("room", name)
+        await asyncio.sleep(2.0)
+        await backplane.stop()
+        client.close()
+        results.put((name, sorted(received)))
+
+    asyncio.run(main())
+
+
+@pytest.mark.skipif(not _mongo_available(), reason="needs a local mongod (MONGO_URI)")
+def test_multiple_worker_processes_share_rooms():
+    collection_name = f"chat_events_{ObjectId()}"
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    names = ["w1", "w2", "w3"]
+    procs = [ctx.Process(target=_worker, args=(name, collection_name, results)) for name in names]
+    for p in procs:
+        p.start()
+    got = dict(results.get(timeout=30) for _ in procs)
+    for p in procs:
+        p.join(timeout=10)
+    MongoClient(MONGO_URI).campusconnect_backplane_test.drop_collection(collection_name)
+    for name in names:
+        assert got[name] == sorted(n for n in names if n != name)
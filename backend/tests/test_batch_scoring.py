@@ -0,0 +1,29 @@
+import random
+from utils.batch_scoring import batch_top_jobs
+from utils.recommendation import compute_match_score
+
+TAGS = ["python", "Java", "react", "sql", "docker", "k8s", "aws", "go", "rust", "ml", " Python "]
+
+
+def expected(users, jobs, k):
+    """rank_jobs_for_user's ordering: a stable sort by score over every job."""
+    out = []
+    for skills in users:
+        scored = [(j, compute_match_score(skills, tags)) for j, tags in enumerate(jobs)]
+        scored.sort(key=lambda x: x[1], reverse=True)
+        out.append(scored[:k])
+    return out
+
+
+def test_matches_per_user_scoring():
+    rng = random.Random(7)
+    jobs = [rng.sample(TAGS, rng.randint(0, 4)) for _ in range(300)]
+    users = [rng.sample(TAGS, rng.randint(0, 5)) for _ in range(120)] + [[], ["unknown"]]
+    for k in (1, 5, 50, 1000):
+        assert batch_top_jobs(users, jobs, k=k, chunk_size=32) == expected(users, jobs, k)
+
+
+def test_empty_inputs():
+    assert batch_top_jobs([], [["python"]]) == []
+    assert batch_top_jobs([["python"]], []) == [[]]
+    assert batch_top_jobs([["python"]], [["python"]], k=0) == [[]]
@@ -0,0 +1,90 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from models.user_model import EMAIL_COLLATION, User
+import utils.bulk_ingest as bulk_ingest
+from utils.bulk_ingest import BulkIngest, _extract_file, load_checkpoint
+from utils.resume_cache import resume_cache
+
+
+class ThreadPool(ThreadPoolExecutor):
+    def __init__(self, max_workers, mp_context=None):
+        super().__init__(max_workers=max_workers)
+
+
+def fake_extract(path, timeout=None):
+    if "broken" in path:
+        return {"path": path, "error": "cannot open\tbroken\nfile"}
+    return {"path": path, "skills": ["python"]}
+
+
+async def test_outcomes_are_checkpointed_and_emails_matched_case_insensitively(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk_ingest, "ProcessPoolExecutor", ThreadPool)
+    monkeypatch.setattr(bulk_ingest, "_extract_file", fake_extract)
+    await User(name="Ada", email="ada@example.edu", hashed_password="x").insert()
+
+    queries = []
+    collection = User.get_pymongo_collection()
+    original_find = collection.find
+
+    def spy_find(*args, **kwargs):
+        queries.append(kwargs.get("collation"))
+        return original_find(*args, **kwargs)
+
+    async def bulk_write(ops, ordered=True):
+        # mongomock's bulk_write does not accept the UpdateOne of current pymongo
+        modified = 0
+        for op in ops:
+            modified += (await collection.update_one(op._filter, op._doc)).modified_count
+        return type("Result", (), {"modified_count": modified})
+
+    monkeypatch.setattr(collection, "find", spy_find)
+    monkeypatch.setattr(collection, "bulk_write", bulk_write)
+    monkeypatch.setattr(User, "get_pymongo_collection", classmethod(lambda cls: collection))
+
+    entries = [("a.pdf", "ada@example.edu"), ("broken.pdf", "ada@example.edu"), ("c.pdf", "nobody@example.edu")]
+    checkpoint = tmp_path / "progress"
+    await BulkIngest(entries, checkpoint, workers=2, batch_size=2).run()
+
+    assert queries == [EMAIL_COLLATION]
+    assert load_checkpoint(checkpoint) == {"a.pdf": "ok", "broken.pdf": "failed", "c.pdf": "unknown"}
+    assert "broken.pdf\tfailed\tcannot open broken file" in checkpoint.read_text().splitlines()
+    assert (await User.find_one(User.email == "ada@example.edu")).skills == ["python"]
+
+    # A rerun skips every recorded file; --retry-failed re-processes only the failures
+    rerun = BulkIngest(entries, checkpoint, workers=2, batch_size=2)
+    await rerun.run()
+    assert rerun.processed == 0
+    retry = BulkIngest(entries, checkpoint, workers=2, batch_size=2, retry_failed=True)
+    await retry.run()
+    assert retry.processed == 2 and retry.failed == 1 and retry.unknown == 1
+
+
+def test_old_checkpoint_lines_mean_ok(tmp_path):
+    checkpoint = tmp_path / "progress"
+    checkpoint.write_text("a.pdf\nb.pdf\tfailed\terr\nb.pdf\tok\n")
+    assert load_checkpoint(checkpoint) == {"a.pdf": "ok", "b.pdf": "ok"}
+
+
+def test_a_pdf_that_overruns_the_timeout_fails(tmp_path, monkeypatch):
+    pdf = tmp_path / "slow.pdf"
+    pdf.write_bytes(b"%PDF-1.7 slow")
+    monkeypatch.setattr(resume_cache, "lookup", lambda sha256, size: {"text": None, "skills": None})
+    monkeypatch.setattr(bulk_ingest, "extract_text_from_pdf", lambda path: time.sleep(5))
+
+    started = time.monotonic()
+    result = _extract_file(str(pdf), timeout=0.1)
+    assert time.monotonic() - started < 2
+    assert result == {"path": str(pdf), "error": "Extraction exceeded 0.1s"}
+
+
+def test_unwritable_cache_does_not_fail_a_parsed_file(tmp_path, monkeypatch):
+    pdf = tmp_path / "ok.pdf"
+    pdf.write_bytes(b"%PDF-1.7 ok")
+
+    def full(*args):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(resume_cache, "lookup", lambda sha256, size: {"text": None, "skills": None})
+    monkeypatch.setattr(resume_cache, "store", full)
+    monkeypatch.setattr(bulk_ingest, "extract_text_from_pdf", lambda path: "Python and Docker")
+    assert _extract_file(str(pdf)) == {"path": str(pdf), "skills": ["docker", "python"]}
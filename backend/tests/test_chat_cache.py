@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime, timedelta
+from beanie import PydanticObjectId
+from models.chat_model import ChatMessage
+from utils.chat_cache import RecentMessageCache, to_out
+
+
+def message(room_id: str, text: str, offset: int) -> ChatMessage:
+    return ChatMessage(
+        id=PydanticObjectId(),
+        room_id=room_id,
+        sender_id="u1",
+        message=text,
+        timestamp=datetime(2024, 1, 1) + timedelta(seconds=offset),
+    )
+
+
+async def test_append_during_first_fill_is_kept(db, monkeypatch):
+    cache = RecentMessageCache(room_capacity=10)
+    stored = message("room", "stored", 0)
+    await stored.insert()
+
+    # Hold the history query open so a message can arrive while it runs
+    release = asyncio.Event()
+    original_find = ChatMessage.find
+
+    def slow_find(*args, **kwargs):
+        query = original_find(*args, **kwargs)
+        to_list = query.to_list
+
+        async def delayed(*a, **kw):
+            rows = await to_list(*a, **kw)
+            await release.wait()
+            return rows
+
+        query.to_list = delayed
+        return query
+
+    monkeypatch.setattr(ChatMessage, "find", slow_find)
+    pending = message("room", "pending", 1)
+    fill = asyncio.create_task(cache.fill("room", [pending]))
+    await asyncio.sleep(0)
+    assert "room" in cache.filling
+
+    # A concurrent reader shares the in-flight query; a live message is queued, not dropped
+    second = asyncio.create_task(cache.fill("room"))
+    live = message("room", "live", 2)
+    cache.append("room", to_out(live))
+    release.set()
+    buf = await fill
+    assert await second is buf
+
+    assert [m.message for m in buf.messages] == ["stored", "pending", "live"]
+    assert "room" not in cache.filling
+    page, has_more = cache.page("room", 50)
+    assert [m.message for m in page] == ["stored", "pending", "live"] and not has_more
+
+
+async def test_failed_fill_clears_filling_state(db, monkeypatch):
+    cache = RecentMessageCache(room_capacity=10)
+
+    def broken_find(*args, **kwargs):
+        raise RuntimeError("mongo down")
+
+    monkeypatch.setattr(ChatMessage, "find", broken_find)
+    try:
+        await cache.fill("room")
+    except RuntimeError:
+        pass
+    assert "room" not in cache.filling and "room" not in cache.rooms
+    cache.append("room", to_out(message("room", "later", 0)))
+    assert "room" not in cache.rooms
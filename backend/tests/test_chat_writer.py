@@ -0,0 +1,96 @@
+import asyncio
+import orjson
+from models.chat_model import ChatMessage
+from routes.websocket_routes import ConnectionManager
+from utils.backplane import InMemoryBackplane
+from utils import chat_writer as chat_writer_module
+from utils.chat_writer import ChatBatchWriter
+
+
+def message(room_id: str, text: str) -> ChatMessage:
+    return ChatMessage(room_id=room_id, sender_id="u1", message=text)
+
+
+async def test_room_flush_writes_only_that_room(db):
+    writer = ChatBatchWriter(max_delay_ms=60_000)
+    a1, b1, a2 = writer.submit(message("a", "1")), writer.submit(message("b", "1")), writer.submit(message("a", "2"))
+    assert await writer.flush("a")
+    assert a1.done() and a2.done() and not b1.done()
+    assert [chat.room_id for chat, _ in writer.pending] == ["b"]
+    assert await ChatMessage.find(ChatMessage.room_id == "a").count() == 2
+    await writer.stop()
+    assert b1.done() and await ChatMessage.count() == 3
+
+
+async def test_stop_retries_then_spills_and_recovers(db, tmp_path, monkeypatch):
+    spill = tmp_path / "spill.ndjson"
+    writer = ChatBatchWriter(max_delay_ms=60_000, spill_path=str(spill))
+    monkeypatch.setattr(chat_writer_module, "RETRY_DELAY_SECONDS", 0.001)
+    attempts = []
+
+    async def down(messages):
+        attempts.append(len(messages))
+        raise ConnectionError("mongo down")
+
+    original_write = ChatBatchWriter.__dict__["_write"]
+    monkeypatch.setattr(ChatBatchWriter, "_write", staticmethod(down))
+    sent = [message("a", str(i)) for i in range(3)]
+    futures = [writer.submit(chat) for chat in sent]
+    await writer.stop(attempts=3)
+
+    assert len(attempts) == 3
+    assert writer.pending == [] and all(f.done() and f.exception() for f in futures)
+    assert len(spill.read_text().splitlines()) == 3
+
+    # Next start: Mongo is back and the spilled messages are written with their original ids
+    monkeypatch.setattr(ChatBatchWriter, "_write", original_write)
+    restarted = ChatBatchWriter(spill_path=str(spill))
+    await restarted.recover()
+    assert not spill.exists()
+    stored = await ChatMessage.find_all().sort("message").to_list()
+    assert [(m.id, m.message) for m in stored] == [(m.id, m.message) for m in sent]
+
+    # Replaying again (e.g. a crash before the file was removed) does not duplicate
+    spill.write_text("".join(m.model_dump_json() + "\n" for m in sent))
+    await restarted.recover()
+    assert await ChatMessage.count() == 3
+
+
+class ReceiptSocket:
+    def __init__(self):
+        self.frames = []
+        self.scope = {"subprotocols": []}
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, frame):
+        self.frames.append(orjson.loads(frame))
+
+
+async def test_receipts_ack_stored_and_nack_spilled_messages(db, tmp_path, monkeypatch):
+    writer = ChatBatchWriter(max_delay_ms=60_000, spill_path=str(tmp_path / "spill.ndjson"))
+    manager = ConnectionManager(InMemoryBackplane())
+    websocket = ReceiptSocket()
+    await manager.connect(websocket, "a")
+
+    stored = message("a", "kept")
+    manager.send_receipt(writer.submit(stored), websocket, "a", "c1", str(stored.id))
+    await writer.flush("a")
+
+    async def down(messages):
+        raise ConnectionError("mongo down")
+
+    monkeypatch.setattr(chat_writer_module, "RETRY_DELAY_SECONDS", 0.001)
+    monkeypatch.setattr(ChatBatchWriter, "_write", staticmethod(down))
+    lost = message("a", "spilled")
+    manager.send_receipt(writer.submit(lost), websocket, "a", "c2", str(lost.id))
+    await writer.stop(attempts=2)
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    assert websocket.frames == [
+        {"type": "ack", "client_msg_id": "c1", "id": str(stored.id)},
+        {"type": "nack", "client_msg_id": "c2", "id": str(lost.id), "error": "Message was not stored"},
+    ]
+    manager.disconnect(websocket, "a")
@@ -0,0 +1,113 @@
+"""EmailQueue against a real SMTP server (aiosmtpd) on localhost."""
+import asyncio
+import socket
+import pytest
+from aiosmtpd.controller import Controller
+from models.email_model import OutboundEmail
+from utils.email_queue import EmailQueue
+
+
+class Mailbox:
+    """aiosmtpd handler that refuses some recipients and records which connection delivered what."""
+
+    def __init__(self):
+        self.delivered = []
+        self.peers = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        self.peers.add(session.peer)
+        if address.startswith("nobody@"):
+            return "550 5.1.1 No such user"
+        if address.startswith("busy@"):
+            return "451 4.3.0 Try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if b"Subject: spam" in envelope.content:
+            return "554 5.7.1 Message rejected"
+        self.delivered.append(envelope.rcpt_tos[0])
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def mailbox():
+    handler = Mailbox()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield handler, controller.port
+    controller.stop()
+
+
+@pytest.fixture
+async def queue(db, mailbox):
+    _, port = mailbox
+    q = EmailQueue(hostname="127.0.0.1", port=port, username=None, password=None,
+                   connections=1, rate=0, backoff=60, poll_interval=0.05)
+    q.sender = "noreply@campusconnect.test"
+    yield q
+    await q.stop()
+
+
+async def settle(emails, timeout: float = 5.0):
+    """Wait until none of the emails is still waiting to be sent."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        docs = [await OutboundEmail.get(e.id) for e in emails]
+        if all(d.status == "sent" or d.status == "failed" or d.attempts >= 1 and d.status == "pending" for d in docs):
+            return docs
+        assert loop.time() < deadline, [d.status for d in docs]
+        await asyncio.sleep(0.02)
+
+
+async def test_messages_share_one_connection(queue, mailbox):
+    handler, _ = mailbox
+    emails = [await queue.enqueue(f"user{i}@example.edu", "Verify", "Hello") for i in range(5)]
+    queue.start()
+
+    docs = await settle(emails)
+    assert [d.status for d in docs] == ["sent"] * 5
+    assert handler.delivered == [f"user{i}@example.edu" for i in range(5)]
+    assert len(handler.peers) == 1
+
+
+async def test_refused_recipient_fails_the_message_but_keeps_the_connection(queue, mailbox):
+    handler, _ = mailbox
+    emails = [
+        await queue.enqueue("first@example.edu", "Verify", "Hello"),
+        await queue.enqueue("nobody@example.edu", "Verify", "Hello"),
+        await queue.enqueue("spam@example.edu", "spam", "Hello"),
+        await queue.enqueue("last@example.edu", "Verify", "Hello"),
+    ]
+    queue.start()
+
+    docs = await settle(emails)
+    assert [d.status for d in docs] == ["sent", "failed", "failed", "sent"]
+    assert "No such user" in docs[1].last_error
+    assert handler.delivered == ["first@example.edu", "last@example.edu"]
+    # Neither rejection cost a reconnect
+    assert len(handler.peers) == 1
+    assert queue.stats()["failed"] == 2
+
+
+async def test_temporary_refusal_is_rescheduled(queue, mailbox):
+    handler, _ = mailbox
+    emails = [
+        await queue.enqueue("busy@example.edu", "Verify", "Hello"),
+        await queue.enqueue("after@example.edu", "Verify", "Hello"),
+    ]
+    queue.start()
+
+    busy, after = await settle(emails)
+    assert busy.status == "pending" and busy.attempts == 1
+    assert busy.next_attempt_at > busy.created_at
+    assert after.status == "sent"
+    assert len(handler.peers) == 1
+    assert queue.stats()["retried"] == 1
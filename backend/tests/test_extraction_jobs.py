@@ -0,0 +1,92 @@
+import asyncio
+import threading
+from utils.extraction_jobs import ExtractionQueue
+from utils.resume_cache import ResumeCache
+import utils.extraction_jobs as extraction_jobs
+
+
+async def test_job_fails_instead_of_hanging_when_extract_raises(db, monkeypatch):
+    queue = ExtractionQueue(workers=1)
+
+    async def broken(*args, **kwargs):
+        raise KeyError("boom")
+
+    monkeypatch.setattr(queue, "_extract", broken)
+    job_id = await queue.submit("000000000000000000000000", "/nonexistent.pdf")
+    await queue.stop()
+    job = await queue.get(job_id)
+    assert job.status == "failed"
+    assert "boom" in job.error
+    assert job.finished_at is not None
+
+
+async def test_text_hit_survives_unwritable_cache(db, monkeypatch):
+    queue = ExtractionQueue(workers=1)
+
+    class Cache:
+        def lookup(self, sha256, size=0):
+            return {"skills": None, "text": "python and docker"}
+
+        def store(self, *args):
+            raise OSError("disk full")
+
+    merged = []
+
+    async def merge(user_id, skills):
+        merged.append(skills)
+
+    monkeypatch.setattr(extraction_jobs, "resume_cache", Cache())
+    monkeypatch.setattr(extraction_jobs, "merge_skills", merge)
+    job_id = await queue.submit("000000000000000000000000", "/unused.pdf", sha256="ab" * 32, size=10)
+    await queue.stop()
+    assert (await queue.get(job_id)).status == "done"
+    assert merged and "python" in merged[0]
+
+
+async def test_status_is_visible_to_other_workers(db, monkeypatch):
+    # Two queues stand in for two uvicorn workers sharing one database
+    running, polled = ExtractionQueue(workers=1), ExtractionQueue(workers=1)
+    release = asyncio.Event()
+
+    async def slow(job_id, *args):
+        await running._update(job_id, status="running")
+        await release.wait()
+        return "done", ["python"]
+
+    async def merge(user_id, skills):
+        pass
+
+    monkeypatch.setattr(running, "_extract", slow)
+    monkeypatch.setattr(extraction_jobs, "merge_skills", merge)
+    job_id = await running.submit("000000000000000000000000", "/unused.pdf")
+    await asyncio.sleep(0.01)
+    assert (await polled.get(job_id)).status == "running"
+    release.set()
+    await running.stop()
+    job = await polled.get(job_id)
+    assert job.status == "done" and job.skills_found == ["python"]
+    assert await polled.get("not-an-id") is None
+
+
+def test_resume_cache_is_thread_safe(tmp_path):
+    cache = ResumeCache(directory=str(tmp_path), memory_entries=8, max_bytes=10**9)
+    errors = []
+
+    def work(n):
+        try:
+            for i in range(300):
+                key = f"{(n * 7 + i) % 40:064x}"
+                if i % 3 == 0:
+                    cache.store(key, "text", ["python"])
+                else:
+                    cache.lookup(key)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(cache.memory) <= 8
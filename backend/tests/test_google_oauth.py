@@ -0,0 +1,105 @@
+import httpx
+import pytest
+import core.http_client as http_client
+import routes.google_routes as google_routes
+from models.user_model import User
+
+DISCOVERY = {
+    "authorization_endpoint": "https://idp.test/auth",
+    "token_endpoint": "https://idp.test/token",
+    "userinfo_endpoint": "https://idp.test/userinfo",
+}
+
+
+class StubGoogle:
+    """A stub OpenID provider behind httpx.MockTransport; `fail` maps a path to what it should do next."""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.calls.append((request.method, path))
+        failure = self.fail.get(path)
+        if failure:
+            outcome = failure.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return httpx.Response(outcome)
+        if path == "/.well-known/openid-configuration":
+            return httpx.Response(200, json=DISCOVERY)
+        if path == "/token":
+            form = dict(httpx.QueryParams(request.content.decode()))
+            if form.get("code") != "good-code":
+                return httpx.Response(400, json={"error": "invalid_grant"})
+            return httpx.Response(200, json={"access_token": "stub-token"})
+        if path == "/userinfo":
+            assert request.headers["Authorization"] == "Bearer stub-token"
+            return httpx.Response(200, json={"email": "oauth@example.edu", "name": "OAuth User"})
+        return httpx.Response(404)
+
+    def count(self, path: str) -> int:
+        return sum(1 for _, p in self.calls if p == path)
+
+
+@pytest.fixture
+async def idp(monkeypatch):
+    stub = StubGoogle()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(stub))
+    monkeypatch.setattr(http_client, "_client", client)
+    monkeypatch.setattr(http_client, "HTTP_RETRY_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(google_routes, "GOOGLE_DISCOVERY_URL", "https://idp.test/.well-known/openid-configuration")
+    monkeypatch.setattr(google_routes, "_discovery_cache", {"endpoints": None, "expires_at": 0.0})
+    yield stub
+    await client.aclose()
+
+
+async def test_callback_exchanges_code_and_creates_user(client, idp):
+    login = await client.get("/auth/google/login")
+    assert login.json()["url"].startswith("https://idp.test/auth?")
+
+    res = await client.get("/auth/google/callback", params={"code": "good-code"})
+    assert res.status_code == 200
+    assert res.json()["token_type"] == "bearer"
+    assert await User.find_one(User.email == "oauth@example.edu") is not None
+    # Discovery is cached across the two requests
+    assert idp.count("/.well-known/openid-configuration") == 1
+
+
+async def test_failed_discovery_serves_the_fallback_without_refetching(idp, monkeypatch):
+    idp.fail["/.well-known/openid-configuration"] = [500]
+    first = await google_routes.get_google_endpoints()
+    second = await google_routes.get_google_endpoints()
+    assert first == second == google_routes.DEFAULT_GOOGLE_ENDPOINTS
+    assert idp.count("/.well-known/openid-configuration") == 1
+
+    # Once the retry interval lapses discovery is tried again
+    google_routes._discovery_cache["expires_at"] = 0.0
+    assert await google_routes.get_google_endpoints() == DISCOVERY
+    assert idp.count("/.well-known/openid-configuration") == 2
+
+
+async def test_dropped_keepalive_connection_is_retried(client, idp):
+    await google_routes.get_google_endpoints()
+    idp.fail["/token"] = [httpx.RemoteProtocolError("Server disconnected without sending a response.")]
+    idp.fail["/userinfo"] = [httpx.RemoteProtocolError("Server disconnected without sending a response.")]
+
+    res = await client.get("/auth/google/callback", params={"code": "good-code"})
+    assert res.status_code == 200
+    assert idp.count("/token") == 2
+    assert idp.count("/userinfo") == 2
+
+
+async def test_token_endpoint_outage_is_not_retried_for_post(client, idp):
+    await google_routes.get_google_endpoints()
+    idp.fail["/token"] = [503]
+
+    res = await client.get("/auth/google/callback", params={"code": "good-code"})
+    assert res.status_code == 502
+    assert idp.count("/token") == 1
+
+
+async def test_rejected_code_fails_cleanly(client, idp):
+    res = await client.get("/auth/google/callback", params={"code": "reused-code"})
+    assert res.status_code == 400
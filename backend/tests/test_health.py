@@ -0,0 +1,18 @@
+import httpx
+from database.connection import mongo
+
+
+async def test_failed_ping_reports_a_generic_status(monkeypatch):
+    import main
+
+    async def unreachable():
+        raise RuntimeError("No servers found: db-internal-0.example:27017 (auth failed for user admin)")
+
+    monkeypatch.setattr(mongo, "ping_ms", unreachable)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/health")
+
+    assert response.status_code == 503
+    assert response.json()["mongo"]["status"] == "unavailable"
+    assert "db-internal" not in response.text
@@ -0,0 +1,58 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from utils.job_search import JobSearchIndex
+
+
+def job(n, title, tags, description="", status="open"):
+    return SimpleNamespace(id=f"{n:024x}", title=title, description=description, tags=tags,
+                           status=status, created_at=datetime(2024, 1, n))
+
+
+@pytest.fixture
+def index():
+    idx = JobSearchIndex()
+    idx.add(job(1, "Backend engineer", ["Python", "FastAPI"], "Build the API"))
+    idx.add(job(2, "Frontend developer", ["React", "JavaScript"]))
+    idx.add(job(3, "Platform engineer", ["Kubernetes", "Docker"], status="filled"))
+    return idx
+
+
+def ids(result):
+    return [int(j, 16) for j, _ in result[1]]
+
+
+@pytest.mark.parametrize("query", ["!!!", "--- ???", "the", "the and of"])
+def test_punctuation_or_stopword_only_query_matches_nothing(index, query):
+    assert index.search(query) == (0, [])
+
+
+def test_missing_or_blank_query_lists_every_job(index):
+    assert index.search(None)[0] == 3
+    assert index.search("   ")[0] == 3
+
+
+def test_stopwords_are_ignored_in_a_real_query(index):
+    assert ids(index.search("the backend")) == [1]
+
+
+def test_tag_filter_matches_substrings_case_insensitively(index):
+    # Same semantics as the old {"$regex": tag, "$options": "i"} filter
+    assert ids(index.search(tag="kube")) == [3]
+    assert sorted(ids(index.search(tag="SCRIPT"))) == [2]
+    assert ids(index.search("engineer", tag="py")) == [1]
+    assert index.search(tag="rust") == (0, [])
+
+
+def test_tag_filter_is_literal_not_a_regex(index):
+    assert index.search(tag="py.*") == (0, [])
+
+
+def test_removed_jobs_leave_the_tag_index(index):
+    index.remove(f"{3:024x}")
+    assert index.search(tag="kube") == (0, [])
+    assert "kubernetes" not in index.tag_jobs
+
+
+def test_status_and_tag_combine(index):
+    assert ids(index.search(tag="e", status="filled")) == [3]
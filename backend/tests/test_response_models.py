@@ -0,0 +1,83 @@
+"""
+List routes send raw projected Mongo rows without validation. These tests pin
+each projection to its documented model, so a field added to one and not the
+other fails here rather than silently reaching (or missing from) clients.
+"""
+from datetime import datetime
+import orjson
+import pytest
+from models.application_model import Application, ApplicationOut
+from models.chat_model import ChatMessage, ChatMessageOut
+from models.job_model import Job, JobOut, JobSummary
+from models.user_model import User
+from routes.application_routes import FilteredApplicants, JobApplicants, MyApplications
+from routes.chat_routes import ChatHistoryPage
+
+
+def aliases(model) -> set:
+    return {field.alias or name for name, field in model.model_fields.items()}
+
+
+@pytest.mark.parametrize("model", [JobOut, JobSummary, ApplicationOut, ChatMessageOut])
+def test_projection_covers_exactly_the_model_fields(model):
+    assert set(model.Settings.projection) | {"_id"} == aliases(model)
+
+
+def assert_rows(page: dict, key: str, model):
+    for row in page[key]:
+        assert set(row) == aliases(model), row
+        model.model_validate(row)
+
+
+async def test_application_lists_match_their_models(client, auth):
+    owner = User(name="Owner", email="owner@example.edu", hashed_password="x", role="finder")
+    seeker = User(name="Seeker", email="seeker@example.edu", hashed_password="x", role="seeker")
+    await owner.insert()
+    await seeker.insert()
+    job = Job(title="Backend intern", description="FastAPI", tags=["python"], created_by=str(owner.id))
+    await job.insert()
+    await Application(job_id=str(job.id), user_id=str(seeker.id), proposal="Hi").insert()
+
+    mine = await client.get("/applications/my", headers=auth(seeker))
+    assert mine.status_code == 200
+    MyApplications.model_validate(mine.json())
+    assert_rows(mine.json(), "applications", ApplicationOut)
+
+    applicants = await client.get(f"/applications/job/{job.id}", headers=auth(owner))
+    assert applicants.status_code == 200
+    JobApplicants.model_validate(applicants.json())
+    assert_rows(applicants.json(), "applicants", ApplicationOut)
+
+    filtered = await client.get(f"/applications/job/{job.id}/filter", headers=auth(owner))
+    assert filtered.status_code == 200
+    FilteredApplicants.model_validate(filtered.json())
+    assert_rows(filtered.json(), "results", ApplicationOut)
+
+
+async def test_chat_history_matches_its_model(client, auth):
+    user = User(name="Talker", email="talker@example.edu", hashed_password="x")
+    await user.insert()
+    await ChatMessage(room_id="room-1", sender_id=str(user.id), message="hello", timestamp=datetime(2024, 1, 1)).insert()
+
+    history = await client.get("/chat/room-1", headers=auth(user))
+    assert history.status_code == 200
+    page = history.json()
+    ChatHistoryPage.model_validate(page)
+    assert set(page) == set(ChatHistoryPage.model_fields)
+    assert_rows(page, "messages", ChatMessageOut)
+
+
+async def test_chat_export_lines_match_history_rows(client, auth):
+    user = User(name="Exporter", email="exporter@example.edu", hashed_password="x")
+    await user.insert()
+    for second in range(3):
+        await ChatMessage(room_id="room-2", sender_id=str(user.id), message=f"m{second}",
+                          timestamp=datetime(2024, 1, 1, 0, 0, second)).insert()
+
+    history = (await client.get("/chat/room-2", headers=auth(user))).json()["messages"]
+    export = await client.get("/chat/room-2/export", headers=auth(user))
+    assert export.status_code == 200
+    lines = [orjson.loads(line) for line in export.text.splitlines()]
+    assert lines == history
+    for line in lines:
+        assert set(line) == aliases(ChatMessageOut)
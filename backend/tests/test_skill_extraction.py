@@ -0,0 +1,43 @@
+import pytest
+from utils.skill_extraction import SkillMatcher, extract_skill_matches, load_taxonomy
+
+
+@pytest.mark.parametrize("text, skill", [
+    ("Wrote a C++ game engine", "c++"),
+    ("Modern cpp (C++17)", "c++"),
+    ("Built APIs in Node.js.", "node"),
+    ("nodejs microservices", "node"),
+    ("Ran workloads on k8s", "kubernetes"),
+    ("Kubernetes operator", "kubernetes"),
+    ("Owned the CI/CD pipeline", "ci/cd"),
+    ("continuous integration with GitHub Actions", "ci/cd"),
+    ("C# and ASP.NET Core", "c#"),
+    ("C# and ASP.NET Core", ".net"),
+])
+def test_symbolic_and_aliased_skills_are_found(text, skill):
+    assert skill in extract_skill_matches(text)
+
+
+@pytest.mark.parametrize("text, skill", [
+    ("abc++ is not a language", "c++"),
+    ("nodes and edges", "node"),
+    ("ci pipeline, cd player", "ci/cd"),
+    ("k8sfoo", "kubernetes"),
+])
+def test_skills_only_match_on_word_boundaries(text, skill):
+    assert skill not in extract_skill_matches(text)
+
+
+def test_counts_and_positions():
+    text = "C++ at work, c++ at home; k8s everywhere"
+    found = extract_skill_matches(text)
+    assert found["c++"] == {"count": 2, "positions": [0, 13]}
+    assert found["kubernetes"]["positions"] == [text.index("k8s")]
+
+
+def test_every_taxonomy_phrase_matches_itself():
+    taxonomy = load_taxonomy()
+    matcher = SkillMatcher(taxonomy)
+    for entry in taxonomy:
+        for phrase in [entry["name"], *entry.get("aliases", [])]:
+            assert entry["name"].lower() in matcher.find(f"Skills: {phrase}."), phrase
@@ -0,0 +1,108 @@
+import asyncio
+import hashlib
+import os
+import tracemalloc
+import pytest
+import routes.upload_routes as upload_routes
+
+MB = 1024 * 1024
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_routes, "UPLOAD_DIR", tmp_path)
+
+
+def pdf(size: int, seed: int = 0) -> bytes:
+    body = b"%PDF-1.7\n" + bytes([seed % 251]) * (size - 9)
+    return body[:size]
+
+
+async def test_concurrent_20mb_uploads(client, tmp_path, tmp_path_factory, monkeypatch, make_user, auth):
+    # The default 10 MB cap would refuse these; raise it for the test
+    monkeypatch.setattr(upload_routes, "MAX_RESUME_BYTES", 25 * MB)
+    concurrency = 4
+    # Bodies are sent from files, so the client streams them in chunks too and
+    # any large allocation traced below belongs to the server
+    sources = tmp_path_factory.mktemp("sources")
+    uploads = []
+    for i in range(concurrency):
+        path = sources / f"resume{i}.pdf"
+        path.write_bytes(pdf(20 * MB, seed=i))
+        uploads.append((auth(await make_user(i)), path))
+
+    files = [open(path, "rb") for _, path in uploads]
+    tracemalloc.start()
+    try:
+        responses = await asyncio.gather(*(
+            client.post("/upload/resume", headers=headers, files={"file": ("resume.pdf", f, "application/pdf")})
+            for (headers, _), f in zip(uploads, files)
+        ))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        for f in files:
+            f.close()
+    # Buffering even one upload whole would cost 20 MB
+    assert peak < 20 * MB * concurrency / 10, f"peak {peak / MB:.1f} MB"
+
+    for r, (_, path) in zip(responses, uploads):
+        body = path.read_bytes()
+        assert r.status_code == 200, r.text
+        data = r.json()
+        assert data["size"] == len(body)
+        assert data["sha256"] == hashlib.sha256(body).hexdigest()
+        with open(data["path"], "rb") as f:
+            assert f.read() == body
+    # Only the final files are left; no spooled copies or partial temp files
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(r.json()["path"]) for r in responses)
+
+
+async def test_raw_pdf_body(client, tmp_path, make_user, auth):
+    headers = auth(await make_user(0))
+    body = pdf(100_000)
+    r = await client.post("/upload/resume", headers={**headers, "Content-Type": "application/pdf"}, content=body)
+    assert r.status_code == 200, r.text
+    assert r.json()["sha256"] == hashlib.sha256(body).hexdigest()
+
+
+async def test_declared_oversize_is_refused_before_reading(client, tmp_path, monkeypatch, make_user, auth):
+    monkeypatch.setattr(upload_routes, "MAX_RESUME_BYTES", 1 * MB)
+    headers = auth(await make_user(0))
+    read = []
+
+    async def body():
+        read.append(True)
+        yield pdf(2 * MB)
+
+    r = await client.post(
+        "/upload/resume",
+        headers={**headers, "Content-Type": "application/pdf", "Content-Length": str(2 * MB)},
+        content=body(),
+    )
+    assert r.status_code == 413
+    assert read == []
+    assert os.listdir(tmp_path) == []
+
+
+async def test_undeclared_oversize_is_cut_off_while_streaming(client, tmp_path, monkeypatch, make_user, auth):
+    monkeypatch.setattr(upload_routes, "MAX_RESUME_BYTES", 1 * MB)
+    headers = auth(await make_user(0))
+
+    async def body():
+        data = pdf(3 * MB)
+        for i in range(0, len(data), 64 * 1024):
+            yield data[i:i + 64 * 1024]
+
+    r = await client.post("/upload/resume", headers={**headers, "Content-Type": "application/pdf"}, content=body())
+    assert r.status_code == 413
+    assert os.listdir(tmp_path) == []
+
+
+async def test_non_pdf_and_missing_field(client, tmp_path, make_user, auth):
+    headers = auth(await make_user(0))
+    r = await client.post("/upload/resume", headers=headers, files={"file": ("a.txt", b"hello world", "text/plain")})
+    assert r.status_code == 400 and "PDF" in r.json()["detail"]
+    r = await client.post("/upload/resume", headers=headers, files={"other": ("a.pdf", pdf(1000), "application/pdf")})
+    assert r.status_code == 400 and "file" in r.json()["detail"]
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,46 @@
+from core.dependencies import get_current_user, user_cache
+from core.security import create_access_token
+from models.user_model import User
+
+
+async def test_cached_user_is_copied_per_request(db, make_user):
+    user = await make_user()
+    token = create_access_token({"sub": str(user.id)})
+    user_cache.clear()
+
+    first = await get_current_user(token)
+    first.role = "finder"
+    second = await get_current_user(token)
+    assert second is not first
+    assert second.role == "seeker"
+
+
+async def test_switch_role_does_not_undo_other_writes(client, make_user, auth):
+    user = await make_user()
+    headers = auth(user)
+    assert (await client.get("/auth/me", headers=headers)).status_code == 200  # now cached
+
+    # Another worker verifies the email and edits the profile behind this worker's cache
+    await User.get_pymongo_collection().update_one(
+        {"_id": user.id}, {"$set": {"verified": True, "skills": ["python"]}}
+    )
+
+    r = await client.patch("/auth/switch-role", headers=headers)
+    assert r.json() == {"msg": "Role switched to finder"}
+    stored = await User.get(user.id)
+    assert stored.role == "finder" and stored.verified and stored.skills == ["python"]
+
+    me = (await client.get("/auth/me", headers=headers)).json()
+    assert me["role"] == "finder" and me["verified"] is True
+
+
+async def test_profile_edit_sets_only_given_fields(client, make_user, auth):
+    user = await make_user(skills=["go"])
+    headers = auth(user)
+    await client.get("/profile/me", headers=headers)
+    await User.get_pymongo_collection().update_one({"_id": user.id}, {"$set": {"role": "finder"}})
+
+    r = await client.put("/profile/edit", headers=headers, json={"name": "Ada L."})
+    assert r.status_code == 200
+    stored = await User.get(user.id)
+    assert stored.name == "Ada L." and stored.role == "finder" and stored.skills == ["go"]
@@ -0,0 +1,56 @@
+import asyncio
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError
+from models.job_model import Job
+from utils.view_counter import ViewCounter
+
+
+class FakeCollection:
+    def __init__(self, fail_indexes=(), delay=0.0):
+        self.fail_indexes = set(fail_indexes)
+        self.delay = delay
+        self.applied = {}
+
+    async def bulk_write(self, ops, ordered=True):
+        await asyncio.sleep(self.delay)
+        errors = []
+        for i, op in enumerate(ops):
+            if i in self.fail_indexes:
+                errors.append({"index": i, "code": 2, "errmsg": "failed"})
+                continue
+            job_id = op._filter["_id"]
+            self.applied[job_id] = self.applied.get(job_id, 0) + op._doc["$inc"]["views"]
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nModified": len(ops) - len(errors)})
+
+
+async def test_partial_bulk_failure_restores_only_failed_ops(monkeypatch):
+    collection = FakeCollection(fail_indexes={1})
+    monkeypatch.setattr(Job, "get_pymongo_collection", classmethod(lambda cls: collection))
+    counter = ViewCounter(flush_interval=60)
+    ids = [str(PydanticObjectId()) for _ in range(3)]
+    for n, job_id in enumerate(ids, start=1):
+        for _ in range(n):
+            counter.record(job_id)
+
+    await counter.flush()
+    assert counter.pending == {ids[1]: 2}
+
+    collection.fail_indexes = set()
+    await counter.flush()
+    assert collection.applied == {PydanticObjectId(i): n for n, i in enumerate(ids, start=1)}
+
+
+async def test_stop_lets_an_in_flight_flush_finish(monkeypatch):
+    collection = FakeCollection(delay=0.05)
+    monkeypatch.setattr(Job, "get_pymongo_collection", classmethod(lambda cls: collection))
+    counter = ViewCounter(flush_interval=0.01)
+    job_id = str(PydanticObjectId())
+    counter.start()
+    for _ in range(5):
+        counter.record(job_id)
+    await asyncio.sleep(0.02)  # the periodic flush is now inside bulk_write
+    counter.record(job_id)
+    await counter.stop()
+    assert collection.applied == {PydanticObjectId(job_id): 6}
+    assert counter.pending == {}
@@ -0,0 +1,56 @@
+import asyncio
+import routes.websocket_routes as websocket_routes
+from routes.websocket_routes import ConnectionManager
+from utils.backplane import InMemoryBackplane
+
+
+class FakeSocket:
+    def __init__(self, stalled=False, broken=False):
+        self.stalled, self.broken = stalled, broken
+        self.frames = []
+        self.closed_with = None
+        self.scope = {"subprotocols": []}
+        self._never = asyncio.Event()
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, frame):
+        if self.broken:
+            raise RuntimeError("socket is gone")
+        if self.stalled:
+            await self._never.wait()
+        self.frames.append(frame)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+async def test_thousand_member_room_survives_a_stalled_and_a_broken_socket(monkeypatch):
+    monkeypatch.setattr(websocket_routes, "WS_SEND_QUEUE_SIZE", 8)
+    monkeypatch.setattr(websocket_routes, "WS_SLOW_CONSUMER_POLICY", "disconnect")
+    manager = ConnectionManager(InMemoryBackplane())
+    sockets = [FakeSocket(stalled=i == 0, broken=i == 1) for i in range(1000)]
+    for ws in sockets:
+        await manager.connect(ws, "room")
+
+    for i in range(20):
+        await manager.broadcast("room", {"id": str(i), "message": f"hello {i}"})
+        await asyncio.sleep(0)
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    stalled, broken, healthy = sockets[0], sockets[1], sockets[2:]
+    assert all(len(ws.frames) == 20 for ws in healthy)
+    assert stalled.closed_with == 1013
+    # The broken socket is pruned by its failed send, not closed as a slow consumer
+    assert broken.frames == [] and broken.closed_with is None
+    assert stalled not in manager.active_connections["room"]
+    assert broken not in manager.active_connections["room"]
+    assert manager.connection_count() == 998
+    # Close tasks are held until they finish, then released
+    assert not manager._close_tasks
+
+    for ws in healthy:
+        manager.disconnect(ws, "room")
+    assert manager.active_connections == {}
@@ -0,0 +1,272 @@
+# utils/backplane.py
+import asyncio
+import os
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from bson import ObjectId
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+from models.chat_model import ChatMessage
+from core.config import CHAT_BACKPLANE, CHAT_BACKPLANE_COLLECTION, CHAT_BACKPLANE_SIZE_BYTES
+
+# Called with (room_id, frame) for every message this worker must deliver locally
+DeliverFn = Callable[[str, str], Awaitable[None]]
+
+
+class Backplane(ABC):
+    """
+    Room broadcast transport between workers.
+    The publishing worker delivers to its own sockets directly; the backplane carries
+    the frame to other workers that have subscribed to the room.
+    """
+
+    def __init__(self):
+        self.rooms: Set[str] = set()
+        self.deliver: Optional[DeliverFn] = None
+
+    async def start(self, deliver: DeliverFn):
+        self.deliver = deliver
+
+    async def stop(self):
+        pass
+
+    def subscribe(self, room_id: str):
+        self.rooms.add(room_id)
+
+    def unsubscribe(self, room_id: str):
+        self.rooms.discard(room_id)
+
+    @abstractmethod
+    async def publish(self, room_id: str, frame: str):
+        """Hand a frame to the other workers; must not block the sender on the transport."""
+
+
+class InMemoryBackplane(Backplane):
+    """Single-process backplane: there are no other workers to reach."""
+
+    async def publish(self, room_id: str, frame: str):
+        return None
+
+
+class MongoBackplane(Backplane):
+    """
+    Backplane over a capped collection, which works on a standalone mongod
+    (no replica set needed, unlike change streams).
+    Each worker tails only the rooms it holds sockets for (room_id $in), so other
+    rooms' traffic never crosses the wire to it. The trade-off is that the tail is
+    reopened when that set changes, and a tailable cursor reads in natural order, so
+    each reopen rescans the capped collection (bounded by CHAT_BACKPLANE_SIZE_BYTES).
+    Changes arriving together are coalesced into one reopen.
+    Publishes are queued and written by one task with insert_many, so a burst
+    of messages costs one round trip, not one per message. A failed write is
+    retried until it succeeds; while Mongo is away the queue is capped, oldest first.
+    """
+
+    RESTART_DELAY_SECONDS = 0.5
+    RESUBSCRIBE_DELAY_SECONDS = 0.05
+    PUBLISH_BATCH_SIZE = 500
+    PUBLISH_RETRY_SECONDS = 0.5
+    MAX_QUEUED_PUBLISHES = 10_000
+    # ObjectIds from different processes are not strictly ordered, so a reopened tail
+    # resumes a little before the last _id seen and skips events it has already delivered
+    RESUME_MARGIN = timedelta(seconds=2)
+
+    def __init__(self, collection_name: str = CHAT_BACKPLANE_COLLECTION, size_bytes: int = CHAT_BACKPLANE_SIZE_BYTES,
+                 collection=None):
+        super().__init__()
+        self.collection_name = collection_name
+        self.size_bytes = size_bytes
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.collection = collection
+        self.published = 0
+        self.publish_batches = 0
+        self.publish_failures = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.tails_opened = 0
+        self._last_id: Optional[ObjectId] = None
+        self._seen: deque = deque(maxlen=4096)
+        self._seen_set: Set = set()
+        # When each room was joined; a reopened tail resumes RESUME_MARGIN back, which
+        # must not replay a newly joined room's older messages
+        self._joined: Dict[str, datetime] = {}
+        self._outbox: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._rooms_changed: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._tail_task: Optional[asyncio.Task] = None
+        self._publish_task: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: DeliverFn):
+        await super().start(deliver)
+        if self.collection is None:
+            db = ChatMessage.get_pymongo_collection().database
+            try:
+                await db.create_collection(self.collection_name, capped=True, size=self.size_bytes)
+            except CollectionInvalid:
+                pass  # already exists
+            self.collection = db[self.collection_name]
+        # Only events published after startup are relevant
+        newest = await self.collection.find({}, {"_id": 1}).sort("$natural", -1).limit(1).to_list(1)
+        self._last_id = newest[0]["_id"] if newest else ObjectId.from_datetime(datetime.now(timezone.utc))
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._rooms_changed = asyncio.Event()
+        self._tail_task = asyncio.create_task(self._tail())
+        self._publish_task = asyncio.create_task(self._publisher())
+
+    async def stop(self):
+        """Write queued publishes, then close the tail."""
+        self._stopping = True
+        if self._publish_task is not None:
+            self._wakeup.set()
+            await self._publish_task
+            self._publish_task = None
+        if self._tail_task is not None:
+            self._tail_task.cancel()
+            try:
+                await self._tail_task
+            except asyncio.CancelledError:
+                pass
+            self._tail_task = None
+
+    def subscribe(self, room_id: str):
+        if room_id not in self.rooms:
+            super().subscribe(room_id)
+            # Cut to Mongo's millisecond precision, as stored created_at values are
+            now = datetime.utcnow()
+            self._joined[room_id] = now.replace(microsecond=now.microsecond // 1000 * 1000)
+            self._resubscribe()
+
+    def unsubscribe(self, room_id: str):
+        if room_id in self.rooms:
+            super().unsubscribe(room_id)
+            self._joined.pop(room_id, None)
+            self._resubscribe()
+
+    def _resubscribe(self):
+        if self._rooms_changed is not None:
+            self._rooms_changed.set()
+
+    async def publish(self, room_id: str, frame: str):
+        if len(self._outbox) >= self.MAX_QUEUED_PUBLISHES:
+            # Mongo has been unreachable for a while; live delivery of the oldest is moot
+            self._outbox.popleft()
+            self.dropped += 1
+        self._outbox.append({
+            "room_id": room_id,
+            "origin": self.worker_id,
+            "frame": frame,
+            "created_at": datetime.utcnow(),
+        })
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _publisher(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._outbox:
+                batch = [self._outbox[i] for i in range(min(self.PUBLISH_BATCH_SIZE, len(self._outbox)))]
+                try:
+                    await self.collection.insert_many(batch, ordered=True)
+                except Exception as e:
+                    # Local delivery already happened; keep the batch queued and retry,
+                    # so other workers get it late rather than never
+                    self.publish_failures += 1
+                    if self._stopping:
+                        self.dropped += len(self._outbox)
+                        print(f"⚠️ Chat backplane stopping; {len(self._outbox)} queued event(s) not published: {e}")
+                        self._outbox.clear()
+                        return
+                    print(f"⚠️ Chat backplane publish of {len(batch)} event(s) failed, retrying: {e}")
+                    await asyncio.sleep(self.PUBLISH_RETRY_SECONDS)
+                    continue
+                for _ in batch:
+                    self._outbox.popleft()
+                self.published += len(batch)
+                self.publish_batches += 1
+            if self._stopping:
+                return
+
+    def _remember(self, event_id):
+        if len(self._seen) == self._seen.maxlen:
+            self._seen_set.discard(self._seen[0])
+        self._seen.append(event_id)
+        self._seen_set.add(event_id)
+
+    async def _tail(self):
+        """Keep one tail open over the subscribed rooms, reopening it when they change."""
+        while True:
+            self._rooms_changed.clear()
+            rooms = sorted(self.rooms)
+            if not rooms:
+                await self._rooms_changed.wait()
+                continue
+            reader = asyncio.create_task(self._read(rooms))
+            changed = asyncio.create_task(self._rooms_changed.wait())
+            try:
+                await asyncio.wait({reader, changed}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                changed.cancel()
+                if not reader.done():
+                    reader.cancel()
+                    try:
+                        await reader
+                    except asyncio.CancelledError:
+                        pass
+            if self._rooms_changed.is_set():
+                # Let a burst of joins/leaves settle into one reopen
+                await asyncio.sleep(self.RESUBSCRIBE_DELAY_SECONDS)
+            else:
+                # Tailable cursors die on an empty collection or after errors; reopen
+                await asyncio.sleep(self.RESTART_DELAY_SECONDS)
+
+    async def _read(self, rooms: List[str]):
+        resume_from = ObjectId.from_datetime(self._last_id.generation_time - self.RESUME_MARGIN)
+        query = {
+            "room_id": {"$in": rooms},
+            "origin": {"$ne": self.worker_id},
+            "_id": {"$gt": resume_from},
+        }
+        self.tails_opened += 1
+        cursor = self.collection.find(query, cursor_type=CursorType.TAILABLE_AWAIT)
+        try:
+            async for event in cursor:
+                if event["_id"] in self._seen_set:
+                    continue
+                self._remember(event["_id"])
+                if event["_id"] > self._last_id:
+                    self._last_id = event["_id"]
+                # The room may have been left since this tail was opened
+                joined = self._joined.get(event["room_id"])
+                if joined is not None and event["created_at"] >= joined:
+                    self.delivered += 1
+                    await self.deliver(event["room_id"], event["frame"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Chat backplane tail error: {e}")
+        finally:
+            await cursor.close()
+
+    def stats(self) -> Dict:
+        return {
+            "rooms": len(self.rooms),
+            "published": self.published,
+            "publish_batches": self.publish_batches,
+            "publish_failures": self.publish_failures,
+            "dropped": self.dropped,
+            "delivered": self.delivered,
+            "tails_opened": self.tails_opened,
+            "queued": len(self._outbox),
+        }
+
+
+def create_backplane() -> Backplane:
+    if CHAT_BACKPLANE == "mongo":
+        return MongoBackplane()
+    return InMemoryBackplane()
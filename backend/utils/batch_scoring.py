@@ -0,0 +1,116 @@
+# utils/batch_scoring.py
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from scipy import sparse
+from models.user_model import User
+from models.job_model import Job
+
+
+def _normalize(values: Sequence[str]) -> set:
+    return {v.lower().strip() for v in values or []}
+
+
+def build_vocabulary(jobs_tags: Sequence[List[str]]) -> Dict[str, int]:
+    """
+    Map every normalized job tag to a column index.
+    User skills outside this vocabulary can never overlap a job, so they are dropped.
+    """
+    vocab: Dict[str, int] = {}
+    for tags in jobs_tags:
+        for tag in _normalize(tags):
+            if tag not in vocab:
+                vocab[tag] = len(vocab)
+    return vocab
+
+
+def encode(rows: Sequence[List[str]], vocab: Dict[str, int]) -> sparse.csr_matrix:
+    """
+    Encode skill/tag lists as a sparse 0/1 CSR matrix of shape (len(rows), len(vocab)).
+    A row holds a handful of tags out of thousands, so only the set positions are stored.
+    """
+    indptr = [0]
+    indices: List[int] = []
+    for values in rows:
+        indices.extend(sorted(vocab[v] for v in _normalize(values) if v in vocab))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    return sparse.csr_matrix(
+        (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(rows), len(vocab)),
+    )
+
+
+def _top_k(jobs: np.ndarray, scores: np.ndarray, k: int, n_jobs: int) -> List[Tuple[int, float]]:
+    """
+    Top k of one user's non-zero (job, score) pairs, by score desc then job index, padded
+    with zero-score jobs in index order: the order a stable sort over every job would give.
+    """
+    if len(jobs) > k:
+        keep = np.argpartition(-scores, k - 1)[:k]
+        # Jobs tied with the k-th score may have been cut arbitrarily; rank every tied job
+        cutoff = scores[keep].min()
+        keep = np.flatnonzero(scores >= cutoff)
+        jobs, scores = jobs[keep], scores[keep]
+    order = np.lexsort((jobs, -scores))[:k]
+    # Python's round() keeps the numbers byte-for-byte equal to compute_match_score
+    ranked = [(j, round(s, 2)) for j, s in zip(jobs[order].tolist(), scores[order].tolist())]
+    if len(ranked) < k:
+        taken = set(jobs.tolist())
+        for j in range(n_jobs):
+            if len(ranked) == k:
+                break
+            if j not in taken:
+                ranked.append((j, 0.0))
+    return ranked
+
+
+def batch_top_jobs(
+    users_skills: Sequence[List[str]],
+    jobs_tags: Sequence[List[str]],
+    k: int = 10,
+    chunk_size: int = 256,
+) -> List[List[Tuple[int, float]]]:
+    """
+    Score every user against every job with one sparse matrix product per chunk of users.
+    Only (user, job) pairs sharing at least one tag are ever materialized, so memory
+    follows the number of overlaps rather than users x jobs.
+    Returns, for each user, up to k (job_index, match_score) pairs sorted by score desc,
+    ties in job order. Scores and order are identical to rank_jobs_for_user.
+    """
+    if not users_skills or not jobs_tags or k <= 0:
+        return [[] for _ in users_skills]
+
+    vocab = build_vocabulary(jobs_tags)
+    job_matrix = encode(jobs_tags, vocab).T.tocsr()  # (vocab, jobs)
+    job_denom = np.maximum(np.asarray(job_matrix.sum(axis=0)).ravel(), 1.0).astype(np.float64)
+    n_jobs = len(jobs_tags)
+    k = min(k, n_jobs)
+
+    results: List[List[Tuple[int, float]]] = []
+    for start in range(0, len(users_skills), chunk_size):
+        user_matrix = encode(users_skills[start:start + chunk_size], vocab)
+        overlap = (user_matrix @ job_matrix).tocsr()  # (users, jobs), non-zero only where tags overlap
+        # _top_k breaks ties on job index itself, so the product's column order does not matter
+        ratio = overlap.data.astype(np.float64) / job_denom[overlap.indices]
+        # Same arithmetic as compute_match_score: 0.7 * skill_score + 0.3 * tag_score
+        scores = (0.7 * ratio + 0.3 * ratio) * 100
+        for row in range(user_matrix.shape[0]):
+            lo, hi = overlap.indptr[row], overlap.indptr[row + 1]
+            results.append(_top_k(overlap.indices[lo:hi], scores[lo:hi], k, n_jobs))
+    return results
+
+
+def rank_jobs_for_users(users: List[User], jobs: List[Job], k: int = 10) -> Dict[str, List[Dict]]:
+    """
+    Batch counterpart of rank_jobs_for_user.
+    Returns {user_id: [{job, match_score}, ...]} with the top k jobs per user.
+    """
+    top = batch_top_jobs(
+        [u.skills or [] for u in users],
+        [j.tags or [] for j in jobs],
+        k=k,
+    )
+    return {
+        str(user.id): [{"job": jobs[j], "match_score": score} for j, score in ranked]
+        for user, ranked in zip(users, top)
+    }
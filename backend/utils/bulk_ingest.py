@@ -0,0 +1,236 @@
+# utils/bulk_ingest.py
+"""
+Bulk resume ingestion for onboarding a whole class at once.
+
+    python -m utils.bulk_ingest resumes/                 # files named <email>.pdf
+    python -m utils.bulk_ingest manifest.csv             # CSV with file,email columns
+
+PDFs are parsed in parallel on every core and the skills are merged into users
+with batched $addToSet bulk writes. Emails are matched case-insensitively.
+Every file's outcome (ok, failed or unknown email) is appended to a checkpoint
+file, ok files once their batch is written, so an interrupted run picks up where
+it left off; failed and unknown files are skipped too unless --retry-failed is given.
+A PDF that takes longer than --timeout to parse is recorded as failed.
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+from pymongo import UpdateOne
+from core.config import EXTRACTION_TIMEOUT_SECONDS
+from models.user_model import EMAIL_COLLATION, User
+from utils.extraction_jobs import _mp
+from utils.skill_extraction import extract_text_from_pdf, extract_skill_matches
+from utils.resume_cache import resume_cache
+
+
+def read_entries(source: Path) -> List[Tuple[str, str]]:
+    """(pdf_path, email) pairs from a directory of <email>.pdf files or a file,email CSV manifest."""
+    if source.is_dir():
+        return [(str(p), p.stem.lower()) for p in sorted(source.glob("*.pdf"))]
+    entries = []
+    with open(source, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            path = Path(row["file"])
+            if not path.is_absolute():
+                path = source.parent / path
+            entries.append((str(path), row["email"].strip().lower()))
+    return entries
+
+
+# Checkpoint lines are "<path>\t<outcome>[\t<detail>]"
+OK, FAILED, UNKNOWN = "ok", "failed", "unknown"
+
+
+def load_checkpoint(path: Path) -> Dict[str, str]:
+    """{pdf_path: outcome}; the latest line for a file wins. Bare paths (older checkpoints) mean ok."""
+    outcomes: Dict[str, str] = {}
+    if not path.exists():
+        return outcomes
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line:
+                fields = line.split("\t")
+                outcomes[fields[0]] = fields[1] if len(fields) > 1 else OK
+    return outcomes
+
+
+class _Overrun(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _Overrun()
+
+
+def _parse(pdf_path: str, timeout: float) -> Tuple[str, List[str]]:
+    """
+    Text and skills of one PDF, abandoned after timeout seconds so a pathological
+    file cannot hold a pool worker forever. The alarm fires between Python steps
+    (e.g. pages), so one stalled MuPDF call is only cut off once it returns.
+    """
+    if not timeout or not hasattr(signal, "setitimer"):
+        text = extract_text_from_pdf(pdf_path)
+        return text, sorted(extract_skill_matches(text))
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        text = extract_text_from_pdf(pdf_path)
+        return text, sorted(extract_skill_matches(text))
+    except _Overrun:
+        raise TimeoutError(f"Extraction exceeded {timeout:g}s") from None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _extract_file(pdf_path: str, timeout: float = EXTRACTION_TIMEOUT_SECONDS) -> Dict:
+    """Runs in a worker process; reuses the shared resume cache when the PDF was parsed before."""
+    try:
+        with open(pdf_path, "rb") as f:
+            data = f.read()
+        sha256 = hashlib.sha256(data).hexdigest()
+        cached = resume_cache.lookup(sha256, len(data))
+        if cached["skills"] is not None:
+            return {"path": pdf_path, "skills": cached["skills"]}
+        if cached["text"] is not None:
+            text, skills = cached["text"], sorted(extract_skill_matches(cached["text"]))
+        else:
+            text, skills = _parse(pdf_path, timeout)
+    except Exception as e:
+        return {"path": pdf_path, "error": str(e)}
+    # Caching is best effort; a full or unwritable cache must not fail a parsed file
+    try:
+        resume_cache.store(sha256, text, skills)
+    except OSError as e:
+        print(f"⚠️ Could not cache parsed resume {pdf_path}: {e}")
+    return {"path": pdf_path, "skills": skills}
+
+
+class BulkIngest:
+    def __init__(self, entries: List[Tuple[str, str]], checkpoint: Path, workers: int, batch_size: int,
+                 retry_failed: bool = False, timeout: float = EXTRACTION_TIMEOUT_SECONDS):
+        self.entries = entries
+        self.checkpoint = checkpoint
+        self.workers = workers
+        self.batch_size = batch_size
+        self.retry_failed = retry_failed
+        self.timeout = timeout
+        self.emails = dict(entries)
+        self.known_emails: Dict[str, str] = {}  # lowercased -> email as stored
+        self.batch: List[Tuple[str, UpdateOne]] = []
+        self.outcomes: List[str] = []  # checkpoint lines of failed/unknown files not yet written
+        self.processed = 0
+        self.updated = 0
+        self.failed = 0
+        self.unknown = 0
+        self.last_report = time.monotonic()
+
+    async def _flush(self):
+        if self.batch:
+            ops = [op for _, op in self.batch]
+            result = await User.get_pymongo_collection().bulk_write(ops, ordered=False)
+            self.updated += result.modified_count
+        # Only record ok files once their update is durable; a replayed batch is harmless ($addToSet)
+        lines = self.outcomes + [f"{path}\t{OK}\n" for path, _ in self.batch]
+        if lines:
+            with open(self.checkpoint, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        self.batch.clear()
+        self.outcomes.clear()
+
+    def _record(self, path: str, outcome: str, detail: str):
+        # Tabs and newlines would break the line format
+        detail = " ".join(detail.split())
+        self.outcomes.append(f"{path}\t{outcome}\t{detail}\n")
+
+    async def _handle(self, result: Dict):
+        self.processed += 1
+        path = result["path"]
+        email = self.emails[path]
+        if "error" in result:
+            self.failed += 1
+            print(f"⚠️ {path}: {result['error']}")
+            self._record(path, FAILED, result["error"])
+        elif email not in self.known_emails:
+            self.unknown += 1
+            print(f"⚠️ {path}: no user with email {email}")
+            self._record(path, UNKNOWN, email)
+        else:
+            op = UpdateOne({"email": self.known_emails[email]}, {"$addToSet": {"skills": {"$each": result["skills"]}}})
+            self.batch.append((path, op))
+        if len(self.batch) + len(self.outcomes) >= self.batch_size:
+            await self._flush()
+
+    async def run(self):
+        outcomes = load_checkpoint(self.checkpoint)
+        skip = {OK} if self.retry_failed else {OK, FAILED, UNKNOWN}
+        todo = [path for path, _ in self.entries if outcomes.get(path) not in skip]
+        done = sum(1 for o in outcomes.values() if o == OK)
+        print(
+            f"📂 {len(self.entries)} resumes, {done} already ingested, {len(outcomes) - done} failed/unknown before, "
+            f"{len(todo)} to go on {self.workers} workers"
+        )
+
+        # Manifests and file names rarely match the stored case; the collation (and its index) ignores it
+        emails = list({self.emails[p] for p in todo})
+        cursor = User.get_pymongo_collection().find({"email": {"$in": emails}}, {"email": 1}, collation=EMAIL_COLLATION)
+        self.known_emails = {doc["email"].lower(): doc["email"] async for doc in cursor}
+
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        in_flight = set()
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp) as pool:
+            for path in todo:
+                # Bounded submission keeps memory flat and the checkpoint close to real progress
+                if len(in_flight) >= self.workers * 4:
+                    finished, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for fut in finished:
+                        await self._handle(fut.result())
+                    self._report(started)
+                in_flight.add(loop.run_in_executor(pool, _extract_file, path, self.timeout))
+            for fut in asyncio.as_completed(in_flight):
+                await self._handle(await fut)
+        await self._flush()
+
+        elapsed = time.monotonic() - started
+        rate = self.processed / elapsed if elapsed else 0.0
+        print(
+            f"✅ Ingested {self.processed} resumes in {elapsed:.1f}s ({rate:.1f} files/sec): "
+            f"{self.updated} users updated, {self.unknown} unknown emails, {self.failed} failed"
+        )
+
+    def _report(self, started: float, every: float = 5.0):
+        now = time.monotonic()
+        if now - self.last_report >= every:
+            self.last_report = now
+            print(f"⏳ {self.processed} files, {self.processed / (now - started):.1f} files/sec")
+
+
+if __name__ == "__main__":
+    from database.connection import init_db
+
+    parser = argparse.ArgumentParser(description="Bulk-ingest resume PDFs and merge extracted skills into users")
+    parser.add_argument("source", type=Path, help="directory of <email>.pdf files, or a CSV manifest with file,email columns")
+    parser.add_argument("--checkpoint", type=Path, help="progress file (default: <source>.ingest-progress)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--retry-failed", action="store_true", help="re-process files that failed or had no matching user last time")
+    parser.add_argument("--timeout", type=float, default=EXTRACTION_TIMEOUT_SECONDS,
+                        help="seconds to parse one PDF before it is recorded as failed (0 disables)")
+    args = parser.parse_args()
+
+    async def main():
+        await init_db()
+        checkpoint = args.checkpoint or args.source.with_name(args.source.name + ".ingest-progress")
+        await BulkIngest(read_entries(args.source), checkpoint, args.workers, args.batch_size, args.retry_failed,
+                         args.timeout).run()
+
+    asyncio.run(main())
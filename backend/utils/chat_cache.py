@@ -0,0 +1,191 @@
+# utils/chat_cache.py
+import asyncio
+import bisect
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from bson import ObjectId
+from models.chat_model import ChatMessage, ChatMessageOut
+from core.config import CHAT_CACHE_ROOM_MESSAGES, CHAT_CACHE_MAX_BYTES
+from utils.pagination import decode_cursor
+
+# Rough per-message overhead (object, datetime, ObjectId, list slot) on top of the strings
+MESSAGE_OVERHEAD_BYTES = 400
+
+
+def _key(msg: ChatMessageOut) -> Tuple[datetime, ObjectId]:
+    return (msg.timestamp, msg.id)
+
+
+def _size(msg: ChatMessageOut) -> int:
+    return MESSAGE_OVERHEAD_BYTES + len(msg.message) + len(msg.sender_id) + len(msg.sender_name or "")
+
+
+class RoomBuffer:
+    """The newest messages of one room in (timestamp, _id) order."""
+
+    def __init__(self, messages: List[ChatMessageOut], complete: bool, capacity: int):
+        self.capacity = capacity
+        self.messages: List[ChatMessageOut] = sorted(messages, key=_key)[-capacity:]
+        self.keys = [_key(m) for m in self.messages]
+        # True while the buffer holds the room's entire history
+        self.complete = complete and len(messages) <= capacity
+        self.bytes = sum(_size(m) for m in self.messages)
+
+    def append(self, msg: ChatMessageOut) -> int:
+        """Insert in key order, dropping the oldest beyond capacity. Returns the byte delta."""
+        key = _key(msg)
+        pos = bisect.bisect_left(self.keys, key)
+        if pos < len(self.keys) and self.keys[pos] == key:
+            return 0
+        self.keys.insert(pos, key)
+        self.messages.insert(pos, msg)
+        delta = _size(msg)
+        while len(self.messages) > self.capacity:
+            delta -= _size(self.messages.pop(0))
+            self.keys.pop(0)
+            self.complete = False
+        self.bytes += delta
+        return delta
+
+    def page(self, limit: int, before=None, after=None) -> Optional[Tuple[List[ChatMessageOut], bool]]:
+        """(messages, has_more) if the buffer fully covers the requested page, else None."""
+        if after is not None:
+            # Everything newer than the cursor is buffered if the cursor is inside the buffer
+            if not self.complete and (not self.keys or after < self.keys[0]):
+                return None
+            start = bisect.bisect_right(self.keys, after)
+            newer = self.messages[start:]
+            return newer[:limit], len(newer) > limit
+
+        end = bisect.bisect_left(self.keys, before) if before is not None else len(self.keys)
+        if before is not None and not self.complete and (not self.keys or before > self.keys[-1]):
+            # Cursor is newer than anything buffered, e.g. after eviction of the tail
+            return None
+        older = self.messages[:end]
+        if len(older) > limit:
+            return older[-limit:], True
+        if self.complete:
+            return older, False
+        return None
+
+
+class RecentMessageCache:
+    """
+    Per-room ring buffers of recent chat messages, shared by the history endpoint
+    and the websocket path, with LRU eviction of cold rooms under a global byte budget.
+    """
+
+    def __init__(self, room_capacity: int = CHAT_CACHE_ROOM_MESSAGES, max_bytes: int = CHAT_CACHE_MAX_BYTES):
+        self.room_capacity = room_capacity
+        self.max_bytes = max_bytes
+        self.rooms: "OrderedDict[str, RoomBuffer]" = OrderedDict()
+        # Rooms being loaded: messages appended meanwhile are queued here and merged once the rows arrive
+        self.filling: Dict[str, List[ChatMessageOut]] = {}
+        self._fills: Dict[str, asyncio.Future] = {}
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def append(self, room_id: str, msg: ChatMessageOut):
+        """Add a new message to a cached (or loading) room; uncached rooms are filled on first read."""
+        queued = self.filling.get(room_id)
+        if queued is not None:
+            queued.append(msg)
+            return
+        buf = self.rooms.get(room_id)
+        if buf is None:
+            return
+        self.resident_bytes += buf.append(msg)
+        self._evict()
+
+    async def fill(self, room_id: str, pending: List[ChatMessage] = ()) -> RoomBuffer:
+        """
+        Load the newest messages of a room, plus any not yet written to Mongo.
+        The room is marked as filling before the query, so messages appended
+        while it runs are queued and merged rather than lost; concurrent fills
+        of the same room share one query.
+        """
+        running = self._fills.get(room_id)
+        if running is not None:
+            return await asyncio.shield(running)
+        future = asyncio.get_running_loop().create_future()
+        self._fills[room_id] = future
+        queued = self.filling[room_id] = [to_out(chat) for chat in pending]
+        try:
+            rows = await (
+                ChatMessage.find(ChatMessage.room_id == room_id)
+                .sort([("timestamp", -1), ("_id", -1)])
+                .limit(self.room_capacity + 1)
+                .project(ChatMessageOut)
+                .to_list()
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            # Concurrent fills see the same error; mark it retrieved so an unshared one is not logged
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self.filling[room_id]
+            del self._fills[room_id]
+        complete = len(rows) <= self.room_capacity
+        buf = RoomBuffer(rows[:self.room_capacity], complete, self.room_capacity)
+        for msg in queued:
+            buf.append(msg)
+        old = self.rooms.pop(room_id, None)
+        if old is not None:
+            self.resident_bytes -= old.bytes
+        self.rooms[room_id] = buf
+        self.resident_bytes += buf.bytes
+        self._evict()
+        future.set_result(buf)
+        return buf
+
+    def page(self, room_id: str, limit: int, before: Optional[str] = None, after: Optional[str] = None, record: bool = True):
+        """Serve a history page from memory, or None on a miss. record=False skips the hit/miss counters."""
+        buf = self.rooms.get(room_id)
+        result = None
+        if buf is not None:
+            self.rooms.move_to_end(room_id)
+            result = buf.page(
+                limit,
+                before=decode_cursor(before) if before else None,
+                after=decode_cursor(after) if after else None,
+            )
+        if record:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def _evict(self):
+        while self.resident_bytes > self.max_bytes and len(self.rooms) > 1:
+            _, buf = self.rooms.popitem(last=False)
+            self.resident_bytes -= buf.bytes
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "rooms": len(self.rooms),
+            "resident_bytes": self.resident_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def to_out(chat: ChatMessage) -> ChatMessageOut:
+    return ChatMessageOut.model_validate({
+        "_id": chat.id,
+        "sender_id": chat.sender_id,
+        "sender_name": chat.sender_name,
+        "message": chat.message,
+        "timestamp": chat.timestamp,
+    })
+
+
+chat_cache = RecentMessageCache()
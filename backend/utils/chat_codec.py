@@ -0,0 +1,92 @@
+# utils/chat_codec.py
+from datetime import datetime, timezone
+from typing import Dict, Optional, Union
+import msgpack
+import orjson
+
+Frame = Union[str, bytes]
+
+# Short field codes used by the binary protocol
+FIELD_CODES = {
+    "id": "i",
+    "sender_id": "s",
+    "sender_name": "n",
+    "message": "m",
+    "timestamp": "t",
+    "type": "y",
+    "client_msg_id": "c",
+}
+FIELD_NAMES = {code: name for name, code in FIELD_CODES.items()}
+
+
+class JsonCodec:
+    """Default text protocol: JSON text frames (encoded with orjson)."""
+    name = "json"
+    subprotocol: Optional[str] = None
+    binary = False
+
+    def encode(self, message: dict) -> str:
+        return orjson.dumps(message).decode()
+
+    def decode(self, frame: Frame) -> dict:
+        return orjson.loads(frame)
+
+
+class MsgpackCodec:
+    """
+    Binary protocol negotiated with the `campusconnect.msgpack.v1` subprotocol.
+    Keys are replaced by one-letter codes and timestamps travel as epoch milliseconds.
+    """
+    name = "msgpack"
+    subprotocol = "campusconnect.msgpack.v1"
+    binary = True
+
+    def encode(self, message: dict) -> bytes:
+        packed = {}
+        for key, value in message.items():
+            if key == "timestamp" and isinstance(value, str):
+                dt = datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+                value = int(dt.timestamp() * 1000)
+            packed[FIELD_CODES.get(key, key)] = value
+        return msgpack.packb(packed)
+
+    def decode(self, frame: Frame) -> dict:
+        packed = msgpack.unpackb(frame)
+        return {FIELD_NAMES.get(code, code): value for code, value in packed.items()}
+
+
+JSON_CODEC = JsonCodec()
+CODECS_BY_SUBPROTOCOL: Dict[str, MsgpackCodec] = {MsgpackCodec.subprotocol: MsgpackCodec()}
+
+
+def negotiate(offered) -> Union[JsonCodec, MsgpackCodec]:
+    """Pick the first supported subprotocol the client offered; plain JSON otherwise."""
+    for subprotocol in offered or []:
+        codec = CODECS_BY_SUBPROTOCOL.get(subprotocol)
+        if codec is not None:
+            return codec
+    return JSON_CODEC
+
+
+class OutboundMessage:
+    """A message encoded at most once per codec, however many sockets receive it."""
+
+    def __init__(self, message: dict, json_frame: Optional[str] = None):
+        self.message = message
+        self._frames: Dict[str, Frame] = {}
+        if json_frame is not None:
+            self._frames[JSON_CODEC.name] = json_frame
+
+    @classmethod
+    def from_json(cls, frame: str) -> "OutboundMessage":
+        return cls(orjson.loads(frame), json_frame=frame)
+
+    def frame(self, codec) -> Frame:
+        frame = self._frames.get(codec.name)
+        if frame is None:
+            frame = self._frames[codec.name] = codec.encode(self.message)
+        return frame
+
+    @property
+    def json(self) -> str:
+        return self.frame(JSON_CODEC)
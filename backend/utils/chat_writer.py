@@ -0,0 +1,147 @@
+# utils/chat_writer.py
+import asyncio
+import os
+from typing import List, Optional, Tuple
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError
+from models.chat_model import ChatMessage
+from core.config import CHAT_BATCH_MAX_SIZE, CHAT_BATCH_MAX_DELAY_MS, CHAT_SHUTDOWN_FLUSH_ATTEMPTS, CHAT_SPILL_PATH
+
+DUPLICATE_KEY = 11000
+RETRY_DELAY_SECONDS = 0.5
+
+
+class ChatBatchWriter:
+    """
+    Write-behind group commit for chat messages.
+    submit() returns immediately with a future that resolves once the message is
+    durable. Messages are written with insert_many when the batch reaches max_size
+    or max_delay_ms after the first buffered message, whichever comes first.
+    Failed batches are kept and retried, never dropped; at shutdown, messages
+    that still cannot be written are spilled to a local file and replayed by
+    recover() on the next start.
+    """
+
+    def __init__(self, max_size: int = CHAT_BATCH_MAX_SIZE, max_delay_ms: float = CHAT_BATCH_MAX_DELAY_MS,
+                 spill_path: str = CHAT_SPILL_PATH):
+        self.max_size = max_size
+        self.max_delay = max_delay_ms / 1000
+        self.spill_path = spill_path
+        self.pending: List[Tuple[ChatMessage, asyncio.Future]] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._stopping = False
+        self.batches_written = 0
+        self.messages_written = 0
+
+    def submit(self, chat: ChatMessage) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if chat.id is None:
+            # Ids are assigned here so the message can be broadcast and acked before it is written
+            chat.id = PydanticObjectId()
+        future = loop.create_future()
+        self.pending.append((chat, future))
+        if len(self.pending) >= self.max_size:
+            self._schedule(0)
+        elif self._timer is None:
+            self._schedule(self.max_delay)
+        return future
+
+    def _schedule(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(delay, lambda: asyncio.ensure_future(self.flush()))
+
+    def _take(self, room_id: Optional[str]) -> List[Tuple[ChatMessage, asyncio.Future]]:
+        """Remove and return the next batch, optionally only messages of one room."""
+        if room_id is None:
+            batch = self.pending[:self.max_size]
+            del self.pending[:self.max_size]
+            return batch
+        batch, rest = [], []
+        for entry in self.pending:
+            if entry[0].room_id == room_id and len(batch) < self.max_size:
+                batch.append(entry)
+            else:
+                rest.append(entry)
+        self.pending[:] = rest
+        return batch
+
+    async def flush(self, room_id: Optional[str] = None) -> bool:
+        """
+        Write everything buffered so far, or only one room's messages.
+        Returns False if a write failed; the messages stay buffered and a retry is scheduled.
+        """
+        async with self._lock:
+            if room_id is None and self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            while batch := self._take(room_id):
+                try:
+                    await self._write([chat for chat, _ in batch])
+                except Exception as e:
+                    print(f"⚠️ Chat batch write failed, retrying: {e}")
+                    self.pending[:0] = batch
+                    if not self._stopping:  # stop() paces its own retries
+                        self._schedule(RETRY_DELAY_SECONDS)
+                    return False
+                self.batches_written += 1
+                self.messages_written += len(batch)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(True)
+            return True
+
+    @staticmethod
+    async def _write(messages: List[ChatMessage]):
+        try:
+            await ChatMessage.insert_many(messages, ordered=False)
+        except BulkWriteError as e:
+            # A retried batch may be partly written already; duplicates of our own ids are fine
+            if any(err.get("code") != DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+                raise
+
+    async def stop(self, attempts: int = CHAT_SHUTDOWN_FLUSH_ATTEMPTS):
+        """Flush with bounded retries, then spill anything Mongo would not take to disk."""
+        self._stopping = True
+        for attempt in range(attempts):
+            if await self.flush():
+                break
+            await asyncio.sleep(RETRY_DELAY_SECONDS * 2 ** attempt)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.pending:
+            self._spill()
+
+    def _spill(self):
+        batch, self.pending = self.pending, []
+        try:
+            os.makedirs(os.path.dirname(self.spill_path), exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for chat, _ in batch:
+                    f.write(chat.model_dump_json() + "\n")
+            print(f"⚠️ Saved {len(batch)} unwritten chat message(s) to {self.spill_path}; they are written on next startup")
+        except OSError as e:
+            print(f"❌ Lost {len(batch)} chat message(s): MongoDB and {self.spill_path} both failed ({e})")
+            for chat, _ in batch:
+                print(f"   {chat.model_dump_json()}")
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(ConnectionError("Chat message not yet stored in MongoDB"))
+                future.exception()
+
+    async def recover(self):
+        """Write messages spilled by a previous shutdown. Ids are kept, so replays are idempotent."""
+        if not os.path.exists(self.spill_path):
+            return
+        with open(self.spill_path, encoding="utf-8") as f:
+            messages = [ChatMessage.model_validate_json(line) for line in f if line.strip()]
+        for start in range(0, len(messages), self.max_size):
+            await self._write(messages[start:start + self.max_size])
+        os.unlink(self.spill_path)
+        print(f"✅ Wrote {len(messages)} chat message(s) spilled at last shutdown")
+
+
+chat_writer = ChatBatchWriter()
@@ -0,0 +1,224 @@
+# utils/email_queue.py
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import List, Optional
+import aiosmtplib
+from pymongo import ASCENDING, ReturnDocument
+from models.email_model import OutboundEmail
+from core.config import (
+    SMTP_USER, SMTP_PASSWORD, SMTP_HOST, SMTP_PORT,
+    EMAIL_SMTP_CONNECTIONS, EMAIL_RATE_PER_SECOND, EMAIL_MAX_ATTEMPTS,
+    EMAIL_RETRY_BACKOFF_SECONDS, EMAIL_POLL_INTERVAL_SECONDS, EMAIL_SMTP_TIMEOUT_SECONDS,
+)
+
+# A claimed message is leased for this long; if its sender dies, another picks it up after
+CLAIM_LEASE_SECONDS = 300
+# Close a connection nobody has used for this long rather than let the server drop it
+SMTP_IDLE_SECONDS = 60
+
+
+# The server refused this message but kept the session; aiosmtplib sends RSET
+# after either, so the connection is reused for the next message
+MESSAGE_REJECTIONS = (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused)
+
+
+def _is_permanent(error: Exception) -> bool:
+    """5xx replies, including 5xx recipient refusals, will not succeed on retry; 4xx ones might."""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(500 <= refused.code < 600 for refused in error.recipients)
+    return isinstance(error, aiosmtplib.SMTPResponseException) and 500 <= error.code < 600
+
+
+class EmailQueue:
+    """
+    Persistent outbound email queue.
+    enqueue() stores the message in Mongo and returns at once. Background
+    workers, each holding one open SMTP connection, claim due messages, send
+    them at no more than `rate` per second overall and reschedule failures
+    with exponential backoff. Because the queue lives in Mongo, a restart
+    (or a crash mid-send) does not lose mail.
+    """
+
+    def __init__(self, hostname: Optional[str] = SMTP_HOST, port: int = SMTP_PORT,
+                 username: Optional[str] = SMTP_USER, password: Optional[str] = SMTP_PASSWORD,
+                 connections: int = EMAIL_SMTP_CONNECTIONS, rate: float = EMAIL_RATE_PER_SECOND,
+                 max_attempts: int = EMAIL_MAX_ATTEMPTS, backoff: float = EMAIL_RETRY_BACKOFF_SECONDS,
+                 poll_interval: float = EMAIL_POLL_INTERVAL_SECONDS):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = username
+        self.connections = connections
+        self.rate = rate
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self._next_slot = 0.0
+        self._rate_lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+        self._stopping = False
+
+    async def enqueue(self, to: str, subject: str, body: str) -> OutboundEmail:
+        email = OutboundEmail(to=to, subject=subject, body=body)
+        await email.insert()
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return email
+
+    def start(self):
+        if self._workers:
+            return
+        self._stopping = False
+        self._rate_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(max(1, self.connections))]
+
+    async def stop(self):
+        """Let workers finish the message in hand, then close their connections."""
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _claim(self) -> Optional[dict]:
+        """Atomically lease the oldest due message; also recovers leases of dead senders."""
+        now = datetime.utcnow()
+        return await OutboundEmail.get_pymongo_collection().find_one_and_update(
+            {"status": {"$in": ["pending", "sending"]}, "next_attempt_at": {"$lte": now}},
+            {"$set": {"status": "sending", "next_attempt_at": now + timedelta(seconds=CLAIM_LEASE_SECONDS)},
+             "$inc": {"attempts": 1}},
+            sort=[("next_attempt_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _throttle(self):
+        """Space sends 1/rate seconds apart across all workers."""
+        if self.rate <= 0:
+            return
+        async with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname, port=self.port,
+            username=self.username, password=self.password,
+            timeout=EMAIL_SMTP_TIMEOUT_SECONDS,
+        )
+        await smtp.connect()
+        return smtp
+
+    def _build(self, doc: dict) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = doc["to"]
+        message["Subject"] = doc["subject"]
+        message.set_content(doc["body"])
+        return message
+
+    async def _send(self, conn: dict, doc: dict):
+        """
+        Send on conn["smtp"], (re)connecting as needed. The connection is kept in
+        `conn` as soon as it opens, so the worker still owns it if the send raises.
+        """
+        if conn["smtp"] is None or not conn["smtp"].is_connected:
+            conn["smtp"] = await self._connect()
+        try:
+            await conn["smtp"].send_message(self._build(doc))
+        except aiosmtplib.SMTPServerDisconnected:
+            # The server dropped the idle connection; reconnect once
+            conn["smtp"] = await self._connect()
+            await conn["smtp"].send_message(self._build(doc))
+
+    async def _finish(self, doc: dict, error: Optional[Exception] = None):
+        collection = OutboundEmail.get_pymongo_collection()
+        if error is None:
+            self.sent += 1
+            update = {"status": "sent", "sent_at": datetime.utcnow(), "last_error": None}
+        elif _is_permanent(error) or doc["attempts"] >= self.max_attempts:
+            self.failed += 1
+            update = {"status": "failed", "last_error": str(error)}
+            print(f"❌ Email to {doc['to']} failed after {doc['attempts']} attempt(s): {error}")
+        else:
+            self.retried += 1
+            delay = self.backoff * 2 ** (doc["attempts"] - 1) * random.uniform(0.9, 1.1)
+            update = {
+                "status": "pending",
+                "last_error": str(error),
+                "next_attempt_at": datetime.utcnow() + timedelta(seconds=delay),
+            }
+            print(f"⚠️ Email to {doc['to']} failed ({error}); retrying in {delay:.0f}s")
+        await collection.update_one({"_id": doc["_id"]}, {"$set": update})
+
+    async def _close(self, smtp: Optional[aiosmtplib.SMTP]):
+        if smtp is not None and smtp.is_connected:
+            try:
+                await smtp.quit()
+            except Exception:
+                smtp.close()
+
+    async def _worker(self):
+        conn: dict = {"smtp": None}
+        last_used = time.monotonic()
+        try:
+            while not self._stopping:
+                # Cleared before claiming so an enqueue racing an empty claim still wakes us
+                self._wakeup.clear()
+                try:
+                    doc = await self._claim()
+                except Exception as e:
+                    print(f"⚠️ Email queue could not read from MongoDB: {e}")
+                    doc = None
+                if doc is None:
+                    if conn["smtp"] is not None and time.monotonic() - last_used > SMTP_IDLE_SECONDS:
+                        await self._close(conn["smtp"])
+                        conn["smtp"] = None
+                    if self._stopping:
+                        break
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self._throttle()
+                try:
+                    await self._send(conn, doc)
+                    error = None
+                except (aiosmtplib.SMTPException, OSError) as e:
+                    error = e
+                    if not isinstance(e, MESSAGE_REJECTIONS):
+                        # Connection-level failure; a rejected message leaves the session usable
+                        await self._close(conn["smtp"])
+                        conn["smtp"] = None
+                last_used = time.monotonic()
+                try:
+                    await self._finish(doc, error)
+                except Exception as e:
+                    # The lease expires and the message is retried
+                    print(f"⚠️ Email queue could not record delivery of {doc['_id']}: {e}")
+        finally:
+            await self._close(conn["smtp"])
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+email_queue = EmailQueue()
@@ -0,0 +1,158 @@
+# utils/extraction_jobs.py
+import asyncio
+import multiprocessing
+from datetime import datetime
+from typing import List, Optional
+from beanie import PydanticObjectId
+from bson.errors import InvalidId
+from models.user_model import User
+from models.extraction_job_model import ExtractionJob
+from core.config import EXTRACTION_WORKERS, EXTRACTION_TIMEOUT_SECONDS
+from core.dependencies import invalidate_user
+from utils.skill_extraction import extract_text_from_pdf, extract_skill_matches
+from utils.resume_cache import resume_cache
+
+# forkserver children start from a clean process, not a copy of the running event loop
+_mp = multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+
+def _extract_in_child(pdf_path: str, conn):
+    try:
+        text = extract_text_from_pdf(pdf_path)
+        conn.send(("done", {"text": text, "skills": sorted(extract_skill_matches(text))}))
+    except Exception as e:
+        conn.send(("failed", str(e)))
+    finally:
+        conn.close()
+
+
+def _run_with_timeout(pdf_path: str, timeout: float):
+    """
+    Run one extraction in its own process and kill it if it overruns.
+    A ProcessPoolExecutor cannot cancel a running task, so each job gets a
+    process; the queue's semaphore bounds how many exist at once.
+    """
+    parent, child = _mp.Pipe(duplex=False)
+    proc = _mp.Process(target=_extract_in_child, args=(pdf_path, child), daemon=True)
+    proc.start()
+    child.close()
+    try:
+        if parent.poll(timeout):
+            return parent.recv()
+        return ("timeout", f"Extraction exceeded {timeout:.0f}s")
+    except EOFError:
+        return ("failed", "Extraction process exited unexpectedly")
+    finally:
+        parent.close()
+        if proc.is_alive():
+            proc.kill()
+        proc.join()
+
+
+class ExtractionQueue:
+    """
+    Background resume skill extraction.
+    submit() records the job and returns its id immediately; the job runs in a
+    separate process, and on success the skills are merged into the user's profile.
+    Job status is kept in Mongo (ExtractionJob, TTL-expired), so a status poll
+    can be answered by any worker, not only the one running the job.
+    Resumes already parsed (same SHA-256) are answered from resume_cache
+    without starting a process.
+    """
+
+    def __init__(self, workers: int = EXTRACTION_WORKERS, timeout: float = EXTRACTION_TIMEOUT_SECONDS):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks = set()
+
+    async def submit(self, user_id: str, pdf_path: str, sha256: Optional[str] = None, size: int = 0) -> str:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        job = ExtractionJob(user_id=str(user_id))
+        await job.insert()
+        job_id = str(job.id)
+        task = asyncio.create_task(self._run(job_id, str(user_id), pdf_path, sha256, size))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job_id
+
+    @staticmethod
+    async def get(job_id: str) -> Optional[ExtractionJob]:
+        try:
+            return await ExtractionJob.get(PydanticObjectId(job_id))
+        except InvalidId:
+            return None
+
+    @staticmethod
+    async def _update(job_id: str, **fields):
+        await ExtractionJob.get_pymongo_collection().update_one(
+            {"_id": PydanticObjectId(job_id)}, {"$set": fields}
+        )
+
+    async def _extract(self, job_id: str, pdf_path: str, sha256: Optional[str], size: int):
+        if sha256:
+            cached = await asyncio.to_thread(resume_cache.lookup, sha256, size)
+            if cached["skills"] is not None:
+                return "done", cached["skills"]
+            if cached["text"] is not None:
+                # Taxonomy changed since this resume was parsed: re-match the stored text only
+                skills = sorted(await asyncio.to_thread(extract_skill_matches, cached["text"]))
+                await self._cache(sha256, cached["text"], skills)
+                return "done", skills
+        async with self._slots:
+            await self._update(job_id, status="running")
+            status, result = await asyncio.to_thread(_run_with_timeout, pdf_path, self.timeout)
+        if status != "done":
+            return status, result
+        if sha256:
+            await self._cache(sha256, result["text"], result["skills"])
+        return status, result["skills"]
+
+    @staticmethod
+    async def _cache(sha256: str, text: str, skills: List[str]):
+        """Caching is best effort; a full or unwritable cache must not fail the job."""
+        try:
+            await asyncio.to_thread(resume_cache.store, sha256, text, skills)
+        except OSError as e:
+            print(f"⚠️ Could not cache parsed resume {sha256[:12]}: {e}")
+
+    async def _run(self, job_id: str, user_id: str, pdf_path: str, sha256: Optional[str] = None, size: int = 0):
+        fields = {}
+        try:
+            status, result = await self._extract(job_id, pdf_path, sha256, size)
+        except Exception as e:
+            # Never leave a job queued/running: the client polls until it finishes
+            status, result = "failed", f"Extraction error: {e}"
+        if status == "done":
+            try:
+                await merge_skills(user_id, result)
+                fields["skills_found"] = result
+            except Exception as e:
+                status, result = "failed", f"Could not update profile: {e}"
+        if status != "done":
+            fields["error"] = result
+            print(f"⚠️ Skill extraction {job_id} {status}: {result}")
+        try:
+            await self._update(job_id, status=status, finished_at=datetime.utcnow(), **fields)
+        except Exception as e:
+            print(f"⚠️ Could not record skill extraction {job_id} result: {e}")
+
+    async def stop(self):
+        """Wait for in-flight jobs so their results are not lost on shutdown."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+async def merge_skills(user_id: str, skills: List[str]):
+    """Add skills to a user's profile with one atomic $addToSet."""
+    if not skills:
+        return
+    await User.get_pymongo_collection().update_one(
+        {"_id": PydanticObjectId(user_id)},
+        {"$addToSet": {"skills": {"$each": skills}}},
+    )
+    invalidate_user(user_id)
+
+
+extraction_queue = ExtractionQueue()
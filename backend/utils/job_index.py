@@ -0,0 +1,85 @@
+# utils/job_index.py
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+from models.job_model import Job
+from utils.recommendation import compute_match_score
+
+
+def normalize_tag(tag: str) -> str:
+    """Normalize a skill/tag the same way compute_match_score does."""
+    return tag.lower().strip()
+
+
+class JobSkillIndex:
+    """
+    In-process inverted index: normalized tag -> set of job ids.
+    Also keeps each job's tags and status so recommendations can be scored
+    without loading the job documents from MongoDB.
+    """
+
+    def __init__(self):
+        self.tag_to_jobs: Dict[str, Set[str]] = {}
+        self.job_tags: Dict[str, List[str]] = {}
+        self.job_status: Dict[str, str] = {}
+
+    async def build(self):
+        """(Re)build the index from every job in the collection."""
+        self.tag_to_jobs.clear()
+        self.job_tags.clear()
+        self.job_status.clear()
+        async for job in Job.find_all():
+            self.add(job)
+
+    def add(self, job: Job):
+        job_id = str(job.id)
+        self.remove(job_id)
+        tags = list(job.tags or [])
+        self.job_tags[job_id] = tags
+        self.job_status[job_id] = job.status
+        for tag in {normalize_tag(t) for t in tags}:
+            self.tag_to_jobs.setdefault(tag, set()).add(job_id)
+
+    def update(self, job: Job):
+        self.add(job)
+
+    def remove(self, job_id: str):
+        tags = self.job_tags.pop(job_id, None)
+        self.job_status.pop(job_id, None)
+        if tags is None:
+            return
+        for tag in {normalize_tag(t) for t in tags}:
+            ids = self.tag_to_jobs.get(tag)
+            if ids is None:
+                continue
+            ids.discard(job_id)
+            if not ids:
+                del self.tag_to_jobs[tag]
+
+    def candidates(self, skills: List[str], status: Optional[str] = "open") -> Set[str]:
+        """Job ids sharing at least one skill, optionally restricted to a status."""
+        ids: Set[str] = set()
+        for skill in {normalize_tag(s) for s in skills or []}:
+            ids |= self.tag_to_jobs.get(skill, set())
+        if status is not None:
+            ids = {i for i in ids if self.job_status.get(i) == status}
+        return ids
+
+    def top_k(self, skills: List[str], limit: int = 20, offset: int = 0) -> Tuple[int, List[Tuple[str, float]]]:
+        """
+        Score only the candidate open jobs and return (total_candidates, page),
+        where page is a list of (job_id, match_score) sorted by score desc.
+        Uses a bounded heap of size offset + limit instead of a full sort.
+        """
+        ids = self.candidates(skills)
+        scored = (
+            (compute_match_score(skills, self.job_tags[i]), i)
+            for i in ids
+        )
+        top = heapq.nlargest(offset + limit, scored)
+        return len(ids), [(job_id, score) for score, job_id in top[offset:]]
+
+    def __len__(self):
+        return len(self.job_tags)
+
+
+job_index = JobSkillIndex()
@@ -0,0 +1,188 @@
+# utils/job_search.py
+import bisect
+import heapq
+import math
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from models.job_model import Job
+
+# Relative weight of a token depending on the field it appears in
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "description": 1.0}
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+# Dropped from queries: they match nearly every posting and carry no ranking signal
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or the to with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; keeps '+', '#' and '.' so c++, c# and node.js survive."""
+    return [t.rstrip(".") for t in TOKEN_RE.findall((text or "").lower())]
+
+
+class JobSearchIndex:
+    """
+    In-process full-text index over job title, description and tags.
+    token -> {job_id: weighted term frequency}, plus a sorted token list
+    for prefix (autocomplete) lookups. Kept in sync by the job write routes.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.job_tokens: Dict[str, Set[str]] = {}
+        self.job_tags: Dict[str, Set[str]] = {}
+        self.tag_jobs: Dict[str, Set[str]] = {}
+        self.job_status: Dict[str, str] = {}
+        self.job_created: Dict[str, datetime] = {}
+        self._sorted_tokens: Optional[List[str]] = None
+
+    async def build(self):
+        """(Re)build the index from every job in the collection."""
+        self.postings.clear()
+        self.job_tokens.clear()
+        self.job_tags.clear()
+        self.tag_jobs.clear()
+        self.job_status.clear()
+        self.job_created.clear()
+        self._sorted_tokens = None
+        async for job in Job.find_all():
+            self.add(job)
+
+    def add(self, job: Job):
+        job_id = str(job.id)
+        self.remove(job_id)
+        weights: Dict[str, float] = {}
+        fields = {
+            "title": tokenize(job.title),
+            "tags": [tok for tag in job.tags or [] for tok in tokenize(tag)],
+            "description": tokenize(job.description),
+        }
+        for field, tokens in fields.items():
+            for tok in tokens:
+                weights[tok] = weights.get(tok, 0.0) + FIELD_WEIGHTS[field]
+        for tok, weight in weights.items():
+            if tok not in self.postings:
+                self.postings[tok] = {}
+                self._sorted_tokens = None
+            self.postings[tok][job_id] = weight
+        self.job_tokens[job_id] = set(weights)
+        self.job_tags[job_id] = {t.lower().strip() for t in job.tags or []}
+        for tag in self.job_tags[job_id]:
+            self.tag_jobs.setdefault(tag, set()).add(job_id)
+        self.job_status[job_id] = job.status
+        self.job_created[job_id] = job.created_at
+
+    def update(self, job: Job):
+        self.add(job)
+
+    def remove(self, job_id: str):
+        tokens = self.job_tokens.pop(job_id, None)
+        for tag in self.job_tags.pop(job_id, ()):
+            jobs = self.tag_jobs.get(tag)
+            if jobs is not None:
+                jobs.discard(job_id)
+                if not jobs:
+                    del self.tag_jobs[tag]
+        self.job_status.pop(job_id, None)
+        self.job_created.pop(job_id, None)
+        for tok in tokens or ():
+            docs = self.postings.get(tok)
+            if docs is None:
+                continue
+            docs.pop(job_id, None)
+            if not docs:
+                del self.postings[tok]
+                self._sorted_tokens = None
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self.postings)
+        tokens = self._sorted_tokens
+        start = bisect.bisect_left(tokens, prefix)
+        end = bisect.bisect_left(tokens, prefix + "\uffff")
+        return tokens[start:end]
+
+    def _jobs_with_tag(self, fragment: str) -> Set[str]:
+        """
+        Jobs with a tag containing `fragment`, case-insensitively: the substring
+        semantics of the old `$regex` tag filter, as a literal match. Scans the
+        distinct tags, not the jobs.
+        """
+        wanted = fragment.lower().strip()
+        jobs: Set[str] = set()
+        for tag, tagged in self.tag_jobs.items():
+            if wanted in tag:
+                jobs |= tagged
+        return jobs
+
+    def _term_scores(self, terms: List[str]) -> Dict[str, float]:
+        """Best tf-idf score per job over a set of alternative terms (prefix expansions)."""
+        n_docs = max(len(self.job_tokens), 1)
+        scores: Dict[str, float] = {}
+        for term in terms:
+            docs = self.postings.get(term, {})
+            idf = math.log(1 + n_docs / len(docs)) if docs else 0.0
+            for job_id, weight in docs.items():
+                score = weight * idf
+                if score > scores.get(job_id, 0.0):
+                    scores[job_id] = score
+        return scores
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        status: Optional[str] = None,
+        tag: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[int, List[Tuple[str, float]]]:
+        """
+        Rank jobs matching every query token; the last token also matches as a prefix.
+        Stopwords are ignored, and a query with nothing else in it (only punctuation
+        or stopwords) matches no jobs; a missing or blank query lists every job.
+        Results can be narrowed by status and by tag (a case-insensitive substring
+        of any of the job's tags, as before).
+        Returns (total_matches, page) where page is [(job_id, score)], best first,
+        ties broken by newest job.
+        """
+        tokens = [t for t in tokenize(query) if t not in STOPWORDS]
+        if query and query.strip() and not tokens:
+            return 0, []
+        if tokens:
+            scores: Optional[Dict[str, float]] = None
+            for i, tok in enumerate(tokens):
+                is_last = i == len(tokens) - 1
+                terms = self._expand_prefix(tok) if is_last else [tok]
+                term_scores = self._term_scores(terms)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {j: s + term_scores[j] for j, s in scores.items() if j in term_scores}
+                if not scores:
+                    break
+            scores = scores or {}
+            if tag:
+                tagged = self._jobs_with_tag(tag)
+                scores = {j: s for j, s in scores.items() if j in tagged}
+        else:
+            # Browsing: start from the tagged jobs rather than filtering every job
+            scores = dict.fromkeys(self._jobs_with_tag(tag) if tag else self.job_tokens, 0.0)
+
+        if status:
+            scores = {j: s for j, s in scores.items() if self.job_status.get(j) == status}
+
+        top = heapq.nlargest(
+            offset + limit,
+            scores.items(),
+            key=lambda item: (item[1], self.job_created.get(item[0]) or datetime.min, item[0]),
+        )
+        return len(scores), [(j, round(s, 4)) for j, s in top[offset:]]
+
+    def __len__(self):
+        return len(self.job_tokens)
+
+
+job_search = JobSearchIndex()
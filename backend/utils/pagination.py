@@ -0,0 +1,45 @@
+# utils/pagination.py
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+from bson import ObjectId
+from fastapi import HTTPException
+
+
+def encode_cursor(sort_value: datetime, doc_id) -> str:
+    """Build an opaque cursor from a (datetime, _id) sort key."""
+    raw = f"{sort_value.isoformat()}|{doc_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Inverse of encode_cursor. Raises a 400 if the cursor was tampered with."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        sort_value, doc_id = raw.split("|", 1)
+        return datetime.fromisoformat(sort_value), ObjectId(doc_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(field: str, cursor: Optional[str], descending: bool = True) -> dict:
+    """
+    Mongo filter selecting documents strictly after the cursor position
+    in (field, _id) order. Returns an empty filter when there is no cursor.
+    """
+    if not cursor:
+        return {}
+    sort_value, doc_id = decode_cursor(cursor)
+    op = "$lt" if descending else "$gt"
+    return {
+        "$or": [
+            {field: {op: sort_value}},
+            {field: sort_value, "_id": {op: doc_id}},
+        ]
+    }
+
+
+def keyset_sort(field: str, descending: bool = True) -> list:
+    direction = -1 if descending else 1
+    return [(field, direction), ("_id", direction)]
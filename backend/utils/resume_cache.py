@@ -0,0 +1,138 @@
+# utils/resume_cache.py
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+from core.config import RESUME_CACHE_DIR, RESUME_CACHE_MAX_BYTES, RESUME_CACHE_MEMORY_ENTRIES
+from utils.skill_extraction import TEXT_EXTRACTOR_VERSION, get_matcher
+
+
+class ResumeCache:
+    """
+    Content-addressed cache of resume parsing results, keyed by the PDF's SHA-256.
+    Each entry holds the extracted text (valid for TEXT_EXTRACTOR_VERSION) and the
+    skill results (valid for the current matcher/taxonomy version), so a taxonomy
+    change re-runs only the cheap matcher, never PyMuPDF.
+    A bounded on-disk store is shared by workers; an in-memory LRU sits in front.
+    Blocking file IO: call from a worker thread. Several threads may use it at
+    once, so the LRU and counters are guarded by a lock (file reads and writes are not).
+    """
+
+    def __init__(self, directory: str = RESUME_CACHE_DIR, max_bytes: int = RESUME_CACHE_MAX_BYTES,
+                 memory_entries: int = RESUME_CACHE_MEMORY_ENTRIES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self.disk_bytes: Optional[int] = None
+        self.hits = 0          # skills served without any parsing
+        self.text_hits = 0     # text reused, only the matcher re-ran
+        self.misses = 0
+        self.bytes_saved = 0   # PDF bytes PyMuPDF did not have to parse
+        self._lock = threading.Lock()
+
+    def _path(self, sha256: str) -> Path:
+        return self.directory / f"{sha256}.json"
+
+    def _load(self, sha256: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self.memory.get(sha256)
+            if entry is not None:
+                self.memory.move_to_end(sha256)
+                return entry
+        try:
+            with open(self._path(sha256), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._remember(sha256, entry)
+        return entry
+
+    def _remember(self, sha256: str, entry: Dict):
+        with self._lock:
+            self.memory[sha256] = entry
+            self.memory.move_to_end(sha256)
+            while len(self.memory) > self.memory_entries:
+                self.memory.popitem(last=False)
+
+    def lookup(self, sha256: str, size: int = 0) -> Dict:
+        """
+        Returns {"skills": [...] or None, "text": str or None}.
+        Entries from an older extractor or matcher version are treated as misses.
+        """
+        entry = self._load(sha256) or {}
+        text = entry.get("text") if entry.get("text_version") == TEXT_EXTRACTOR_VERSION else None
+        skills = entry.get("skills") if text is not None and entry.get("skills_version") == get_matcher().version else None
+        with self._lock:
+            if skills is not None:
+                self.hits += 1
+            elif text is not None:
+                self.text_hits += 1
+            else:
+                self.misses += 1
+            if text is not None:
+                self.bytes_saved += size
+        return {"skills": skills, "text": text}
+
+    def store(self, sha256: str, text: str, skills: List[str]):
+        entry = {
+            "text_version": TEXT_EXTRACTOR_VERSION,
+            "text": text,
+            "skills_version": get_matcher().version,
+            "skills": skills,
+        }
+        self._remember(sha256, entry)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(entry).encode("utf-8")
+        path = self._path(sha256)
+        old_size = path.stat().st_size if path.exists() else 0
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self.disk_bytes = self._disk_usage() if self.disk_bytes is None else self.disk_bytes + len(data) - old_size
+            if self.disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _disk_usage(self) -> int:
+        return sum(p.stat().st_size for p in self.directory.glob("*.json"))
+
+    def _evict(self):
+        """Drop least recently written entries until the store is under 90% of its budget. Caller holds the lock."""
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # removed by another worker sharing the directory
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes * 0.9:
+                break
+            total -= size
+            path.unlink(missing_ok=True)
+            self.memory.pop(path.stem, None)
+        self.disk_bytes = total
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits, text_hits, misses = self.hits, self.text_hits, self.misses
+            memory_entries, disk_bytes = len(self.memory), self.disk_bytes
+        lookups = hits + text_hits + misses
+        return {
+            "hits": hits,
+            "text_hits": text_hits,
+            "misses": misses,
+            "hit_ratio": round((hits + text_hits) / lookups, 4) if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "memory_entries": memory_entries,
+            "disk_bytes": disk_bytes,
+        }
+
+resume_cache = ResumeCache()
@@ -1,14 +1,97 @@
+import hashlib
+import json
 import re
 import fitz  # PyMuPDF
-from typing import List
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Skill taxonomy: canonical names plus aliases ("js" -> "javascript", "k8s" -> "kubernetes").
+# Extend the data file rather than this module.
+TAXONOMY_PATH = Path(__file__).parent.parent / "data" / "skill_taxonomy.json"
+
+# Bump when the way text is pulled out of PDFs, or the matching logic, changes;
+# cached extraction results from older versions are then ignored
+TEXT_EXTRACTOR_VERSION = f"pymupdf-{fitz.VersionBind}-1"
+MATCHER_VERSION = "trie-1"
+
+# Word tokens; keeps '+', '#' and inner dots so c++, c#, node.js and .net survive,
+# while sentence punctuation ("python.") is dropped
+TOKEN_RE = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+
+def tokenize_with_offsets(text: str):
+    return [(m.group(), m.start()) for m in TOKEN_RE.finditer(text.lower())]
+
+
+class SkillMatcher:
+    """
+    Multi-pattern skill matcher compiled once from the taxonomy.
+    Every name and alias is tokenized into a path in a token trie, so all
+    skills are found in a single pass over the text's tokens, always on word
+    boundaries, however many skills the taxonomy holds.
+    """
+
+    def __init__(self, taxonomy: List[Dict]):
+        self.trie: Dict = {}
+        self.canonical: List[str] = []
+        # Identifies this matcher + taxonomy for caches of skill results
+        self.version = MATCHER_VERSION + "-" + hashlib.sha256(
+            json.dumps(taxonomy, sort_keys=True).encode()
+        ).hexdigest()[:16]
+        for entry in taxonomy:
+            name = entry["name"].lower().strip()
+            self.canonical.append(name)
+            for phrase in [name, *entry.get("aliases", [])]:
+                tokens = [tok for tok, _ in tokenize_with_offsets(phrase)]
+                if not tokens:
+                    continue
+                node = self.trie
+                for tok in tokens:
+                    node = node.setdefault(tok, {})
+                node[None] = name  # terminal marker -> canonical skill
+
+    def find(self, text: str) -> Dict[str, Dict]:
+        """
+        Return {canonical_skill: {"count": hits, "positions": [char offsets]}}
+        for every taxonomy skill mentioned in the text.
+        """
+        tokens = tokenize_with_offsets(text)
+        found: Dict[str, Dict] = {}
+        for i, (tok, offset) in enumerate(tokens):
+            node = self.trie.get(tok)
+            j = i + 1
+            while node is not None:
+                skill = node.get(None)
+                if skill is not None:
+                    hit = found.setdefault(skill, {"count": 0, "positions": []})
+                    hit["count"] += 1
+                    hit["positions"].append(offset)
+                if j >= len(tokens):
+                    break
+                node = node.get(tokens[j][0])
+                j += 1
+        return found
+
+
+def load_taxonomy(path: Path = TAXONOMY_PATH) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["skills"]
+
+
+_matcher: Optional[SkillMatcher] = None
+
+
+def get_matcher() -> SkillMatcher:
+    """The process-wide matcher, compiled on first use."""
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillMatcher(load_taxonomy())
+    return _matcher
+
+
+# Canonical skill names known to the extractor
+SKILL_KEYWORDS = get_matcher().canonical
 
-# A basic skill keyword set — expand with your domain-specific skills
-SKILL_KEYWORDS = [
-    "python", "java", "c++", "javascript", "node", "react", "fastapi", "mongodb",
-    "sql", "nosql", "aws", "docker", "git", "linux", "rest api", "machine learning",
-    "data analysis", "deep learning", "html", "css", "flask", "firebase",
-    "communication", "leadership", "teamwork", "project management"
-]
 
 def extract_text_from_pdf(pdf_path: str) -> str:
     """Extract plain text from a PDF resume."""
@@ -18,15 +101,16 @@ def extract_text_from_pdf(pdf_path: str) -> str:
             text += page.get_text("text")
     return text
 
+
+def extract_skill_matches(text: str) -> Dict[str, Dict]:
+    """Canonical skills found in the text, with hit counts and character positions."""
+    return get_matcher().find(text)
+
+
 def extract_skills_from_resume(pdf_path: str) -> List[str]:
     """
     Extract skill keywords from a resume PDF file.
-    Uses regex + keyword matching for fast extraction.
+    Uses a single pass of the taxonomy matcher; aliases map to canonical names.
     """
-    text = extract_text_from_pdf(pdf_path).lower()
-    found_skills = []
-    for skill in SKILL_KEYWORDS:
-        pattern = rf"\b{re.escape(skill.lower())}\b"
-        if re.search(pattern, text):
-            found_skills.append(skill)
-    return sorted(list(set(found_skills)))
+    text = extract_text_from_pdf(pdf_path)
+    return sorted(extract_skill_matches(text))
@@ -0,0 +1,90 @@
+# utils/upload_stream.py
+from typing import AsyncIterator, List
+from fastapi import HTTPException, Request
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+# Boundaries and part headers a multipart body carries on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+
+def check_content_length(request: Request, max_bytes: int):
+    """Reject a declared body larger than max_bytes (plus multipart framing) before reading any of it."""
+    declared = request.headers.get("content-length")
+    if declared is None:
+        return  # chunked upload; the cap is enforced while streaming
+    try:
+        length = int(declared)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length")
+    if length > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds the {max_bytes} byte limit")
+
+
+async def file_chunks(request: Request, field: str = "file") -> AsyncIterator[bytes]:
+    """
+    Yield the bytes of one uploaded file straight off the request body.
+    Accepts multipart/form-data (the `field` part) or a raw application/pdf body.
+    Unlike UploadFile, nothing is spooled first: each network chunk is parsed
+    and handed on as it arrives, and reading stops at the end of the file part.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type == b"application/pdf":
+        async for chunk in request.stream():
+            if chunk:
+                yield chunk
+        return
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=415, detail="Send the file as multipart/form-data or application/pdf")
+
+    wanted = field.encode()
+    out: List[bytes] = []
+    state = {"header": b"", "value": b"", "disposition": None, "in_file": False, "found": False, "done": False}
+
+    def on_header_field(data, start, end):
+        state["header"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["value"] += data[start:end]
+
+    def on_header_end():
+        if state["header"].lower() == b"content-disposition":
+            state["disposition"] = state["value"]
+        state["header"] = state["value"] = b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(state["disposition"] or b"")
+        state["in_file"] = options.get(b"name") == wanted and not state["found"]
+        state["found"] = state["found"] or state["in_file"]
+        state["disposition"] = None
+
+    def on_part_data(data, start, end):
+        if state["in_file"]:
+            out.append(bytes(data[start:end]))
+
+    def on_part_end():
+        if state["in_file"]:
+            state["in_file"] = False
+            state["done"] = True
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    async for chunk in request.stream():
+        try:
+            parser.write(chunk)
+        except MultipartParseError:
+            raise HTTPException(status_code=400, detail="Malformed multipart body")
+        for data in out:
+            yield data
+        out.clear()
+        if state["done"]:
+            return
+    if not state["found"]:
+        raise HTTPException(status_code=400, detail=f"Missing '{field}' file field")
+    raise HTTPException(status_code=400, detail="Upload ended before the file was complete")
@@ -0,0 +1,105 @@
+# utils/view_counter.py
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from models.job_model import Job
+from core.config import VIEW_FLUSH_INTERVAL_SECONDS, VIEW_DEDUPE_WINDOW_SECONDS
+
+
+class ViewCounter:
+    """
+    Write-behind job view counter.
+    Views are counted in memory and periodically flushed as one unordered
+    bulk write of atomic $inc updates, so GET /jobs/{id} never writes.
+    """
+
+    def __init__(self, flush_interval: float = VIEW_FLUSH_INTERVAL_SECONDS, dedupe_window: float = VIEW_DEDUPE_WINDOW_SECONDS):
+        self.flush_interval = flush_interval
+        self.dedupe_window = dedupe_window
+        self.pending: Dict[str, int] = {}
+        self.last_seen: Dict[Tuple[str, str], float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    def record(self, job_id: str, viewer: Optional[str] = None) -> bool:
+        """
+        Count one view. When a dedupe window is set, repeat views of the same
+        job by the same viewer inside the window are ignored. Returns True if counted.
+        """
+        if viewer and self.dedupe_window > 0:
+            now = time.monotonic()
+            key = (job_id, viewer)
+            last = self.last_seen.get(key)
+            if last is not None and now - last < self.dedupe_window:
+                return False
+            self.last_seen[key] = now
+        self.pending[job_id] = self.pending.get(job_id, 0) + 1
+        return True
+
+    def pending_views(self, job_id: str) -> int:
+        return self.pending.get(job_id, 0)
+
+    async def flush(self):
+        """
+        Write all pending counts with a single bulk_write. Counts that were not
+        applied are restored: on a partial BulkWriteError only the failed ops
+        (so applied views are not counted twice), on any other error the whole batch.
+        """
+        self._prune_dedupe()
+        if not self.pending:
+            return
+        batch, self.pending = list(self.pending.items()), {}
+        ops = [
+            UpdateOne({"_id": PydanticObjectId(job_id)}, {"$inc": {"views": count}})
+            for job_id, count in batch
+        ]
+        try:
+            await Job.get_pymongo_collection().bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            failed = [batch[err["index"]] for err in e.details.get("writeErrors", [])]
+            self._restore(failed)
+            print(f"⚠️ Failed to flush views of {len(failed)} of {len(batch)} jobs: {e}")
+        except Exception as e:
+            self._restore(batch)
+            print(f"⚠️ Failed to flush job views: {e}")
+
+    def _restore(self, counts):
+        for job_id, count in counts:
+            self.pending[job_id] = self.pending.get(job_id, 0) + count
+
+    def _prune_dedupe(self):
+        if not self.last_seen:
+            return
+        cutoff = time.monotonic() - self.dedupe_window
+        self.last_seen = {k: t for k, t in self.last_seen.items() if t >= cutoff}
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Ask the periodic flush to exit rather than cancelling it, so a bulk_write
+        in flight completes (a cancelled one could lose its batch), then write
+        whatever is still pending.
+        """
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+view_counter = ViewCounter()